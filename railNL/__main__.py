@@ -6,17 +6,25 @@ from algorithms import simulatedAnnealing
 from algorithms import hillclimber_simon, hillclimber_simon1, hillclimber_simon2
 from algorithms import hillClimber_Finn_Simon
 from algorithms import finnHillClimber
+from algorithms import setCover
+from algorithms import tabuSearch
+from algorithms import alns
+from algorithms import genetic
+from algorithms import branchAndBound
 
 import json
 import datetime
 import statistics
 import time
+import random
+import multiprocessing
 
-from os import path
+import numpy as np
+
+from os import path, makedirs
 from sys import argv
-from copy import deepcopy
 
-from typing import List, Dict, Union, Any, Callable
+from typing import List, Dict, Union, Any, Callable, Optional
 
 """
 o How to run:
@@ -40,6 +48,22 @@ def main(jobType: str, **arguments):
     return
 
 
+ALGORITHMS: Dict[str, Callable[[RailNetwork, Any], RailNetwork]] = {
+    "random": randomAlgorithm.main,
+    "annealing": simulatedAnnealing.runAnnealing,
+    "snakeclimber": hillclimber_simon.main,
+    "snakeclimber1": hillclimber_simon1.main,
+    "snakeclimber2": hillclimber_simon2.main,
+    "routesnakeclimber": hillClimber_Finn_Simon.main,
+    "routeclimber_finn": finnHillClimber.main,
+    "setcover": setCover.main,
+    "tabu": tabuSearch.main,
+    "alns": alns.main,
+    "genetic": genetic.main,
+    "branchandbound": branchAndBound.main,
+}
+
+
 def batch(
     stationsFilepath: str,
     connectionsFilepath: str,
@@ -47,6 +71,10 @@ def batch(
     runs: int = 1,
     targetFolder: str = "results",
     runName: str = "solution",
+    workers: int = 1,
+    seed: Optional[int] = None,
+    contractChains: bool = False,
+    timeBudget: Optional[float] = None,
     **arguments
 ) -> None:
     """
@@ -60,28 +88,34 @@ def batch(
         runs (int): The amount of times the algorithm should be ran.
         targetFolder (str): The folder where result files should be saved to.
         runName (str): The human readable part for the name of the result files.
+        workers (int): The amount of processes the runs are divided over.
+        seed (Optional[int]): The seed of the first run. Run n is seeded with seed + n. Runs get a
+            random seed if no seed is given.
+        contractChains (bool): True if random walks should drive whole chains of stations with two
+            connections, see RailNetwork.searchGraph().
+        timeBudget (Optional[float]): The amount of seconds every run may take, after which it
+            returns the best solution found. The budget is per run, so the batch takes about
+            runs / workers times as long. The runs stop at their own stopping criteria if None.
     """
-    ALGORITHMS: Dict[str, Callable[[RailNetwork, Any], RailNetwork]] = {
-        "random": randomAlgorithm.main,
-        "annealing": simulatedAnnealing.runAnnealing,
-        "snakeclimber": hillclimber_simon.main,
-        "snakeclimber1": hillclimber_simon1.main,
-        "snakeclimber2": hillclimber_simon2.main,
-        "routesnakeclimber": hillClimber_Finn_Simon.main,
-        "routeclimber_finn": finnHillClimber.main,
-    }
-
     START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
 
     # Guarantees that the summary file will have a lower timestamp than the first result
     time.sleep(1)
 
-    network = RailNetwork(stationsFilepath, connectionsFilepath)
+    network = RailNetwork(stationsFilepath, connectionsFilepath, contractChains)
+
+    # every algorithm honours the time budget, see algorithms.random.budgetDeadline(). Every run
+    # starts its own deadline, so runs on a busy worker are not cut short by the runs before them
+    arguments["timeBudget"] = timeBudget
 
     # Random does not need to utilize multiple runs
     if algorithm == "random":
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed % 2**32)
+
         ALGORITHMS[algorithm.lower()](
-            deepcopy(network),
+            network.clone(),
             targetFolder=targetFolder,
             runName=runName,
             **arguments
@@ -89,25 +123,33 @@ def batch(
 
         return
 
-    currentRunName = runName
+    # every run gets its own seed, as worker processes would otherwise share their random state
+    if seed is None:
+        seeds = [random.randrange(2**32) for _ in range(runs)]
+    else:
+        seeds = [seed + run for run in range(runs)]
 
-    scores: List[Dict[str, float]] = []
+    # if multiple runs are utilized, every run gets a unique name
+    runNames = [runName + str(run) for run in range(runs)] if runs > 1 else [runName]
 
-    # if multiple runs are utilized
-    if runs > 1:
-        currentRunName = runName + str(0)
+    jobs = [
+        (algorithm, stationsFilepath, connectionsFilepath, seeds[run], targetFolder, runNames[run],
+         contractChains, arguments)
+        for run in range(runs)
+    ]
 
-    for run in range(runs):
-        newNetwork: RailNetwork = ALGORITHMS[algorithm.lower()](
-            deepcopy(network),
-            targetFolder=targetFolder,
-            runName=currentRunName,
-            **arguments
-        )
+    if workers > 1:
+        # created up front, as workers would otherwise race to create it
+        makedirs(targetFolder, exist_ok=True)
 
-        scores.append({"iteration":run, "score":newNetwork.score()})
+        with multiprocessing.Pool(min(workers, runs)) as pool:
+            runScores = pool.starmap(runAlgorithm, jobs)
+    else:
+        runScores = [runAlgorithm(*job) for job in jobs]
 
-        currentRunName = runName + str(run + 1)
+    scores: List[Dict[str, Any]] = [
+        {"iteration": run, "score": runScores[run], "seed": seeds[run]} for run in range(runs)
+    ]
 
     if runs > 1:
         average = statistics.mean([score["score"] for score in scores])
@@ -119,6 +161,49 @@ def batch(
     return
 
 
+def runAlgorithm(
+    algorithm: str,
+    stationsFilepath: str,
+    connectionsFilepath: str,
+    seed: int,
+    targetFolder: str,
+    runName: str,
+    contractChains: bool,
+    arguments: Dict[str, Any]
+) -> float:
+    """
+    Runs an algorithm once on a newly loaded network. Can be ran in a worker process.
+
+    Args:
+        algorithm (str): The name of the algorithm in ALGORITHMS.
+        stationsFilepath (str): The filepath of the CSV file containing station names and
+            coordinates.
+        connectionsFilepath(str): The filepath of the CSV file containing station connections and
+            durations.
+        seed (int): The seed for the random number generators.
+        targetFolder (str): The folder where result files should be saved to.
+        runName (str): The human readable part for the name of the result files.
+        contractChains (bool): True if the network should contract chains of stations with two
+            connections for random walks.
+        arguments (Dict[str, Any]): The keyword arguments for the algorithm.
+
+    Returns (float): The score of the network returned by the algorithm.
+    """
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+
+    network = RailNetwork(stationsFilepath, connectionsFilepath, contractChains)
+
+    newNetwork: RailNetwork = ALGORITHMS[algorithm.lower()](
+        network,
+        targetFolder=targetFolder,
+        runName=runName,
+        **arguments
+    )
+
+    return newNetwork.score()
+
+
 def visualize(plotType: str= "algorithm", **arguments):
     """
     Selects one of three visualization modes.
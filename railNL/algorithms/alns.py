@@ -0,0 +1,412 @@
+import random
+import datetime
+import time
+
+from classes.railNetwork import RailNetwork
+from classes.move import Move, AddRoute, RemoveRoute, PushHead, PushTail, PopHead, PopTail
+from classes.routePool import loadRoutePool
+
+from typing import Callable, Dict, List, Optional, Union
+
+import algorithms.random as randomAlgorithm
+from algorithms.simulatedAnnealing import annealingProbability, randomRouteID
+
+"""Module for an Adaptive Large Neighbourhood Search (ALNS) algorithm
+
+Every iteration, the algorithm changes the current network with a destroy operator followed by a
+repair operator and accepts the result like the simulated annealing algorithm with geometric
+cooling. The operators are built from the neighbourhoods of the other algorithms in this package:
+    - Destroy "randomRoute": removes a random route, like the route stepfunction of simulated
+        annealing.
+    - Destroy "lowestRoute": removes the lowest scoring route, like the greedy hillclimber.
+    - Destroy "snakeTrim": removes up to three stations from an end of a random route, like the
+        snake hillclimbers. Routes keep at least one connection.
+    - Destroy "none": changes nothing, so the repair operator works on the current network.
+    - Repair "randomRoute": adds a random route, like the route stepfunction of simulated annealing.
+    - Repair "snakeExtend": lengthens a random route up to three times with
+        algorithms.random.randomPush(), like the snake hillclimbers.
+    - Repair "greedyExtend": extends a random route at its ends with the best station for as long
+        as that improves the score.
+    - Repair "poolRoute": adds a route from the route pool, like the pool stepfunction of simulated
+        annealing. Not used by default, as the pool is built on first use.
+
+Operators are selected with a chance proportional to their weight. A repair operator is credited
+with the score it gains on the destroyed network, a destroy operator with the score the pair gains
+on the current network, so destroying alone is never rewarded. After every segment of iterations,
+the weights move towards the score gained per CPU second of every operator, so compute time goes to
+the operators that pay off on the dataset.
+"""
+
+
+def main(
+    network: RailNetwork,
+    maxRoutes: int,
+    maxDuration: float,
+    targetFolder: str = "results",
+    runName: str = "solutionALNS",
+    destroyOperators: Optional[List[str]] = None,
+    repairOperators: Optional[List[str]] = None,
+    initialTemperature: float = 16,
+    coolingConstant: float = 0.9995,
+    segmentLength: int = 100,
+    reactionFactor: float = 0.2,
+    minimumWeight: float = 0.05,
+    convergenceLimit: int = 5000,
+    randomIterations: int = 1000,
+    initialiser: str = "random",
+    recordAll: bool = False,
+    exportImprovements: bool = False,
+    timeBudget: Optional[float] = None
+) -> RailNetwork:
+    """
+    Adaptive large neighbourhood search solver for the Train routing problem. Exports a score
+    summary file, as well as the best solution produced.
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        targetFolder (str): The folder where solutions should be saved to.
+        runName (str): Human readable part of the filename.
+        destroyOperators (Optional[List[str]]): The names of the destroy operators to use. All are
+            used if None.
+        repairOperators (Optional[List[str]]): The names of the repair operators to use. All but
+            "poolRoute" are used if None.
+        initialTemperature (float): The initial temperature of the acceptance criterion.
+        coolingConstant (float): The base of the geometric cooling, between 0 and 1. See
+            simulatedAnnealing.geometricCooling().
+        segmentLength (int): The amount of iterations between updates of the operator weights.
+        reactionFactor (float): How far the weights move towards the observed performance of the
+            operators at every update, between 0 and 1.
+        minimumWeight (float): The lowest weight of an operator, so every operator keeps a chance to
+            be selected.
+        convergenceLimit (int): The maximum amount of iterations to run for without improvement
+            before terminating the algorithm.
+        randomIterations (int): For how many iterations the random algorithm should be ran for the
+            best initial solution.
+        initialiser (str): The initialiser of the initial solution, "random" or "eulerian". See
+            algorithms.random.initialSolution().
+        recordAll (bool): Whether the score of every iteration should be recorded for the score
+            summary file, or only the accepted states of the network.
+        exportImprovements (bool): Whether to export every improvement
+        timeBudget (Optional[float]): The amount of seconds to run for, regardless of
+            convergenceLimit. Runs until convergence if None.
+
+    Returns (RailNetwork): The best network found.
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm runs until it expires instead of until convergence
+    if timeBudget is not None:
+        convergenceLimit = float("inf") # type: ignore
+
+    if destroyOperators is None:
+        destroyOperators = list(DESTROY_OPERATORS)
+
+    if repairOperators is None:
+        repairOperators = [name for name in REPAIR_OPERATORS if name != "poolRoute"]
+
+    destroySelector = OperatorSelector(destroyOperators, reactionFactor, minimumWeight)
+    repairSelector = OperatorSelector(repairOperators, reactionFactor, minimumWeight)
+
+    print(f"generating {initialiser.lower()} solution")
+
+    # The current network is changed in place, so it must not share nodes with the best network
+    currentNetwork = randomAlgorithm.initialSolution(
+        network, maxRoutes, maxDuration, initialiser, randomIterations
+    ).clone()
+
+    bestNetwork = currentNetwork.clone()
+    highestScore = bestNetwork.score()
+    currentScore = highestScore
+
+    scores: List[Dict[str, Union[int, float, str]]] = [{"iteration": 0, "score": highestScore}]
+
+    convergence = 0
+    iteration = 1
+
+    while convergence <= convergenceLimit and time.monotonic() < deadline:
+        if not iteration % 1000:
+            print(f"iteration: {iteration}")
+
+        moves: List[Move] = []
+
+        destroyName = destroySelector.select()
+        start = time.process_time()
+        DESTROY_OPERATORS[destroyName](currentNetwork, maxRoutes, maxDuration, moves)
+        destroySeconds = time.process_time() - start
+        destroyedScore = currentNetwork.score()
+
+        repairName = repairSelector.select()
+        start = time.process_time()
+        REPAIR_OPERATORS[repairName](currentNetwork, maxRoutes, maxDuration, moves)
+        repairSeconds = time.process_time() - start
+
+        newScore = currentNetwork.score()
+
+        # the destroy operator only gains what the repair it enabled reached
+        destroySelector.record(destroyName, max(0.0, newScore - currentScore), destroySeconds)
+        repairSelector.record(repairName, max(0.0, newScore - destroyedScore), repairSeconds)
+
+        temperature = initialTemperature * coolingConstant ** iteration
+
+        if newScore >= currentScore or annealingProbability(currentScore - newScore, temperature):
+            currentScore = newScore
+            scores.append({"iteration": iteration, "score": newScore})
+
+        else:
+            for move in reversed(moves):
+                move.undo(currentNetwork)
+
+            if recordAll:
+                scores.append({"iteration": iteration, "score": newScore})
+
+        if newScore > highestScore:
+            print(f"new best found: {newScore}")
+
+            highestScore = newScore
+            bestNetwork = currentNetwork.clone()
+            convergence = 0
+
+            if exportImprovements:
+                bestNetwork.exportSolution(targetFolder, f"{runName}-{iteration}")
+
+        if not iteration % segmentLength:
+            destroySelector.update()
+            repairSelector.update()
+
+        convergence += 1
+        iteration += 1
+
+    print(f"destroy operator weights: {destroySelector.weights()}")
+    print(f"repair operator weights: {repairSelector.weights()}")
+
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores.append({"iteration": "Best", "score": highestScore})
+    scores.append({"iteration": "Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    print(f"Terminating with highest score {highestScore}")
+
+    return bestNetwork
+
+
+class OperatorSelector:
+    """Roulette wheel selection of operators with weights adapted to their performance
+
+    Attributes:
+        _names (List[str]): The names of the operators.
+        _weights (List[float]): The weight of every operator.
+        _gains (List[float]): The score gained by every operator in the current segment.
+        _seconds (List[float]): The CPU seconds used by every operator in the current segment.
+        _reaction (float): How far the weights move towards the observed performance per update.
+        _minimum (float): The lowest weight of an operator.
+    """
+
+    __slots__ = ("_names", "_weights", "_gains", "_seconds", "_reaction", "_minimum")
+
+    def __init__(self, names: List[str], reaction: float = 0.2, minimum: float = 0.05):
+        """
+        Initializer function
+
+        Args:
+            names (List[str]): The names of the operators.
+            reaction (float): How far the weights move towards the observed performance per update.
+            minimum (float): The lowest weight of an operator.
+        """
+        self._names = list(names)
+        self._weights = [1.0] * len(names)
+        self._gains = [0.0] * len(names)
+        self._seconds = [0.0] * len(names)
+        self._reaction = reaction
+        self._minimum = minimum
+
+    def select(self) -> str:
+        """Returns the name of an operator, chosen with a chance proportional to its weight"""
+
+        return random.choices(self._names, self._weights)[0]
+
+    def record(self, name: str, gain: float, seconds: float) -> None:
+        """Adds the score gain and CPU seconds of a call of an operator to the current segment"""
+
+        index = self._names.index(name)
+
+        self._gains[index] += gain
+        self._seconds[index] += seconds
+
+    def update(self) -> None:
+        """
+        Moves the weights of the operators used in the current segment towards their score gain per
+        CPU second, relative to the best operator of the segment. Segments without any gain leave
+        the weights unchanged.
+
+        Post: The weights are updated and a new segment is started.
+        """
+        rates = [gain / seconds if seconds > 0 else 0.0
+                 for gain, seconds in zip(self._gains, self._seconds)]
+        highestRate = max(rates)
+
+        for index, rate in enumerate(rates):
+            if not self._seconds[index] or highestRate <= 0:
+                continue
+
+            weight = (1 - self._reaction) * self._weights[index] + \
+                self._reaction * rate / highestRate
+
+            self._weights[index] = max(self._minimum, weight)
+
+        self._gains = [0.0] * len(self._names)
+        self._seconds = [0.0] * len(self._names)
+
+    def weights(self) -> Dict[str, float]:
+        """Returns the weight of every operator by name"""
+
+        return dict(zip(self._names, self._weights))
+
+
+def makeMove(network: RailNetwork, moves: List[Move], move: Move) -> None:
+    """Applies a move to network and remembers it in moves, so it can be undone"""
+
+    move.apply(network)
+    moves.append(move)
+
+
+# Destroy operators
+def destroyRandomRoute(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Removes a random route"""
+
+    if network.nRoute():
+        makeMove(network, moves, RemoveRoute(randomRouteID(network)))
+
+
+def destroyLowestRoute(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Removes the route that scores the lowest in isolation"""
+
+    if network.nRoute():
+        lowestRoute = min(network.listRoutes(),
+                          key=lambda route: route.routeScore(network.nConnections()))
+
+        makeMove(network, moves, RemoveRoute(lowestRoute.getID()))
+
+
+def destroySnakeTrim(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Removes one to three stations from a random end of a random route, keeping one connection"""
+
+    if not network.nRoute():
+        return
+
+    route = random.choice(network.listRoutes())
+    pop = random.choice([PopHead, PopTail])
+
+    for _ in range(random.randint(1, 3)):
+        if route.nStations() <= 2:
+            break
+
+        makeMove(network, moves, pop(route.getID()))
+
+
+def destroyNone(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Leaves the network unchanged"""
+
+    return
+
+
+# Repair operators
+def repairRandomRoute(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Adds a random route, if the network has fewer than maxRoutes routes"""
+
+    if network.nRoute() < maxRoutes:
+        stations = randomAlgorithm.randomRouteStations(network, maxDuration)
+        makeMove(network, moves, AddRoute(stations))
+
+
+def repairSnakeExtend(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Adds one to three random legal stations to random ends of a random route"""
+
+    if not network.nRoute():
+        return
+
+    route = random.choice(network.listRoutes())
+
+    for _ in range(random.randint(1, 3)):
+        move = randomAlgorithm.randomPush(route, maxDuration)
+
+        if move is None:
+            break
+
+        makeMove(network, moves, move)
+
+
+def repairGreedyExtend(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """Extends a random route with the best legal station for as long as that improves the score"""
+
+    if not network.nRoute():
+        return
+
+    route = random.choice(network.listRoutes())
+
+    while True:
+        options = route.getLegalMoves(maxDuration)
+
+        extensions: List[Move] = [
+            PushTail(route.getID(), option[0]) if index > 0 else PushHead(route.getID(), option[0])
+            for index, stationOptions in options.items() for option in stationOptions
+        ]
+
+        if not extensions:
+            return
+
+        deltas = [extension.delta(network) for extension in extensions]
+        best = max(range(len(extensions)), key=deltas.__getitem__)
+
+        if deltas[best] <= 0:
+            return
+
+        makeMove(network, moves, extensions[best])
+
+
+def repairPoolRoute(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, moves: List[Move]
+) -> None:
+    """
+    Adds a route from the route pool, if the network has fewer than maxRoutes routes. The pool is
+    built on first use and cached, see classes.routePool.
+    """
+    if network.nRoute() < maxRoutes:
+        pool = loadRoutePool(network, maxDuration)
+        makeMove(network, moves, AddRoute(pool.randomStations(network)))
+
+
+Operator = Callable[[RailNetwork, int, float, List[Move]], None]
+
+DESTROY_OPERATORS: Dict[str, Operator] = {
+    "randomRoute": destroyRandomRoute,
+    "lowestRoute": destroyLowestRoute,
+    "snakeTrim": destroySnakeTrim,
+    "none": destroyNone,
+}
+
+REPAIR_OPERATORS: Dict[str, Operator] = {
+    "randomRoute": repairRandomRoute,
+    "snakeExtend": repairSnakeExtend,
+    "greedyExtend": repairGreedyExtend,
+    "poolRoute": repairPoolRoute,
+}
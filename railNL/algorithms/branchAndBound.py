@@ -0,0 +1,440 @@
+import time
+import heapq
+import datetime
+
+import numpy as np
+
+from classes.railNetwork import RailNetwork
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import algorithms.random as randomAlgorithm
+from algorithms.eulerian import eulerianSolution
+
+"""Module for an exact branch and bound solver for small datasets
+
+Every route of a solution can be replaced by the shortest walk that drives the same set of
+connections without lowering the score, so an optimal solution exists that only uses such walks.
+enumerateWalks() finds the shortest walk for every set of connections that can be driven within
+maxDuration. Walks that score 0 points or less on their own, or that drive a subset of the
+connections of a walk that is not longer, are never needed and are dropped.
+
+The solver then searches all selections of up to maxRoutes walks. Every node of the search picks
+the uncovered connection with the fewest walks that drive it, and branches on which of those walks
+is the first in order to drive it, or on the connection staying uncovered. A walk that is passed
+over in one branch is excluded from the branches after it, so no selection is visited twice.
+
+Branches are pruned on the lowest of three upper bounds on the points the remaining routes can
+add:
+    - The sum of the highest gains of the remaining amount of routes.
+    - Every uncovered connection is worth its points minus the lowest cost per newly covered
+        connection of any walk that drives it.
+    - Every uncovered connection is worth its points minus its duration, and k routes cost 100k
+        points and drive less than k * maxDuration minutes.
+Walks that spend more minutes on covered or repeated connections than the last bound leaves room
+for are excluded from the whole branch.
+
+With a time budget, the search stops when it expires and the best selection found so far is returned
+without proof that it is optimal.
+"""
+
+
+# Score changes smaller than this are rounding errors
+EPSILON = 1e-9
+
+
+def main(
+    network: RailNetwork,
+    maxRoutes: int,
+    maxDuration: float,
+    targetFolder: str = "results",
+    runName: str = "solutionBranchAndBound",
+    stateLimit: int = 2000000,
+    timeBudget: Optional[float] = None
+) -> RailNetwork:
+    """
+    Exact solver for the Train routing problem on small datasets such as Holland. Exports the
+    optimal solution and a score summary file with every improvement found and the amount of
+    seconds it took, the Best row holding the time it took to prove the optimum.
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        targetFolder (str): The folder where solutions should be saved to.
+        runName (str): Human readable part of the filename.
+        stateLimit (int): The maximum amount of partial walks enumerated, see enumerateWalks().
+        timeBudget (Optional[float]): The amount of seconds after which the search stops with the
+            best network found so far. Searches until the optimum is proven if None.
+
+    Returns (RailNetwork): The optimal network, or the best network found within the time budget.
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    startTime = time.perf_counter()
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    print("enumerating walks")
+
+    walks = enumerateWalks(network, maxDuration, stateLimit)
+    solver = BranchAndBound(network, maxDuration, walks)
+
+    # the Eulerian solution is a strong first lower bound for pruning
+    initialNetwork = eulerianSolution(network, maxRoutes, maxDuration)
+    solver.setLowerBound(initialNetwork.score())
+
+    print(f"searching {len(solver)} walks from {initialNetwork.score()}")
+
+    solver.search(maxRoutes, startTime, deadline)
+
+    seconds = time.perf_counter() - startTime
+
+    if solver.bestRoutes() is None:
+        bestNetwork = initialNetwork
+    else:
+        bestNetwork = network.clone()
+
+        for stationIDs in solver.bestRoutes(): # type: ignore
+            bestNetwork.addRoute([bestNetwork.getStationByID(stationID) for stationID in stationIDs])
+
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores: List[Dict[str, Union[int, float, str]]] = [
+        {"iteration": 0, "score": initialNetwork.score(), "seconds": 0.0}
+    ]
+    scores += solver.improvements()
+    scores.append({"iteration": "Best", "score": bestNetwork.score(), "seconds": seconds})
+    scores.append({"iteration": "Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    if solver.complete():
+        print(f"Proven optimum {bestNetwork.score()} with {bestNetwork.nRoute()} routes in "
+              f"{seconds:.1f} seconds, {solver.nodes()} nodes")
+    else:
+        print(f"Time budget expired with best score {bestNetwork.score()} with "
+              f"{bestNetwork.nRoute()} routes after {solver.nodes()} nodes")
+
+    return bestNetwork
+
+
+def enumerateWalks(
+    network: RailNetwork, maxDuration: float, stateLimit: int = 2000000
+) -> Dict[int, Tuple[float, List[int]]]:
+    """
+    Returns the shortest walk shorter than maxDuration for every set of connections that can be
+    driven by one, if it scores more than 0 points on its own.
+
+    Walks are extended shortest first from every station. A partial walk is only extended if no
+    shorter walk ending at the same station has driven the same connections, as both can be
+    extended the same way.
+
+    Args:
+        network (RailNetwork): The network to enumerate the walks of.
+        maxDuration (float): The maximum duration of a route. Walks are shorter.
+        stateLimit (int): The maximum amount of partial walks. The dataset is too large for an
+            exact solution if there are more.
+
+    Returns (Dict[int, Tuple[float, List[int]]]): The duration and station IDs of every walk, keyed
+        by the bitmask of its connections.
+
+    Raises:
+        ValueError: If there are more than stateLimit partial walks.
+    """
+    graph = network.compactGraph()
+    neighbours, connections, durations = [array.tolist() for array in graph.neighbourArrays()]
+    offsets = graph.offsets().tolist()
+    weight = 10000 / graph.nConnections()
+
+    # the shortest duration and the previous partial walk, keyed by (end station ID, bitmask)
+    labels: Dict[Tuple[int, int], Tuple[float, Tuple[int, int]]] = dict()
+    queue: List[Tuple[float, int, int]] = []
+
+    for stationID in range(graph.nStations()):
+        labels[(stationID, 0)] = (0.0, (-1, 0))
+        queue.append((0.0, stationID, 0))
+
+    heapq.heapify(queue)
+
+    shortest: Dict[int, Tuple[float, Tuple[int, int]]] = dict()
+
+    while queue:
+        duration, stationID, mask = heapq.heappop(queue)
+
+        if duration > labels[(stationID, mask)][0]:
+            continue
+
+        if mask and (mask not in shortest or duration < shortest[mask][0]):
+            shortest[mask] = (duration, (stationID, mask))
+
+        # neighbours are sorted by duration, so the search stops at the first that is too long
+        for position in range(offsets[stationID], offsets[stationID + 1]):
+            newDuration = duration + durations[position]
+
+            if newDuration >= maxDuration:
+                break
+
+            key = (neighbours[position], mask | 1 << connections[position])
+
+            if key not in labels or newDuration < labels[key][0]:
+                labels[key] = (newDuration, (stationID, mask))
+                heapq.heappush(queue, (newDuration, key[0], key[1]))
+
+        if len(labels) > stateLimit:
+            raise ValueError(f"more than {stateLimit} partial walks, the dataset is too large")
+
+    walks: Dict[int, Tuple[float, List[int]]] = dict()
+
+    for mask, (duration, key) in shortest.items():
+        if bin(mask).count("1") * weight - (100 + duration) <= 0:
+            continue
+
+        stationIDs = []
+
+        while key[0] != -1:
+            stationIDs.append(key[0])
+            key = labels[key][1]
+
+        walks[mask] = (duration, stationIDs[::-1])
+
+    return walks
+
+
+class BranchAndBound:
+    """Exact search over selections of walks
+
+    Attributes:
+        _cover (np.ndarray): (walks, connections) matrix, 1 where a walk drives a connection.
+        _durations (np.ndarray): The duration of every walk.
+        _stationIDs (List[List[int]]): The station IDs of every walk.
+        _connectionDurations (np.ndarray): The duration of every connection.
+        _weight (float): The points per covered connection.
+        _maxDuration (float): The maximum duration of a route.
+        _highestScore (float): The highest score found, or the lower bound it has to beat.
+        _bestWalks (Optional[List[int]]): The walks of the best selection, None if the lower bound
+            was not beaten.
+        _improvements (List[Dict[str, Union[int, float]]]): The node, score and seconds of every
+            improvement.
+        _nodes (int): The amount of nodes searched.
+        _deadline (float): The time.monotonic() at which the search stops.
+        _expired (bool): Whether the search stopped at the deadline before it was complete.
+    """
+
+    __slots__ = ("_cover", "_durations", "_stationIDs", "_connectionDurations", "_weight",
+                 "_maxDuration", "_highestScore", "_bestWalks", "_improvements", "_nodes",
+                 "_deadline", "_expired")
+
+    def __init__(
+        self, network: RailNetwork, maxDuration: float, walks: Dict[int, Tuple[float, List[int]]]
+    ):
+        """
+        Initializer function. Walks that drive a subset of the connections of a walk that is not
+        longer are dropped.
+
+        Args:
+            network (RailNetwork): The network the walks are in.
+            maxDuration (float): The maximum duration of a route.
+            walks (Dict[int, Tuple[float, List[int]]]): The walks to select from, see
+                enumerateWalks().
+        """
+        graph = network.compactGraph()
+        nConnections = graph.nConnections()
+
+        masks = list(walks)
+        cover = np.array([[mask >> connectionID & 1 for connectionID in range(nConnections)]
+                          for mask in masks], dtype=bool).reshape(-1, nConnections)
+        durations = np.array([walks[mask][0] for mask in masks], dtype=np.float64)
+
+        keep = np.ones(len(masks), dtype=bool)
+
+        # walks have distinct sets of connections, so a superset is always a strict one
+        for index in range(len(masks)):
+            supersets = cover[:, cover[index]].all(axis=1)
+            supersets[index] = False
+
+            keep[index] = not (supersets & (durations <= durations[index])).any()
+
+        self._cover = cover[keep].astype(np.float64)
+        self._durations = durations[keep]
+        self._stationIDs = [walks[mask][1] for mask, kept in zip(masks, keep) if kept]
+
+        self._connectionDurations = graph.durations().astype(np.float64)
+        self._weight = 10000 / nConnections
+        self._maxDuration = maxDuration
+
+        self._highestScore = -float("inf")
+        self._bestWalks: Optional[List[int]] = None
+        self._improvements: List[Dict[str, Union[int, float]]] = []
+        self._nodes = 0
+
+        self._deadline = float("inf")
+        self._expired = False
+
+    def __len__(self) -> int:
+        """Length magic method, returns the amount of walks"""
+
+        return len(self._durations)
+
+    def setLowerBound(self, score: float) -> None:
+        """Sets a score that is known to be reachable, so only better selections are searched"""
+
+        self._highestScore = score
+
+    def bestRoutes(self) -> Optional[List[List[int]]]:
+        """Returns the station IDs of the walks of the best selection, None if none was found"""
+
+        if self._bestWalks is None:
+            return None
+
+        return [self._stationIDs[index] for index in self._bestWalks]
+
+    def improvements(self) -> List[Dict[str, Union[int, float]]]:
+        """Returns the node, score and seconds of every improvement"""
+
+        return self._improvements
+
+    def nodes(self) -> int:
+        """Returns the amount of nodes searched"""
+
+        return self._nodes
+
+    def complete(self) -> bool:
+        """Returns whether the last search was completed, so its best selection is optimal"""
+
+        return not self._expired
+
+    def search(self, maxRoutes: int, startTime: float, deadline: float = float("inf")) -> None:
+        """
+        Searches all selections of up to maxRoutes walks.
+
+        Args:
+            maxRoutes (int): The maximum amount of routes.
+            startTime (float): The time.perf_counter() the solver started, for improvements.
+            deadline (float): The time.monotonic() at which the search stops, see complete().
+
+        Post: The best selection is stored if it beats the lower bound.
+        """
+        self._deadline = deadline
+        self._expired = False
+
+        self._branch(
+            [], np.zeros(self._cover.shape[1], dtype=bool), np.ones(len(self), dtype=bool),
+            maxRoutes, 0.0, startTime
+        )
+
+    def _branch(
+        self,
+        walks: List[int],
+        covered: np.ndarray,
+        allowed: np.ndarray,
+        routesLeft: int,
+        score: float,
+        startTime: float
+    ) -> None:
+        """
+        Searches a node of the search tree.
+
+        Args:
+            walks (List[int]): The indices of the selected walks.
+            covered (np.ndarray): For every connection, whether it is driven by a selected walk.
+            allowed (np.ndarray): For every walk, whether it may still be selected.
+            routesLeft (int): The amount of walks that may still be selected.
+            score (float): The score of the selected walks.
+            startTime (float): The time.perf_counter() the solver started.
+        """
+        if self._expired or time.monotonic() >= self._deadline:
+            self._expired = True
+            return
+
+        self._nodes += 1
+
+        if score > self._highestScore + EPSILON:
+            print(f"new best found: {score}")
+
+            self._highestScore = score
+            self._bestWalks = list(walks)
+            self._improvements.append({"iteration": self._nodes, "score": score,
+                                       "seconds": time.perf_counter() - startTime})
+
+        if not routesLeft:
+            return
+
+        uncovered = (~covered).astype(np.float64)
+        indices = np.flatnonzero(allowed)
+        cover = self._cover[indices]
+
+        newConnections = cover @ uncovered
+        gains = newConnections * self._weight - (100 + self._durations[indices])
+        positiveGains = np.sort(gains[gains > EPSILON])[::-1]
+
+        if not len(positiveGains):
+            return
+
+        # the lowest cost per newly covered connection of the walks that drive every connection
+        with np.errstate(divide="ignore"):
+            costRates = (100 + self._durations[indices]) / newConnections
+
+        uncoveredIDs = np.flatnonzero(~covered)
+        rates = np.where(cover[:, uncoveredIDs] > 0, costRates[:, None], np.inf).min(axis=0)
+
+        durationBound = self._durationBound(uncoveredIDs, routesLeft)
+        bound = min(positiveGains[:routesLeft].sum(),
+                    np.maximum(0, self._weight - rates).sum(),
+                    durationBound)
+
+        if score + bound <= self._highestScore + EPSILON:
+            return
+
+        # minutes spent on covered or repeated connections are not in the duration bound
+        waste = self._durations[indices] - cover @ (uncovered * self._connectionDurations)
+        wasteful = indices[waste > score + durationBound - self._highestScore + EPSILON]
+
+        if len(wasteful):
+            allowed = allowed.copy()
+            allowed[wasteful] = False
+
+            self._branch(walks, covered, allowed, routesLeft, score, startTime)
+            return
+
+        # branch on the connection worth covering that the fewest walks drive
+        options = (cover[:, uncoveredIDs] > 0).sum(axis=0)
+        worthCovering = np.flatnonzero(self._weight - rates > EPSILON)
+        connectionID = uncoveredIDs[worthCovering[np.argmin(options[worthCovering])]]
+
+        candidates = indices[cover[:, connectionID] > 0]
+        candidates = candidates[np.argsort(-gains[cover[:, connectionID] > 0], kind="stable")]
+
+        allowed = allowed.copy()
+
+        for index in candidates:
+            # later branches may not select walks of earlier branches
+            allowed[index] = False
+
+            newCovered = covered | (self._cover[index] > 0)
+            newScore = np.count_nonzero(newCovered) * self._weight - \
+                (100 * (len(walks) + 1) + self._durations[walks + [index]].sum())
+
+            self._branch(walks + [index], newCovered, allowed.copy(), routesLeft - 1,
+                         float(newScore), startTime)
+
+        # the connection stays uncovered
+        self._branch(walks, covered, allowed, routesLeft, score, startTime)
+
+    def _durationBound(self, uncoveredIDs: np.ndarray, routesLeft: int) -> float:
+        """
+        Returns the highest amount of points that k new routes can add for k up to routesLeft, if
+        they would only drive uncovered connections. Any j driven connections take at least as
+        long as the j shortest, and as a connection can take longer than the points it is worth,
+        every amount up to the most that fit is evaluated.
+        """
+        durations = np.sort(self._connectionDurations[uncoveredIDs])
+        cumulative = np.concatenate([[0.0], np.cumsum(durations)])
+        points = np.arange(len(cumulative)) * self._weight - cumulative
+
+        bound = 0.0
+
+        for routes in range(1, routesLeft + 1):
+            # routes are shorter than maxDuration, so together shorter than routes * maxDuration
+            amount = int(np.searchsorted(cumulative, routes * self._maxDuration)) - 1
+            bound = max(bound, float(np.max(points[:amount + 1])) - 100 * routes)
+
+        return bound
@@ -0,0 +1,272 @@
+import heapq
+
+from classes.railNetwork import RailNetwork
+from classes.compactGraph import CompactGraph
+
+from typing import Dict, List, Optional, Tuple
+
+"""Module for a constructive initial solution based on Eulerian augmentation
+
+A graph in which every station has an even amount of connections has a closed walk that drives every
+connection exactly once, an Eulerian circuit. eulerianSolution() pairs up the stations with an odd
+amount of connections and connects every pair with a shortest path of duplicate connections, so
+every component of the station graph gets an Eulerian circuit. The circuits are then split into
+routes shorter than maxDuration. Duplicate connections at the ends of routes are dropped, so most
+duplicate paths only serve to connect the parts of the circuit.
+
+The solution is deterministic and covers every connection with close to the minimum amount of
+routes, which makes it a strong starting point for the optimization algorithms.
+"""
+
+
+# A step of a circuit: (from station ID, to station ID, connection ID, duration, is duplicate)
+Step = Tuple[int, int, int, float, bool]
+
+# The cost of a route in points, next to its duration
+ROUTE_COST = 100
+
+
+def eulerianSolution(network: RailNetwork, maxRoutes: int, maxDuration: float) -> RailNetwork:
+    """
+    Returns a solution built from the Eulerian circuits of the station graph of network. If the
+    circuits need more than maxRoutes routes, or routes cost more points than they add, the routes
+    that add the least points are removed.
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+
+    Returns (RailNetwork): A valid solution for network.
+    """
+    graph = network.compactGraph()
+
+    newNetwork = network.clone()
+
+    for component in _components(graph):
+        for route in _splitCircuit(_eulerianCircuit(graph, component), maxDuration):
+            stationIDs = [route[0][0]] + [step[1] for step in route]
+            newNetwork.addRoute([newNetwork.getStationByID(stationID) for stationID in stationIDs])
+
+    while newNetwork.listRoutes():
+        deltas = [(newNetwork.deltaRemoveRoute(route.getID()), route.getID())
+                  for route in newNetwork.listRoutes()]
+        delta, routeID = max(deltas)
+
+        if len(deltas) <= maxRoutes and delta <= 0:
+            break
+
+        newNetwork.delRoute(routeID)
+
+    return newNetwork
+
+
+def _components(graph: CompactGraph) -> List[List[int]]:
+    """Returns the station IDs of every connected component with at least one connection"""
+
+    seen = [False] * graph.nStations()
+    components = []
+
+    for root in range(graph.nStations()):
+        if seen[root] or not graph.degree(root):
+            continue
+
+        seen[root] = True
+        component = [root]
+
+        for stationID in component:
+            for neighbour in graph.neighbours(stationID).tolist():
+                if not seen[neighbour]:
+                    seen[neighbour] = True
+                    component.append(neighbour)
+
+        components.append(component)
+
+    return components
+
+
+def _shortestPaths(graph: CompactGraph, source: int) -> Tuple[List[float], List[int]]:
+    """
+    Returns the shortest duration from source to every station and the position in the neighbour
+    arrays of the last connection on that path, -1 for unreachable stations and source.
+    """
+    neighbours, _, durations = graph.neighbourArrays()
+    offsets = graph.offsets()
+
+    distances = [float("inf")] * graph.nStations()
+    previous = [-1] * graph.nStations()
+
+    distances[source] = 0.0
+    queue = [(0.0, source)]
+
+    while queue:
+        distance, stationID = heapq.heappop(queue)
+
+        if distance > distances[stationID]:
+            continue
+
+        for position in range(int(offsets[stationID]), int(offsets[stationID + 1])):
+            neighbour = int(neighbours[position])
+            newDistance = distance + float(durations[position])
+
+            if newDistance < distances[neighbour]:
+                distances[neighbour] = newDistance
+                previous[neighbour] = position
+                heapq.heappush(queue, (newDistance, neighbour))
+
+    return distances, previous
+
+
+def _eulerianCircuit(graph: CompactGraph, component: List[int]) -> List[Step]:
+    """
+    Returns an Eulerian circuit of a component after the odd stations have been paired up with
+    duplicate shortest paths. Pairs are chosen greedily, shortest distance first.
+    """
+    _, connections, durations = graph.neighbourArrays()
+
+    connectionIDs = sorted({connectionID for stationID in component
+                            for connectionID in graph.neighbourConnections(stationID).tolist()})
+
+    # every edge is stored as the steps in both directions
+    edges: List[Tuple[Step, Step]] = []
+
+    for connectionID in connectionIDs:
+        first, second = graph.endpoints()[connectionID].tolist()
+        duration = float(graph.durations()[connectionID])
+
+        edges.append(((first, second, connectionID, duration, False),
+                      (second, first, connectionID, duration, False)))
+
+    oddStations = [stationID for stationID in component if graph.degree(stationID) % 2]
+    paths = {stationID: _shortestPaths(graph, stationID) for stationID in oddStations}
+
+    pairs = sorted((paths[first][0][second], first, second)
+                   for index, first in enumerate(oddStations)
+                   for second in oddStations[index + 1:])
+    paired = set()
+
+    for _, first, second in pairs:
+        if first in paired or second in paired:
+            continue
+
+        paired.update((first, second))
+
+        # walk the path back from second to first and add its connections as duplicates
+        previous = paths[first][1]
+        stationID = second
+
+        while stationID != first:
+            position = previous[stationID]
+            connectionID = int(connections[position])
+            duration = float(durations[position])
+
+            # the other end of the connection
+            origin = int(graph.endpoints()[connectionID].sum()) - stationID
+
+            edges.append(((origin, stationID, connectionID, duration, True),
+                          (stationID, origin, connectionID, duration, True)))
+            stationID = origin
+
+    incident: Dict[int, List[Tuple[int, Step]]] = {stationID: [] for stationID in component}
+
+    for index, (forward, backward) in enumerate(edges):
+        incident[forward[0]].append((index, forward))
+        incident[backward[0]].append((index, backward))
+
+    # Hierholzer's algorithm
+    used = [False] * len(edges)
+    nextEdge = {stationID: 0 for stationID in component}
+
+    circuit: List[Step] = []
+    stack: List[Tuple[int, Optional[Step]]] = [(component[0], None)]
+
+    while stack:
+        stationID, arrival = stack[-1]
+        stationEdges = incident[stationID]
+
+        while nextEdge[stationID] < len(stationEdges) and used[stationEdges[nextEdge[stationID]][0]]:
+            nextEdge[stationID] += 1
+
+        if nextEdge[stationID] < len(stationEdges):
+            index, step = stationEdges[nextEdge[stationID]]
+            used[index] = True
+            stack.append((step[1], step))
+        else:
+            stack.pop()
+
+            if arrival is not None:
+                circuit.append(arrival)
+
+    circuit.reverse()
+
+    return circuit
+
+
+def _splitCircuit(circuit: List[Step], maxDuration: float) -> List[List[Step]]:
+    """
+    Returns the cheapest split of a circuit into routes shorter than maxDuration, trying every step
+    of the circuit as the start of the first route.
+    """
+    bestRoutes: List[List[Step]] = []
+    lowestCost = float("inf")
+
+    for start in range(len(circuit)):
+        routes = _splitSteps(circuit[start:] + circuit[:start], maxDuration)
+        cost = sum(ROUTE_COST + sum(step[3] for step in route) for route in routes)
+
+        if cost < lowestCost:
+            lowestCost = cost
+            bestRoutes = routes
+
+    return bestRoutes
+
+
+def _splitSteps(steps: List[Step], maxDuration: float) -> List[List[Step]]:
+    """
+    Greedily splits a walk into routes shorter than maxDuration. Runs of duplicate steps are only
+    kept inside a route if they cost fewer points than a new route and the next step still fits,
+    so routes never start or end with duplicate steps.
+    """
+    routes: List[List[Step]] = []
+    route: List[Step] = []
+    duration = 0.0
+
+    index = 0
+
+    while index < len(steps):
+        if steps[index][4]:
+            end = index
+
+            while end < len(steps) and steps[end][4]:
+                end += 1
+
+            runDuration = sum(step[3] for step in steps[index:end])
+
+            if route and runDuration < ROUTE_COST and end < len(steps) \
+                    and duration + runDuration + steps[end][3] < maxDuration:
+                route += steps[index:end]
+                duration += runDuration
+            elif route:
+                routes.append(route)
+                route, duration = [], 0.0
+
+            index = end
+            continue
+
+        step = steps[index]
+
+        if route and duration + step[3] >= maxDuration:
+            routes.append(route)
+            route, duration = [], 0.0
+
+        # connections that take maxDuration or longer can not be part of any route
+        if step[3] < maxDuration:
+            route.append(step)
+            duration += step[3]
+
+        index += 1
+
+    if route:
+        routes.append(route)
+
+    return routes
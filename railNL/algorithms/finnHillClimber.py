@@ -1,12 +1,13 @@
-from algorithms.random import randomSolution, randomRoute, exportScores
+from algorithms.random import initialSolution, randomRouteStations, exportScores, budgetDeadline
 
-from classes.railNetwork import RailNetwork
+from classes.railNetwork import RailNetwork, SCORE_EPSILON
 from classes.route import Route
+from classes.station import Station
+from classes.move import ReplaceRoute
 import datetime
+import time
 
-from typing import List, Dict, Union
-
-from copy import deepcopy
+from typing import List, Dict, Union, Optional
 
 
 class routeHillClimber():
@@ -15,34 +16,43 @@ class routeHillClimber():
     It finds the lowest scoring route in the current rail network.
     Then it generates a new route.
     Finally it keeps the best of the two in the rail network.
-    This is repeated until no improvement were made for 15,000 times.
+    This is repeated until no improvement were made for 15,000 times,
+    or until the time budget expires if one is given.
     """
 
     def __init__(self, network: RailNetwork, maxDuration: float, maxRoutes: int, runName: str,
-                 targetFolder: str, randomIterations: int) -> None:
+                 targetFolder: str, randomIterations: int, initialiser: str = "random",
+                 stopAtBound: bool = False, timeBudget: Optional[float] = None) -> None:
         """
         Initializer
         """
-        self.workModel: RailNetwork = randomSolution(network, maxRoutes,
-                                                     maxDuration, randomIterations)
+        # The time budget includes generating the initial network
+        self.deadline = budgetDeadline(timeBudget)
+        self.maxAttempts = 15000 if timeBudget is None else float("inf")
+
+        self.workModel: RailNetwork = initialSolution(network, maxRoutes, maxDuration,
+                                                      initialiser, randomIterations)
         self.routes: List[Route] = self.workModel.listRoutes()
         self.score: float = self.workModel.score()
-        self.previousModel: RailNetwork = deepcopy(self.workModel)
         self.iteration: int = 0
         self.attempts: int = 0
-        self.scoreList: List[Dict[str, Union[int, float]]] = []
+        self.scoreList: List[Dict[str, Union[int, float]]] = [{"iteration": 0,
+                                                                "score": self.score}]
         self.tMax = maxDuration
         self.routeMax = maxRoutes
         self.runName = runName
         self.targetFolder = targetFolder
         self.START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
 
+        # Stops as soon as the score is provably optimal, if requested
+        self.upperBound = network.upperBoundScore(maxDuration, maxRoutes) if stopAtBound \
+            else float("inf")
+
     def getLowestScoringRoute(self) -> int:
         """
         Returns route with only one station or
         lowest scoring route in railNetwork.
         """
-        self.previousModel = deepcopy(self.workModel)
         lowestScore: float = 10000
         lowestRoute: Route = self.routes[0]
         for route in self.workModel.listRoutes():
@@ -63,32 +73,35 @@ class routeHillClimber():
 
         self.workModel.delRoute(routeID)
 
-    def makeNewRoute(self) -> None:
+    def makeNewRoute(self) -> List[Station]:
         """
-        Creates a new route with a legal amount of stations.
+        Returns the stations of a new route with a legal amount of stations.
         """
 
-        randomRoute(self.workModel, self.tMax)
+        return randomRouteStations(self.workModel, self.tMax)
 
-    def checkSolution(self) -> None:
+    def checkSolution(self, move: ReplaceRoute) -> None:
         """
-        Checks current railNetwork against the previous best railNetwork.
-        Replaces previous best railNetwork if the current is better.
+        Checks the railNetwork with a route replaced by a new route against the current
+        railNetwork. The route is only replaced if the new railNetwork is better.
+
+        Args:
+            move (ReplaceRoute): The replacement of the lowest scoring route by a new route.
         """
 
-        newScore = self.workModel.score()
+        newScore = self.score + move.delta(self.workModel)
         oldScore = self.score
 
         # Goal: highest K value
         if newScore > oldScore:
             print(f"New High Score: {newScore}")
+            move.apply(self.workModel)
+            self.routes = self.workModel.listRoutes()
             self.score = newScore
             self.scoreList.append({"iteration": self.iteration, "score": newScore})
             self.attempts = 0
 
         else:
-            self.workModel = self.previousModel
-            self.routes = self.previousModel.listRoutes()
             self.attempts += 1
 
     def run(self) -> None:
@@ -96,11 +109,10 @@ class routeHillClimber():
         Runs a route-based Hill Climber algorithm and exports the results.
         """
         print("New attempt")
-        while self.attempts < 15000:
+        while self.attempts < self.maxAttempts and self.score < self.upperBound - SCORE_EPSILON \
+                and time.monotonic() < self.deadline:
             routeID = self.getLowestScoringRoute()
-            self.removeLowestRoute(routeID)
-            self.makeNewRoute()
-            self.checkSolution()
+            self.checkSolution(ReplaceRoute(routeID, self.makeNewRoute()))
             self.iteration += 1
 
         print(f"Final Score: {self.workModel.score()}")
@@ -110,7 +122,9 @@ class routeHillClimber():
 
 
 def main(network: RailNetwork, maxDuration: float, maxRoutes: int, runName: str,
-         targetFolder: str, randomIterations: int = 50) -> RailNetwork:
+         targetFolder: str, randomIterations: int = 50,
+         initialiser: str = "random", stopAtBound: bool = False,
+         timeBudget: Optional[float] = None) -> RailNetwork:
     """
     Greedy hill climber solver for Train routing problem.
 
@@ -121,8 +135,14 @@ def main(network: RailNetwork, maxDuration: float, maxRoutes: int, runName: str,
         runName (str): Human readable part of the filename
         targetFolder (str): The folder where solutions should be saved to
         randomIterations (int): The amount of iterations used to generate network.
+        initialiser (str): The initialiser of the network, "random" or "eulerian".
+        stopAtBound (bool): Whether to stop as soon as the score reaches the upper bound of the
+            network, see RailNetwork.upperBoundScore().
+        timeBudget (Optional[float]): The amount of seconds to run for, instead of until 15,000
+            attempts in a row did not improve the score.
     """
     model = routeHillClimber(network, maxDuration, maxRoutes, runName,
-                             targetFolder, randomIterations)
+                             targetFolder, randomIterations, initialiser, stopAtBound,
+                             timeBudget)
     model.run()
     return model.workModel
@@ -0,0 +1,378 @@
+import random
+import datetime
+import time
+import multiprocessing
+
+from multiprocessing.pool import Pool
+
+from classes.railNetwork import RailNetwork
+
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import algorithms.random as randomAlgorithm
+from algorithms.simulatedAnnealing import routeLists, buildNetwork
+
+"""Module for a Genetic Algorithm
+
+Individuals are solutions stored as compact route lists: lists of routes, each a list of station
+IDs. Every generation, parents are chosen by tournament selection and crossed over by exchanging
+routes. As a child can miss connections that both parents covered, its coverage is repaired with the
+routes of its parents that add the most points. Children are then mutated by adding, removing or
+replacing a random route.
+
+Fitness is the score of an individual as given by RailNetwork.score(). The individuals of every
+generation are scored in worker processes, which each hold an empty copy of the network to build
+individuals on.
+"""
+
+
+# A solution as lists of station IDs, see simulatedAnnealing.routeLists()
+Individual = List[List[int]]
+
+
+def main(
+    network: RailNetwork,
+    maxRoutes: int,
+    maxDuration: float,
+    targetFolder: str = "results",
+    runName: str = "solutionGenetic",
+    populationSize: int = 50,
+    generations: int = 500,
+    elites: int = 2,
+    tournamentSize: int = 3,
+    mutationRate: float = 0.3,
+    convergenceLimit: int = 100,
+    processes: Optional[int] = None,
+    randomIterations: int = 100,
+    initialiser: str = "random",
+    recordAll: bool = False,
+    exportImprovements: bool = False,
+    timeBudget: Optional[float] = None
+) -> RailNetwork:
+    """
+    Genetic algorithm solver for the Train routing problem. Exports a score summary file, as well as
+    the best solution produced.
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        targetFolder (str): The folder where solutions should be saved to.
+        runName (str): Human readable part of the filename.
+        populationSize (int): The amount of individuals in every generation.
+        generations (int): The maximum amount of generations.
+        elites (int): The amount of best individuals that are copied to the next generation
+            unchanged.
+        tournamentSize (int): The amount of individuals that compete for every parent.
+        mutationRate (float): The chance that a child is mutated.
+        convergenceLimit (int): The maximum amount of generations to run for without improvement
+            before terminating the algorithm.
+        processes (Optional[int]): The amount of worker processes for fitness evaluation, one per
+            CPU core if None. Individuals are scored in the current process if 1, or if the current
+            process is a worker of a batch itself.
+        randomIterations (int): For how many iterations the random algorithm should be ran for the
+            first individual.
+        initialiser (str): The initialiser of the first individual, "random" or "eulerian". See
+            algorithms.random.initialSolution(). The other individuals are random.
+        recordAll (bool): Whether the average score of every generation should be recorded for the
+            score summary file next to the best score.
+        exportImprovements (bool): Whether to export every improvement
+        timeBudget (Optional[float]): The amount of seconds to run for, regardless of generations
+            and convergenceLimit. The first generation is always evaluated. Runs until either is
+            reached if None.
+
+    Returns (RailNetwork): The best network found.
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm runs until it expires instead of until convergence
+    if timeBudget is not None:
+        generations = convergenceLimit = float("inf") # type: ignore
+
+    print("generating initial population")
+
+    population = [routeLists(randomAlgorithm.initialSolution(
+        network, maxRoutes, maxDuration, initialiser, randomIterations
+    ))]
+    population += randomPopulation(network, maxRoutes, maxDuration, populationSize - 1)
+
+    problem = CoverageProblem(network)
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    # worker processes of a batch can not start processes of their own
+    pool: Optional[Pool] = None
+    processes = min(processes, populationSize)
+
+    if processes > 1 and not multiprocessing.current_process().daemon:
+        pool = multiprocessing.Pool(
+            processes, initializer=_initFitnessWorker, initargs=(network.clone(),)
+        )
+    else:
+        _initFitnessWorker(network.clone())
+
+    scores: List[Dict[str, Union[int, float, str]]] = []
+
+    bestIndividual: Individual = []
+    highestScore = -float("inf")
+    convergence = 0
+    generation = 0
+
+    try:
+        # the first generation is always evaluated, so there is a best individual
+        while generation < generations and (not generation or time.monotonic() < deadline):
+            fitness = evaluate(pool, population, max(1, populationSize // (4 * processes)))
+
+            best = max(range(len(population)), key=fitness.__getitem__)
+
+            if fitness[best] > highestScore:
+                print(f"new best found: {fitness[best]}")
+
+                highestScore = fitness[best]
+                bestIndividual = population[best]
+                convergence = 0
+
+                scores.append({"iteration": generation, "score": highestScore})
+
+                if exportImprovements:
+                    buildNetwork(network, bestIndividual).exportSolution(
+                        targetFolder, f"{runName}-{generation}"
+                    )
+
+            elif convergence >= convergenceLimit:
+                break
+
+            else:
+                convergence += 1
+
+            if recordAll:
+                scores.append({"iteration": generation, "score": sum(fitness) / len(fitness)})
+
+            if not generation % 50:
+                print(f"generation: {generation}")
+
+            population = nextGeneration(
+                network, problem, population, fitness, maxRoutes, maxDuration, elites,
+                tournamentSize, mutationRate
+            )
+
+            generation += 1
+
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    bestNetwork = buildNetwork(network, bestIndividual)
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores.append({"iteration": "Best", "score": highestScore})
+    scores.append({"iteration": "Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    print(f"Terminating with highest score {highestScore}")
+
+    return bestNetwork
+
+
+def randomPopulation(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, size: int
+) -> List[Individual]:
+    """Returns size random individuals, built from one batch of random routes"""
+
+    minRoutes = min(int(network.minimumRoutes(maxDuration)), maxRoutes)
+
+    nRoutes = [random.randint(minRoutes, maxRoutes) for _ in range(size)]
+    routes, _, _ = randomAlgorithm.randomRouteBatch(network, maxDuration, sum(nRoutes))
+
+    population = []
+    start = 0
+
+    for amount in nRoutes:
+        population.append(routes[start:start + amount])
+        start += amount
+
+    return population
+
+
+def nextGeneration(
+    network: RailNetwork,
+    problem: "CoverageProblem",
+    population: List[Individual],
+    fitness: List[float],
+    maxRoutes: int,
+    maxDuration: float,
+    elites: int,
+    tournamentSize: int,
+    mutationRate: float
+) -> List[Individual]:
+    """
+    Returns the next generation: the elites of population followed by mutated children of parents
+    chosen by tournament selection.
+    """
+    order = sorted(range(len(population)), key=fitness.__getitem__, reverse=True)
+    children = [population[index] for index in order[:elites]]
+
+    while len(children) < len(population):
+        parent1 = tournament(population, fitness, tournamentSize)
+        parent2 = tournament(population, fitness, tournamentSize)
+
+        child = problem.crossover(parent1, parent2, maxRoutes)
+
+        if random.random() < mutationRate:
+            child = mutate(network, child, maxRoutes, maxDuration)
+
+        children.append(child)
+
+    return children
+
+
+def tournament(population: List[Individual], fitness: List[float], size: int) -> Individual:
+    """Returns the fittest of size random individuals of population"""
+
+    contestants = random.sample(range(len(population)), min(size, len(population)))
+
+    return population[max(contestants, key=fitness.__getitem__)]
+
+
+def mutate(
+    network: RailNetwork, individual: Individual, maxRoutes: int, maxDuration: float
+) -> Individual:
+    """
+    Returns a copy of individual with a random route removed with a chance of 0.125, a random route
+    added with a chance of 0.125 and a random route replaced otherwise.
+    """
+    individual = list(individual)
+    randomNum = random.random()
+
+    if randomNum <= 0.125 and len(individual) > 1:
+        individual.pop(random.randrange(len(individual)))
+        return individual
+
+    newRoute = [station.getID() for station in
+                randomAlgorithm.randomRouteStations(network, maxDuration)]
+
+    if (randomNum <= 0.25 and len(individual) < maxRoutes) or not individual:
+        individual.append(newRoute)
+    else:
+        individual[random.randrange(len(individual))] = newRoute
+
+    return individual
+
+
+class CoverageProblem:
+    """Connection coverage of routes, used to cross over individuals
+
+    Attributes:
+        _connectionIDs (Dict[Tuple[int, int], int]): The connection ID between two stations, keyed
+            by their station IDs in both orders.
+        _durations (List[float]): The duration of every connection.
+        _weight (float): The points per covered connection.
+    """
+
+    __slots__ = ("_connectionIDs", "_durations", "_weight")
+
+    def __init__(self, network: RailNetwork):
+        """
+        Initializer function
+
+        Args:
+            network (RailNetwork): The network the individuals are solutions for.
+        """
+        graph = network.compactGraph()
+
+        self._connectionIDs: Dict[Tuple[int, int], int] = dict()
+
+        # the last connection between two stations is used, like the stations of RailNetwork do
+        for connectionID, (first, second) in enumerate(graph.endpoints().tolist()):
+            self._connectionIDs[(first, second)] = connectionID
+            self._connectionIDs[(second, first)] = connectionID
+
+        self._durations = graph.durations().tolist()
+        self._weight = 10000 / graph.nConnections()
+
+    def connections(self, route: List[int]) -> Set[int]:
+        """Returns the IDs of the connections used by a route"""
+
+        return {self._connectionIDs[(first, second)] for first, second in zip(route, route[1:])}
+
+    def duration(self, route: List[int]) -> float:
+        """Returns the duration of a route"""
+
+        return sum(self._durations[self._connectionIDs[(first, second)]]
+                   for first, second in zip(route, route[1:]))
+
+    def crossover(self, parent1: Individual, parent2: Individual, maxRoutes: int) -> Individual:
+        """
+        Returns a child with every route of both parents with a chance of 0.5. The coverage of the
+        child is then repaired by adding the other routes of the parents that add the most points,
+        for as long as they add points and the child has fewer than maxRoutes routes.
+
+        Args:
+            parent1 (Individual): The first parent.
+            parent2 (Individual): The second parent.
+            maxRoutes (int): The maximum amount of routes of the child.
+
+        Returns (Individual): The child.
+        """
+        candidates = parent1 + parent2
+        random.shuffle(candidates)
+
+        chosen = [random.random() < 0.5 for _ in candidates]
+        child = [route for route, take in zip(candidates, chosen) if take][:maxRoutes]
+        rest = [route for route, take in zip(candidates, chosen) if not take]
+
+        covered: Set[int] = set()
+
+        for route in child:
+            covered |= self.connections(route)
+
+        while rest and len(child) < maxRoutes:
+            gains = [len(self.connections(route) - covered) * self._weight -
+                     (100 + self.duration(route)) for route in rest]
+            best = max(range(len(rest)), key=gains.__getitem__)
+
+            if gains[best] <= 0:
+                break
+
+            covered |= self.connections(rest[best])
+            child.append(rest.pop(best))
+
+        return child
+
+
+def evaluate(pool: Optional[Pool], population: List[Individual], chunkSize: int = 1) -> List[float]:
+    """
+    Returns the score of every individual, computed in the worker processes of pool if given.
+
+    Args:
+        pool (Optional[Pool]): The worker processes, see _initFitnessWorker(). None to score the
+            individuals in the current process.
+        population (List[Individual]): The individuals to score.
+        chunkSize (int): The amount of individuals sent to a worker process at once.
+    """
+    if pool:
+        return pool.map(_fitness, population, chunksize=chunkSize)
+
+    return [_fitness(individual) for individual in population]
+
+
+# The empty network individuals are built on in a worker process, see _initFitnessWorker()
+_FITNESS_NETWORK: Optional[RailNetwork] = None
+
+
+def _initFitnessWorker(network: RailNetwork) -> None:
+    """Stores the empty network that individuals are built on in the current process"""
+
+    global _FITNESS_NETWORK
+    _FITNESS_NETWORK = network
+
+
+def _fitness(individual: Individual) -> float:
+    """Returns the score of an individual. Can be ran in a worker process."""
+
+    return buildNetwork(_FITNESS_NETWORK, individual).score() # type: ignore
@@ -1,12 +1,13 @@
 import random
-from copy import deepcopy
-from typing import List, Tuple, Any, Dict, Union
+from typing import List, Tuple, Any, Dict, Union, Optional
 import datetime
+import time
 
-from classes.railNetwork import RailNetwork
+from classes.railNetwork import RailNetwork, SCORE_EPSILON
 from classes.route import Route
 from classes.station import Station
-from algorithms.random import randomSolution, exportScores, randomRoute
+from classes.move import Move, AddRoute, RemoveRoute, PopHead, PopTail
+from algorithms.random import initialSolution, exportScores, budgetDeadline, randomPush, randomRouteStations
 
 
 
@@ -14,26 +15,37 @@ class HillClimber():
 
 
     def __init__(self, model, runName: str, targetFolder: str, maxRoutes: int,
-                 maxDuration: int, randomIterations: int, maxConvergence: int):
-        # Takes a random solution
-        model = randomSolution(model, maxRoutes, maxDuration, randomIterations)
-        workModel = deepcopy(model)
-        self.previousModel = deepcopy(workModel)
+                 maxDuration: int, randomIterations: int, maxConvergence: int,
+                 initialiser: str = "random", stopAtBound: bool = False,
+                 timeBudget: Optional[float] = None):
+        # The time budget includes taking the initial solution
+        self.deadline = budgetDeadline(timeBudget)
+
+        # Takes an initial solution, random unless another initialiser is given
+        model = initialSolution(model, maxRoutes, maxDuration, initialiser, randomIterations)
+        workModel = model.clone()
         self.workModel = workModel
+        self.moves: List[Move] = []
         self.routes = workModel.listRoutes()
         self.score = workModel.score()
-        self.scores: List[Dict[str, Union[int, float]]] = []
+        self.scores: List[Dict[str, Union[int, float]]] = [{"iteration":0, "score":self.score}]
         self.iteration = 0
-        self.maxConvergence = maxConvergence
+        # Runs until the time budget expires instead of until convergence, if one is given
+        self.maxConvergence = maxConvergence if timeBudget is None else float("inf")
         self.runName = runName
         self.targetFolder = targetFolder
 
+        # Stops as soon as the score is provably optimal, if requested
+        self.upperBound = model.upperBoundScore(maxDuration, maxRoutes) if stopAtBound \
+            else float("inf")
 
-    def ReplaceOrMutate(self):
+
+    def ReplaceOrMutate(self) -> List[Move]:
         """
         Makes a choice between replace the lowest score route, or mutate a Route.
         """
-        self.workModel = deepcopy(self.previousModel)
+        # the moves are undone if the solution is not accepted, see checkSolution()
+        self.moves = []
 
         # makes sure that the minimum of routes is 7, for highest results
         if self.workModel.nRoute() < 7:
@@ -49,6 +61,8 @@ class HillClimber():
                 self.removeLowestRoute(routeID)
                 self.makeNewRoute(routeID)
 
+        return self.moves
+
 
     def getLowestScoringRoute(self) -> int:
         """
@@ -70,14 +84,14 @@ class HillClimber():
         Removes route from the railNetwork with the lowest score.
         """
 
-        self.workModel.delRoute(routeID)
+        self.makeMove(RemoveRoute(routeID))
 
     def makeNewRoute(self, routeID: int) -> None:
         """
         Creates a new route with a legal amount of stations.
         """
 
-        randomRoute(self.workModel, 180)
+        self.makeMove(AddRoute(randomRouteStations(self.workModel, 180)))
 
 
     def mutateRoute(self) -> None:
@@ -90,22 +104,22 @@ class HillClimber():
             randomFloat = random.random()
             if randomFloat <= 0.33:
                 # removes last station
-                route.popStation()
+                self.makeMove(PopTail(route.getID()))
                 if route.nStations() > 1:
-                    route.popStation()
+                    self.makeMove(PopTail(route.getID()))
                     if route.nStations() > 1:
-                        route.popStation()
+                        self.makeMove(PopTail(route.getID()))
                         self.lengthenRoute(route)
                     self.lengthenRoute(route)
                 # add station
                 self.lengthenRoute(route)
             elif randomFloat <= 0.67:
                 # removes last station
-                route.popStation(0)
+                self.makeMove(PopHead(route.getID()))
                 if route.nStations() > 1:
-                    route.popStation(0)
+                    self.makeMove(PopHead(route.getID()))
                     if route.nStations() > 1:
-                        route.popStation(0)
+                        self.makeMove(PopHead(route.getID()))
                         self.lengthenRoute(route)
                     self.lengthenRoute(route)
                 # add station
@@ -115,39 +129,42 @@ class HillClimber():
                 self.lengthenRoute(route)
 
 
-    def lengthenRoute(self, route: List[str]) -> List[str]:
+    def makeMove(self, move: Move) -> None:
         """
-        Adds a station to the route, if it is still under tMax.
+        Applies a move to the work model and remembers it, so it can be undone.
         """
-        if not route.hasLegalMoves(180):
-            return
+        move.apply(self.workModel)
+        self.moves.append(move)
 
-        options = route.getLegalMoves(180)
-        index = random.choice(list(options.keys()))
 
-        # add new station as last station
-        if index > 0:
-            route.appendStation(random.choice(options[index])[0])
+    def lengthenRoute(self, route: List[str]) -> List[str]:
+        """
+        Adds a station to the route, if it is still under tMax.
+        """
+        move = randomPush(route, 180)
 
-        # add new station as first station
-        elif index == 0:
-            route.insertStation(0, random.choice(options[index])[0])
+        if move is not None:
+            self.makeMove(move)
 
 
-    def checkSolution(self, routes: List[List[str]]) -> None:
+    def checkSolution(self, moves: List[Move]) -> None:
         """
-        Checks and accepts better solutions than current solution.
+        Checks and accepts better solutions than current solution. Worse solutions are restored
+        to the current solution by undoing their moves.
         """
         newScore = self.workModel.score()
         oldScore = self.score
 
         # We are looking for the highest possible K
         if newScore >= oldScore:
-            self.previousModel = self.workModel
             self.score = newScore
             self.scores.append({"iteration":self.iteration, "score":newScore})
             self.convergence = 0
 
+        else:
+            for move in reversed(moves):
+                move.undo(self.workModel)
+
 
     def run(self, verbose=False, mutate_nodes_number=1) -> None:
         """
@@ -157,7 +174,9 @@ class HillClimber():
 
         self.convergence = 0
 
-        while self.convergence <= self.maxConvergence:
+        while self.convergence <= self.maxConvergence \
+                and self.score < self.upperBound - SCORE_EPSILON \
+                and time.monotonic() < self.deadline:
 
             # Accept it if it is better
             self.checkSolution(self.ReplaceOrMutate())
@@ -165,15 +184,17 @@ class HillClimber():
             self.convergence += 1
 
         # exports scores
-        self.previousModel.exportSolution(self.targetFolder, self.runName)
+        self.workModel.exportSolution(self.targetFolder, self.runName)
         exportScores(self.scores, self.targetFolder, self.runName, START_TIMESTAMP)
 
 
 def main(network: RailNetwork, runName: str, targetFolder: str, maxRoutes: int,
          maxDuration: int, randomIterations: int=50,
-         maxConvergence: int=10000) -> RailNetwork:
+         maxConvergence: int=10000, initialiser: str="random",
+         stopAtBound: bool=False, timeBudget: Optional[float]=None) -> RailNetwork:
 
     model = HillClimber(network, runName, targetFolder, maxRoutes, maxDuration,
-                        randomIterations, maxConvergence)
+                        randomIterations, maxConvergence, initialiser, stopAtBound,
+                        timeBudget)
     model.run()
-    return model.previousModel
+    return model.workModel
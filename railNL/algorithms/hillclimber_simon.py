@@ -1,93 +1,108 @@
 import random
-from copy import deepcopy
-from typing import List, Tuple, Any, Dict, Union
+from typing import List, Tuple, Any, Dict, Union, Optional
 import datetime
+import time
 
-from classes.railNetwork import RailNetwork
+from classes.railNetwork import RailNetwork, SCORE_EPSILON
 from classes.route import Route
 from classes.station import Station
-from algorithms.random import randomSolution, exportScores
+from classes.move import Move, PopHead, PopTail
+from algorithms.random import initialSolution, exportScores, budgetDeadline, randomPush
 
 
 class HillClimber():
 
 
     def __init__(self, model, runName: str, targetFolder: str, maxRoutes: int,
-                 maxDuration: int, randomIterations: int, maxConvergence: int):
-        # Takes a random solution
-        model = randomSolution(model, maxRoutes, maxDuration, randomIterations)
-        workModel = deepcopy(model)
+                 maxDuration: int, randomIterations: int, maxConvergence: int,
+                 initialiser: str = "random", stopAtBound: bool = False,
+                 timeBudget: Optional[float] = None):
+        # The time budget includes taking the initial solution
+        self.deadline = budgetDeadline(timeBudget)
+
+        # Takes an initial solution, random unless another initialiser is given
+        model = initialSolution(model, maxRoutes, maxDuration, initialiser, randomIterations)
+        workModel = model.clone()
 
         self.workModel = workModel
-        self.previousModel = deepcopy(self.workModel)
+        self.moves: List[Move] = []
         self.score = self.workModel.score()
-        self.scores: List[Dict[str, Union[int, float]]] = []
+        self.scores: List[Dict[str, Union[int, float]]] = [{"iteration":0, "score":self.score}]
         self.iteration = 0
-        self.maxConvergence = maxConvergence
+        # Runs until the time budget expires instead of until convergence, if one is given
+        self.maxConvergence = maxConvergence if timeBudget is None else float("inf")
         self.runName = runName
         self.targetFolder = targetFolder
 
+        # Stops as soon as the score is provably optimal, if requested
+        self.upperBound = model.upperBoundScore(maxDuration, maxRoutes) if stopAtBound \
+            else float("inf")
+
 
-    def mutateRoute(self) -> None:
+    def mutateRoute(self) -> List[Move]:
         """
         Random choice between removing first or last station for every route taken.
         Than adds a new station to the route.
         """
-        self.workModel = deepcopy(self.previousModel)
+        # the moves are undone if the solution is not accepted, see checkSolution()
+        self.moves = []
 
         # mutate every route in the workModel
         for route in self.workModel.listRoutes():
             randomFloat = random.random()
             if randomFloat <= 0.33:
                 # removes last station
-                route.popStation()
+                self.makeMove(PopTail(route.getID()))
                 # add station
                 self.lengthenRoute(route)
             elif randomFloat <= 0.67:
                 # removes last station
-                route.popStation(0)
+                self.makeMove(PopHead(route.getID()))
                 # add station
                 self.lengthenRoute(route)
             else:
                 # add station
                 self.lengthenRoute(route)
 
-        return self.workModel
+        return self.moves
 
 
-    def lengthenRoute(self, route: List[str]) -> List[str]:
+    def makeMove(self, move: Move) -> None:
         """
-        Adds a station to the route, if it is still under tMax.
+        Applies a move to the work model and remembers it, so it can be undone.
         """
-        if not route.hasLegalMoves(180):
-            return
+        move.apply(self.workModel)
+        self.moves.append(move)
 
-        options = route.getLegalMoves(180)
-        index = random.choice(list(options.keys()))
 
-        # add new station as last station
-        if index > 0:
-            route.appendStation(random.choice(options[index])[0])
+    def lengthenRoute(self, route: List[str]) -> List[str]:
+        """
+        Adds a station to the route, if it is still under tMax.
+        """
+        move = randomPush(route, 180)
 
-        # add new station as first station
-        elif index == 0:
-            route.insertStation(0, random.choice(options[index])[0])
+        if move is not None:
+            self.makeMove(move)
 
 
-    def checkSolution(self, routes: List[List[str]]) -> None:
+    def checkSolution(self, moves: List[Move]) -> None:
         """
-        Checks and accepts better solutions than current solution.
+        Checks and accepts better solutions than current solution. Worse solutions are restored
+        to the current solution by undoing their moves.
         """
         newScore = self.workModel.score()
         oldScore = self.score
 
         # We are looking for the highest possible K
         if newScore >= oldScore:
-            self.previousModel = self.workModel
             self.score = newScore
             self.scores.append({"iteration":self.iteration, "score":newScore})
             self.convergence = 0
 
+        else:
+            for move in reversed(moves):
+                move.undo(self.workModel)
+
 
     def run(self, verbose=False, mutate_nodes_number=1) -> None:
         """
@@ -98,7 +113,9 @@ class HillClimber():
 
         self.convergence = 0
 
-        while self.convergence <= self.maxConvergence:
+        while self.convergence <= self.maxConvergence \
+                and self.score < self.upperBound - SCORE_EPSILON \
+                and time.monotonic() < self.deadline:
 
             # Accept it if it is better
             self.checkSolution(self.mutateRoute())
@@ -106,15 +123,17 @@ class HillClimber():
             self.iteration += 1
 
         # exports scoress
-        self.previousModel.exportSolution(self.targetFolder, self.runName)
+        self.workModel.exportSolution(self.targetFolder, self.runName)
         exportScores(self.scores, self.targetFolder, self.runName, START_TIMESTAMP)
 
 
 def main(network: RailNetwork, runName: str, targetFolder: str, maxRoutes: int,
          maxDuration: int, randomIterations: int=50,
-         maxConvergence: int=10000) -> RailNetwork:
+         maxConvergence: int=10000, initialiser: str="random",
+         stopAtBound: bool=False, timeBudget: Optional[float]=None) -> RailNetwork:
 
     model = HillClimber(network, runName, targetFolder, maxRoutes, maxDuration,
-                        randomIterations, maxConvergence)
+                        randomIterations, maxConvergence, initialiser, stopAtBound,
+                        timeBudget)
     model.run()
-    return model.previousModel
+    return model.workModel
@@ -4,13 +4,19 @@ import os
 import datetime
 import time
 
-from copy import deepcopy
+from collections import deque
+
+import numpy as np
+
+from algorithms.eulerian import eulerianSolution
 
 from classes.railNetwork import RailNetwork
+from classes.compactGraph import CompactGraph
+from classes.move import Move, PushHead, PushTail
 from classes.route import Route
 from classes.station import Station
 
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Optional, Tuple
 
 """Module for generating random solutions for Train routing problem
 
@@ -22,8 +28,14 @@ every iteration if recordAll is true, or score improvements per iteration.
 The module also contains the following functions which can be applied for other problems:
     - randomRoute(): Generates a random route in the RailNetwork graph, that scores more than 0 
         points in an isolated system.
+    - randomRouteBatch(): Generates many random routes at once with NumPy, as randomRoute() would.
+    - randomPush(): Proposes to lengthen a route at a random end with a random legal station.
     - randomSolution(): Returns the best random solution for a given amount of random iterations for
         optimization algorithms.
+    - initialSolution(): Returns the initial solution for optimization algorithms built by the
+        selected initialiser.
+    - budgetDeadline(): Returns the time at which an algorithm with a time budget has to return its
+        best solution.
     - exportSCores(): Exports a score summary csv file from a list of dictionaries containing the
         iteration and score per stored iteration.
 """
@@ -39,7 +51,8 @@ def main(
     targetFolder: str ="results", 
     runName: str = "solution", 
     convergenceLimit: int = 5000, 
-    recordAll: bool = False
+    recordAll: bool = False,
+    timeBudget: Optional[float] = None
     ):
     """
     Random solver for Train routing problem. Intended for baselining and for generating standalone
@@ -55,7 +68,15 @@ def main(
             improvements.
         recordAll (bool): True if all scores should be tracked for the summary file, false if
             only score improvements should be tracked
+        timeBudget (Optional[float]): The amount of seconds to run the algorithm for, regardless of
+            convergenceLimit. Runs until convergence if None.
     """
+    deadline = budgetDeadline(timeBudget)
+
+    # without a convergence limit, the algorithm runs until the deadline
+    if timeBudget is not None:
+        convergenceLimit = 0
+
     # Guarantees that the summary file will have a lower timestamp than the first result
     time.sleep(1)
 
@@ -65,11 +86,11 @@ def main(
 
     scores: List[Dict[str, Union[int, float]]] = []
 
-    while convergence <= convergenceLimit:
+    while convergence <= convergenceLimit and time.monotonic() < deadline:
         if not iteration % 1000:
             print(f"iteration: {iteration}")
 
-        workNetwork = deepcopy(network)
+        workNetwork = network.clone()
         randomAlgorithm(workNetwork, maxRoutes, maxDuration)
         
         newScore = workNetwork.score()
@@ -138,35 +159,260 @@ def randomRoute(network: RailNetwork, maxDuration: float) -> None:
     
     Post: The network given in the argument will have a new route.
     """
-    longestConnection = network.getLongestDuration()
+    network.addRoute(randomRouteStations(network, maxDuration))
+
+    return
+
 
-    route = network.createRoute(random.choice(network.listStations()))
+def randomRouteStations(network: RailNetwork, maxDuration: float) -> List[Station]:
+    """
+    Returns the stations of a random route as generated by randomRoute(), without changing the
+    network. Intended for generating candidate routes that are only added to the network when they
+    improve its score.
+
+    Args:
+        network (RailNetwork): The object containing all nodes and routes of the system.
+        maxDuration (float): The maximum duration a single route may have.
+
+    Returns (List[Station]): The stations of the route in order of travel.
+    """
+    longestConnection = network.getLongestDuration()
+    graph = network.searchGraph()
+    neighbours, connections, durations = graph.neighbourArrays()
 
-    while route.routeScore(network.nConnections()) <= 0:
+    while True:
         tTarget = random.randrange(round(longestConnection), round(maxDuration))
 
-        route.empty()
+        firstStation = random.choice(network.listStations()).getID()
+        start, end = graph.legalNeighbourRange(firstStation, maxDuration)
 
-        route.appendStation(random.choice(network.listStations()))
+        # stations inside contracted chains have no connections of their own
+        if start == end:
+            continue
+
+        position = start + random.randrange(end - start)
+
+        stationIDs = deque([firstStation, int(neighbours[position])])
+        connectionIDs = deque([int(connections[position])])
+        duration = float(durations[position])
 
-        route.appendStation(
-            random.choice(
-                    [station for station, *_ in route.listStations()[0].listStations()]
-                )
-            )
-        
         # Routes fill up to tTarget or until they no longer have legal moves
-        while route.hasLegalMoves(tTarget):
-            moves = route.getLegalMoves(tTarget)
-            
-            index = random.choice(list(moves.keys()))
+        while duration < tTarget:
+            ends = []
+
+            for index, stationID in enumerate((stationIDs[0], stationIDs[-1])):
+                start, end = graph.legalNeighbourRange(stationID, tTarget - duration)
+
+                if start < end:
+                    ends.append((index, start, end))
+
+            if not ends:
+                break
+
+            index, start, end = random.choice(ends)
+            position = random.randrange(start, end)
 
             if index == 0:
-                route.insertStation(index, random.choice(moves[index])[0])
-            
+                stationIDs.appendleft(int(neighbours[position]))
+                connectionIDs.appendleft(int(connections[position]))
             else:
-                route.appendStation(random.choice(moves[index])[0])
-    return
+                stationIDs.append(int(neighbours[position]))
+                connectionIDs.append(int(connections[position]))
+
+            duration += float(durations[position])
+
+        routeStations, routeConnections = graph.expand(list(stationIDs), list(connectionIDs))
+
+        # Equal to Route.routeScore() of the finished route
+        if len(set(routeConnections)) / network.nConnections() * 10000 - (100 + duration) > 0:
+            return [network.getStationByID(stationID) for stationID in routeStations]
+
+
+def randomPush(route: Route, maxDuration: float) -> Optional[Move]:
+    """
+    Proposes to add a random legal station to a random end of a route.
+
+    Args:
+        route (Route): The route to be lengthened.
+        maxDuration (float): The maximum duration a single route may have.
+
+    Returns (Optional[Move]): The proposed move, which is not yet applied to the network of the
+        route, or None if the route has no legal moves.
+    """
+    if not route.hasLegalMoves(maxDuration):
+        return None
+
+    options = route.getLegalMoves(maxDuration)
+    index = random.choice(list(options.keys()))
+
+    # add new station as last station
+    if index > 0:
+        return PushTail(route.getID(), random.choice(options[index])[0])
+
+    # add new station as first station
+    return PushHead(route.getID(), random.choice(options[index])[0])
+
+
+def randomRouteBatch(
+    network: RailNetwork,
+    maxDuration: float,
+    count: int,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[List[List[int]], np.ndarray, np.ndarray]:
+    """
+    Generates count random routes like randomRouteStations() does, but performs all random walks at
+    once on the arrays of the search graph of the network.
+
+    Args:
+        network (RailNetwork): The object containing all nodes and routes of the system.
+        maxDuration (float): The maximum duration a single route may have.
+        count (int): The amount of routes to generate.
+        rng (Optional[np.random.Generator]): The random number generator for the walks. Seeded from
+            the random module if None.
+
+    Returns (Tuple): The station IDs of every route in order of travel, a (count, connections)
+        boolean array that is True where a route uses a connection, and the duration of every route.
+
+    Raises:
+        ValueError: If no connection is shorter than maxDuration.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    graph = network.searchGraph()
+
+    stationIDs: List[List[int]] = []
+    covered = []
+    durations = []
+
+    while len(stationIDs) < count:
+        # about half of the walks score more than 0 points in isolation
+        walks, walkCovered, walkDurations = _randomWalks(
+            graph, network.getLongestDuration(), maxDuration, 2 * (count - len(stationIDs)), rng
+        )
+
+        # Equal to Route.routeScore() of the finished routes
+        scores = walkCovered.sum(axis=1) / network.nConnections() * 10000 - (100 + walkDurations)
+        keep = np.flatnonzero(scores > 0)
+
+        stationIDs += [walks[index] for index in keep.tolist()]
+        covered.append(walkCovered[keep])
+        durations.append(walkDurations[keep])
+
+    return stationIDs[:count], np.concatenate(covered)[:count], np.concatenate(durations)[:count]
+
+
+def _randomWalks(
+    graph: CompactGraph,
+    longestConnection: float,
+    maxDuration: float,
+    count: int,
+    rng: np.random.Generator
+) -> Tuple[List[List[int]], np.ndarray, np.ndarray]:
+    """
+    Performs count random walks at once, see randomRouteBatch(). Walks are not filtered on their
+    score. The walks and the connections they use are expanded to the network, see
+    CompactGraph.expand().
+
+    Raises:
+        ValueError: If no connection is shorter than maxDuration.
+    """
+    offsets = graph.offsets()
+    neighbours, connections, durations = graph.neighbourArrays()
+    degrees = np.diff(offsets)
+
+    # the durations of the neighbours of every station in rows padded with inf, so the amount of
+    # legal neighbours of many stations can be counted at once
+    rowDurations = np.full((graph.nStations(), max(1, int(degrees.max()))), np.inf)
+    rowDurations[np.repeat(np.arange(graph.nStations()), degrees),
+                 np.arange(len(neighbours)) - np.repeat(offsets[:-1], degrees)] = durations
+
+    if not (rowDurations < maxDuration).any():
+        raise ValueError(f"No connection is shorter than the maximum duration {maxDuration}")
+
+    walks = np.arange(count)
+    tTarget = rng.integers(round(longestConnection), round(maxDuration), count)
+
+    # the first connection is any connection of the first station shorter than maxDuration
+    head = rng.integers(0, graph.nStations(), count)
+    firstMoves = (rowDurations[head] < maxDuration).sum(axis=1)
+
+    # stations inside contracted chains have no connections of their own
+    while not firstMoves.all():
+        stuck = np.flatnonzero(firstMoves == 0)
+        head[stuck] = rng.integers(0, graph.nStations(), len(stuck))
+        firstMoves[stuck] = (rowDurations[head[stuck]] < maxDuration).sum(axis=1)
+
+    position = offsets[head] + (rng.random(count) * firstMoves).astype(np.int64)
+    tail = neighbours[position]
+
+    # walks grow outwards from the middle of the station buffer, which holds the most connections
+    # that fit in maxDuration. Connections that take no time do not count, so walks over them stop
+    # at the end of the buffer instead.
+    positiveDurations = durations[durations > 0]
+    shortest = positiveDurations.min() if len(positiveDurations) else maxDuration
+    middle = int(maxDuration // shortest) + graph.nConnections() + 2
+    stations = np.full((count, 2 * middle + 2), -1, dtype=np.int64)
+    stations[:, middle] = head
+    stations[:, middle + 1] = tail
+
+    headIndex = np.full(count, middle)
+    tailIndex = np.full(count, middle + 1)
+
+    # the connection between the stations at index i and i + 1 of the station buffer
+    steps = np.full((count, 2 * middle + 1), -1, dtype=np.int64)
+    steps[:, middle] = connections[position]
+
+    covered = np.zeros((count, graph.nConnections()), dtype=bool)
+    covered[walks, connections[position]] = True
+
+    duration = durations[position].astype(np.float64)
+
+    # Routes fill up to tTarget or until they no longer have legal moves
+    active = np.flatnonzero(duration < tTarget)
+
+    while len(active):
+        budget = (tTarget[active] - duration[active])[:, None]
+
+        headMoves = (rowDurations[head[active]] < budget).sum(axis=1)
+        tailMoves = (rowDurations[tail[active]] < budget).sum(axis=1)
+
+        movable = (headMoves > 0) | (tailMoves > 0)
+        active, headMoves, tailMoves = active[movable], headMoves[movable], tailMoves[movable]
+
+        # an end with legal moves is chosen at random, then one of its legal moves
+        atHead = (headMoves > 0) & ((tailMoves == 0) | (rng.random(len(active)) < 0.5))
+
+        ends = np.where(atHead, head[active], tail[active])
+        moves = np.where(atHead, headMoves, tailMoves)
+
+        position = offsets[ends] + (rng.random(len(active)) * moves).astype(np.int64)
+        newStations = neighbours[position]
+
+        headWalks, tailWalks = active[atHead], active[~atHead]
+
+        headIndex[headWalks] -= 1
+        tailIndex[tailWalks] += 1
+
+        stations[headWalks, headIndex[headWalks]] = newStations[atHead]
+        stations[tailWalks, tailIndex[tailWalks]] = newStations[~atHead]
+
+        steps[headWalks, headIndex[headWalks]] = connections[position[atHead]]
+        steps[tailWalks, tailIndex[tailWalks] - 1] = connections[position[~atHead]]
+
+        head[headWalks] = newStations[atHead]
+        tail[tailWalks] = newStations[~atHead]
+
+        covered[active, connections[position]] = True
+        duration[active] += durations[position]
+
+        active = active[(duration[active] < tTarget[active]) & (headIndex[active] > 0) &
+                        (tailIndex[active] < 2 * middle + 1)]
+
+    routes = [graph.expand(row[start:end + 1], stepRow[start:end])[0] for row, stepRow, start, end
+              in zip(stations.tolist(), steps.tolist(), headIndex.tolist(), tailIndex.tolist())]
+
+    return routes, graph.expandCovered(covered), duration
 
 
 def randomSolution(
@@ -177,6 +423,8 @@ def randomSolution(
 ) -> RailNetwork:
     """
     Returns the best solution for a railNetwork after a given amount of iterations for optimization.
+    The routes of all iterations are generated at once by randomRouteBatch() and every iteration is
+    scored on arrays, so only the best solution is built as a network.
 
     Args:
         network (RailNetwork): Empty graph consisting of station and connection nodes.
@@ -186,28 +434,77 @@ def randomSolution(
     
     Returns (RailNetwork): A valid solution for network.
     """
-    bestNetwork = network
+    rng = np.random.default_rng(random.getrandbits(64))
 
-    minimumoutes = network.minimumRoutes(maxDuration)
+    nRoutes = rng.integers(network.minimumRoutes(maxDuration), maxRoutes + 1, randomIterations + 1)
+    starts = np.concatenate([[0], np.cumsum(nRoutes)[:-1]])
 
-    iteration = 0
-    highest = 0
+    stationIDs, covered, durations = randomRouteBatch(network, maxDuration, int(nRoutes.sum()), rng)
 
-    while iteration <= randomIterations:
-        workNetwork = deepcopy(network)
+    # the connections used by the routes of every iteration, scored like RailNetwork.score()
+    usedConnections = np.logical_or.reduceat(covered, starts, axis=0).sum(axis=1)
+    scores = usedConnections / network.nConnections() * 10000 - \
+        (nRoutes * 100 + np.add.reduceat(durations, starts))
 
-        randomAlgorithm(workNetwork, maxRoutes, maxDuration, minimumoutes)
+    best = int(np.argmax(scores))
 
-        newScore = workNetwork.score()
-        if highest < newScore:
-            highest = newScore
-            bestNetwork = workNetwork
+    if scores[best] <= 0:
+        return network
 
-        iteration += 1
+    bestNetwork = network.clone()
+
+    for route in stationIDs[starts[best]:starts[best] + nRoutes[best]]:
+        bestNetwork.addRoute([bestNetwork.getStationByID(stationID) for stationID in route])
 
     return bestNetwork
 
 
+def initialSolution(
+    network: RailNetwork,
+    maxRoutes: int,
+    maxDuration: float,
+    initialiser: str = "random",
+    randomIterations: int = 1000
+) -> RailNetwork:
+    """
+    Returns an initial solution for optimization algorithms.
+
+    There are currently two initialisers:
+        - "random": See randomSolution() for description
+        - "eulerian": See algorithms.eulerian.eulerianSolution() for description
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        initialiser (str): The name of the initialiser to be used.
+        randomIterations(int): The amount of iterations for the random initialiser.
+
+    Returns (RailNetwork): A valid solution for network.
+    """
+    if initialiser.lower() == "eulerian":
+        return eulerianSolution(network, maxRoutes, maxDuration)
+
+    return randomSolution(network, maxRoutes, maxDuration, randomIterations)
+
+
+def budgetDeadline(timeBudget: Optional[float]) -> float:
+    """
+    Returns the time at which an algorithm with a time budget has to stop and return its best
+    solution, comparable to time.monotonic().
+
+    Args:
+        timeBudget (Optional[float]): The amount of seconds the algorithm may run for, or None if it
+            has no time budget.
+
+    Returns (float): The deadline of the algorithm, or infinity if it has no time budget.
+    """
+    if timeBudget is None:
+        return float("inf")
+
+    return time.monotonic() + timeBudget
+
+
 def exportScores(scoreList: List[Dict[str, Union[int, float]]], targetFolder: str, runName: str, 
                 timestamp: str):
     """
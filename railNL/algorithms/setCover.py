@@ -0,0 +1,254 @@
+import random
+import datetime
+import time
+
+import numpy as np
+
+from classes.railNetwork import RailNetwork
+from classes.routePool import RoutePool, loadRoutePool
+
+from typing import List, Dict, Union, Tuple, Optional
+
+import algorithms.random as randomAlgorithm
+
+"""Module for a set cover solver over a pool of precomputed routes
+
+Selects up to maxRoutes routes from the route pool of a network (see classes.routePool) so that the
+score of the network is maximized. The score rewards every covered connection and punishes every
+route and minute, so this is a weighted maximum coverage problem. Solutions are built with a
+randomized greedy algorithm and improved with a local search that adds, removes and replaces routes
+until no single change improves the score. The best solution over all restarts is kept.
+"""
+
+
+# Score changes smaller than this are rounding errors
+EPSILON = 1e-9
+
+
+def main(
+    network: RailNetwork,
+    maxRoutes: int,
+    maxDuration: float,
+    targetFolder: str = "results",
+    runName: str = "solutionSetCover",
+    restarts: int = 20,
+    candidates: int = 3,
+    poolLimit: int = 50000,
+    cacheFolder: str = "cache",
+    timeBudget: Optional[float] = None
+) -> RailNetwork:
+    """
+    Set cover solver for the Train routing problem. Exports the best solution and a score summary
+    file with the score of every restart.
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        targetFolder (str): The folder where solutions should be saved to.
+        runName (str): Human readable part of the filename.
+        restarts (int): The amount of solutions to build and improve.
+        candidates (int): The greedy construction picks a random route from the candidates routes
+            with the highest score gain. 1 makes every restart identical.
+        poolLimit (int): The maximum amount of routes in the route pool, see loadRoutePool().
+        cacheFolder (str): The folder the route pool is cached in.
+        timeBudget (Optional[float]): The amount of seconds to restart for, regardless of restarts.
+            The first restart is always completed. Runs all restarts if None.
+
+    Returns (RailNetwork): The network with the best solution.
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm restarts until it expires
+    if timeBudget is not None:
+        restarts = float("inf") # type: ignore
+
+    pool = loadRoutePool(network, maxDuration, cacheFolder, poolLimit)
+    problem = CoverProblem(pool, network.nConnections())
+
+    scores: List[Dict[str, Union[int, float, str]]] = []
+
+    bestRoutes: List[int] = []
+    highestScore = -float("inf")
+    restart = 0
+
+    while restart < restarts and (not restart or time.monotonic() < deadline):
+        routes = problem.greedy(maxRoutes, candidates)
+        routes = problem.localSearch(routes, maxRoutes)
+
+        score = problem.score(routes)
+        scores.append({"iteration": restart, "score": score})
+
+        if score > highestScore + EPSILON:
+            print(f"new best found: {score}")
+
+            highestScore = score
+            bestRoutes = routes
+
+        restart += 1
+
+    bestNetwork = network.clone()
+
+    for index in bestRoutes:
+        bestNetwork.addRoute(pool.stations(index, bestNetwork))
+
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores.append({"iteration":"Best", "score":bestNetwork.score()})
+    scores.append({"iteration":"Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    print(f"Terminating with highest score {bestNetwork.score()}")
+
+    return bestNetwork
+
+
+class CoverProblem:
+    """Weighted maximum coverage problem over the routes in a route pool
+
+    A selection of routes is scored like a rail network: every connection covered by at least one
+    route is worth 10000 / nConnections points, and every route costs 100 points plus its duration.
+
+    Attributes:
+        _cover (np.ndarray): (routes, connections) matrix, 1 where a route covers a connection.
+        _costs (np.ndarray): The cost of every route, 100 plus its duration.
+        _weight (float): The points per covered connection.
+    """
+
+    def __init__(self, pool: RoutePool, nConnections: int):
+        """
+        Initializer function
+
+        Args:
+            pool (RoutePool): The routes to select from.
+            nConnections (int): The amount of connections in the network of the pool.
+        """
+        bits = np.unpackbits(pool.masks().view(np.uint8), axis=1, bitorder="little")
+
+        # float32, so gains are computed with a fast matrix vector product
+        self._cover = bits[:, :nConnections].astype(np.float32)
+        self._costs = 100 + pool.durations()
+        self._weight = 10000 / nConnections
+
+    def counts(self, routes: List[int]) -> np.ndarray:
+        """Returns the amount of routes in routes that cover every connection"""
+
+        return self._cover[routes].sum(axis=0)
+
+    def score(self, routes: List[int]) -> float:
+        """Returns the score of a selection of routes"""
+
+        covered = np.count_nonzero(self.counts(routes))
+
+        return covered * self._weight - float(self._costs[routes].sum())
+
+    def gains(self, counts: np.ndarray) -> np.ndarray:
+        """
+        Returns the score change of adding every route to a selection.
+
+        Args:
+            counts (np.ndarray): The amount of selected routes covering every connection.
+        """
+        uncovered = (counts == 0).astype(np.float32)
+
+        # the amounts of newly covered connections are exact, the points are computed in float64
+        return (self._cover @ uncovered).astype(np.float64) * self._weight - self._costs
+
+    def greedy(self, maxRoutes: int, candidates: int = 1) -> List[int]:
+        """
+        Returns a selection of routes built by repeatedly adding one of the routes with the highest
+        gain, until no route has a positive gain or maxRoutes routes are selected.
+
+        Args:
+            maxRoutes (int): The maximum amount of routes in the selection.
+            candidates (int): The amount of routes with the highest gains to choose from at random.
+        """
+        routes: List[int] = []
+        counts = np.zeros(self._cover.shape[1], dtype=np.float32)
+
+        while len(routes) < maxRoutes:
+            gains = self.gains(counts)
+
+            best = np.argpartition(-gains, min(candidates, len(gains)) - 1)[:candidates]
+            best = [int(index) for index in best if gains[index] > EPSILON]
+
+            if not best:
+                break
+
+            index = random.choice(best)
+
+            routes.append(index)
+            counts += self._cover[index]
+
+        return routes
+
+    def localSearch(self, routes: List[int], maxRoutes: int) -> List[int]:
+        """
+        Improves a selection of routes by adding, removing or replacing single routes until no such
+        change improves the score.
+
+        Args:
+            routes (List[int]): The selection of routes to improve.
+            maxRoutes (int): The maximum amount of routes in the selection.
+
+        Returns (List[int]): The improved selection.
+        """
+        routes = list(routes)
+        counts = self.counts(routes)
+
+        improved = True
+
+        while improved:
+            improved = False
+
+            if len(routes) < maxRoutes:
+                gains = self.gains(counts)
+                index = int(np.argmax(gains))
+
+                if gains[index] > EPSILON:
+                    routes.append(index)
+                    counts += self._cover[index]
+                    improved = True
+                    continue
+
+            for position, index in enumerate(routes):
+                change, newIndex = self._bestReplacement(counts, index)
+
+                if change > EPSILON:
+                    counts -= self._cover[index]
+
+                    if newIndex is None:
+                        routes.pop(position)
+                    else:
+                        routes[position] = newIndex
+                        counts += self._cover[newIndex]
+
+                    improved = True
+                    break
+
+        return routes
+
+    def _bestReplacement(self, counts: np.ndarray, index: int) -> Tuple[float, Optional[int]]:
+        """
+        Returns the best score change of removing the route on index from a selection or replacing
+        it by another route, and the index of the replacing route, None for removal.
+
+        Args:
+            counts (np.ndarray): The amount of selected routes covering every connection.
+            index (int): The index of the selected route.
+        """
+        without = counts - self._cover[index]
+
+        lost = np.count_nonzero((without == 0) & (self._cover[index] > 0))
+        removal = self._costs[index] - lost * self._weight
+
+        gains = self.gains(without)
+        newIndex = int(np.argmax(gains))
+
+        if removal >= removal + gains[newIndex]:
+            return float(removal), None
+
+        return float(removal + gains[newIndex]), newIndex
@@ -1,12 +1,17 @@
 import random
 import datetime
+import time
+import multiprocessing
 
-from copy import deepcopy
 from math import exp, log10
+from multiprocessing.pool import Pool
 
-from classes.railNetwork import RailNetwork
+from classes.railNetwork import RailNetwork, SCORE_EPSILON
+from classes.move import Move, AddRoute, RemoveRoute, ReplaceRoute
+from classes.routePool import loadRoutePool
+from classes.station import Station
 
-from typing import List, Dict, Union, Callable
+from typing import List, Dict, Union, Callable, Optional, Tuple
 
 
 import algorithms.random as randomAlgorithm
@@ -16,6 +21,9 @@ import algorithms.random as randomAlgorithm
 The algorithm can be ran via either runAnnealing to have acccess to the specified stepfunction and
 cooling scheme, or via routeHillclimber to run the algorithm as a pure hillclimber with the route 
 stepfunction.
+
+The module also contains a parallel tempering (replica exchange) mode, see parallelTempering(), and
+an island mode that runs several annealing climbers side by side, see islandAnnealing().
 """
 
 
@@ -24,25 +32,31 @@ def runAnnealing(
         network: RailNetwork, 
         stepFunction: str = "route", 
         coolingScheme: str = "hillclimber", 
+        islands: int = 1,
         **arguments
     ) -> RailNetwork:
     """
     Runs the annealing hillclimber with the selected stepfunction and cooling scheme.
 
-    There is currently one stepfunction in this module:
+    There are currently two stepfunctions in this module:
         - "route": See routeClimb() for description
+        - "pool": See poolClimb() for description
 
-    There are currently three cooling schemes in this module:
+    There are currently four cooling schemes in this module:
         - "hillclimber": See hillClimbCoolingScheme() for description
         - "logarithmic": See logarithmicCooling() for description
         - "geometric": See geometricCooling() for description
         - "linear": See linearCooling() for description
 
+    The cooling scheme "tempering" runs parallelTempering() instead of annealingClimber().
+
     Args:
         network (RailNetwork): The railnetwork for which an optimized solution has to be found.
         stepFunction (str): The name of the stepfunction in this module to be used.
         coolingScheme (str): The name of the cooling scheme in this module to be used.
-        **arguments: The keyword arguments for annealingClimber()
+        islands (int): The amount of annealing climbers. Runs islandAnnealing() if more than 1.
+        **arguments: The keyword arguments for annealingClimber(), parallelTempering() or
+            islandAnnealing()
     """
     COOLING_SCHEMES: Dict[str, Callable[[float, float, int, float], bool]] = \
     {
@@ -52,10 +66,25 @@ def runAnnealing(
         "linear": linearCooling,
     }
 
-    STEP_FUNCTIONS: Dict[str, Callable[[RailNetwork, int, float]]] = \
+    STEP_FUNCTIONS: Dict[str, Callable[[RailNetwork, int, float], Move]] = \
     {
-        "route": routeClimb
+        "route": routeClimb,
+        "pool": poolClimb,
     }
+
+    if coolingScheme.lower() == "tempering":
+        return parallelTempering(
+            network, stepFunction = STEP_FUNCTIONS[stepFunction.lower()], **arguments
+        )
+
+    if islands > 1:
+        return islandAnnealing(
+            network,
+            stepFunction = STEP_FUNCTIONS[stepFunction.lower()],
+            annealingFunction = COOLING_SCHEMES[coolingScheme.lower()],
+            islands = islands,
+            **arguments
+        )
     
     return annealingClimber(
         network, 
@@ -69,7 +98,7 @@ def annealingClimber(
         network: RailNetwork, 
         maxRoutes: int, 
         maxDuration: float,
-        stepFunction: Callable[[RailNetwork, int, float], None],
+        stepFunction: Callable[[RailNetwork, int, float], Move],
         annealingFunction: Callable[[float, float, int, float], bool],
         initialTemperature: float = 0,
         coolingConstant: float = 0,
@@ -77,8 +106,11 @@ def annealingClimber(
         runName: str = "soluionHill", 
         convergenceLimit: int = 5000,
         randomIterations: int = 1000, 
+        initialiser: str = "random",
         recordAll: bool = False,
-        exportImprovements: bool = False
+        exportImprovements: bool = False,
+        stopAtBound: bool = False,
+        timeBudget: Optional[float] = None
     ) -> RailNetwork:
     """
     Annealing hillclimber algorithm. Takes a stepfunction and an annealingFunction (analagous to
@@ -89,7 +121,7 @@ def annealingClimber(
         network (RailNetwork): The railnetwork for which an optimized solution has to be found.
         maxRoutes (int): The maximum amount of routes that can be used in the network
         maxDuration (float): The maximum duration of a single route.
-        stepFunction (Callable): The function that makes steps through the statespace.
+        stepFunction (Callable): The function that proposes steps through the statespace.
         annealingFunction (Callable): The function that determines whether a lower score is accepted
             as new state.
         initialTemperature (float): The initial temperature of the system. Is unused with
@@ -103,30 +135,46 @@ def annealingClimber(
             before terminating the algorithm.
         randomIterations (int): For how many iterations the random algorithm should be ran for the
             best initial solution.
+        initialiser (str): The initialiser of the initial solution, "random" or "eulerian". See
+            algorithms.random.initialSolution().
         recordAll (bool): Whether all scores should be recorded for the the score summary files or
             only the accepted states of the network.
         exportImprovements (bool): Whether to export every improvement
+        stopAtBound (bool): Whether to terminate as soon as the best score reaches the upper bound
+            of the network, see RailNetwork.upperBoundScore(), as it is then provably optimal.
+        timeBudget (Optional[float]): The amount of seconds to run for, regardless of
+            convergenceLimit. Runs until convergence if None.
     
     Returns (RailNetwork): The optimized network
     """
     START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
 
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm runs until it expires instead of until convergence
+    if timeBudget is not None:
+        convergenceLimit = float("inf") # type: ignore
+
+    upperBound = network.upperBoundScore(maxDuration, maxRoutes) if stopAtBound else float("inf")
+
     convergence = 0
     iteration = 0
 
     bestNetwork = network
     scores: List[Dict[str, Union[int, float]]] = []
     
-    if randomIterations:
-        print("generating random solution")
-        bestNetwork = randomAlgorithm.randomSolution(
+    if randomIterations or initialiser.lower() != "random":
+        print(f"generating {initialiser.lower()} solution")
+        bestNetwork = randomAlgorithm.initialSolution(
                 network,
                 maxRoutes,
                 maxDuration,
+                initialiser,
                 randomIterations
             )
 
-    currentNetwork = bestNetwork
+    # The current network is changed in place, so it must not share nodes with the best network
+    currentNetwork = bestNetwork.clone()
     highestScore = bestNetwork.score()
     currentScore = highestScore
 
@@ -134,34 +182,25 @@ def annealingClimber(
     
     iteration = 1
 
-    while convergence <= convergenceLimit:
+    while convergence <= convergenceLimit and highestScore < upperBound - SCORE_EPSILON \
+        and time.monotonic() < deadline:
         
         if not iteration % 1000:
             print(f"iteration: {iteration}")
 
-        workNetwork = deepcopy(currentNetwork)
-        stepFunction(workNetwork, maxRoutes, maxDuration)
-        newScore = workNetwork.score()
+        # Steps are scored before they are made, so rejected steps never change the network
+        move = stepFunction(currentNetwork, maxRoutes, maxDuration)
+        newScore = currentNetwork.score() + move.delta(currentNetwork)
         
-        # if score > highest, update the best score
-        if newScore > highestScore:
-            print(f"new best found: {newScore}")
-
-            highestScore = newScore
-            bestNetwork = workNetwork
-
-            workNetwork.exportSolution(targetFolder, f"{runName}-{iteration}") if exportImprovements\
-                else None
-        
-        # if score > currentScore, update the currentNetwork    
+        # if score > currentScore, keep the new state as currentNetwork
         if newScore > currentScore:
-            currentNetwork = workNetwork
+            move.apply(currentNetwork)
             currentScore = newScore
             convergence = 0
             
             scores.append({"iteration":iteration, "score":newScore})
         
-        # if score == currentScore or the annealingfunction returns true, update the currentNetwork
+        # if score == currentScore or the annealingfunction returns true, keep the new state
         elif newScore == currentScore \
             or annealingFunction(
                 (currentScore - newScore), 
@@ -169,12 +208,24 @@ def annealingClimber(
                 iteration,
                 coolingConstant,
             ):
-            currentNetwork = workNetwork
+            move.apply(currentNetwork)
             scores.append({"iteration":iteration, "score":newScore})
 
-        # If all scores are to be tracked, append iteration and score to scores
-        elif recordAll:
-            scores.append({"iteration":iteration, "score":newScore})
+        # otherwise, the previous state is kept
+        else:
+            # If all scores are to be tracked, append iteration and score to scores
+            if recordAll:
+                scores.append({"iteration":iteration, "score":newScore})
+
+        # if score > highest, update the best score. A new best is always accepted.
+        if newScore > highestScore:
+            print(f"new best found: {newScore}")
+
+            highestScore = newScore
+            bestNetwork = currentNetwork.clone()
+
+            bestNetwork.exportSolution(targetFolder, f"{runName}-{iteration}") if exportImprovements\
+                else None
 
         convergence += 1
         iteration += 1
@@ -193,39 +244,595 @@ def annealingClimber(
     return bestNetwork
 
 
+# Parallel tempering
+def parallelTempering(
+        network: RailNetwork,
+        maxRoutes: int,
+        maxDuration: float,
+        stepFunction: Callable[[RailNetwork, int, float], Move],
+        replicas: int = 4,
+        initialTemperature: float = 64,
+        coolingConstant: float = 0.5,
+        temperatures: Optional[List[float]] = None,
+        exchangeInterval: int = 200,
+        processes: Optional[int] = None,
+        targetFolder: str ="results", 
+        runName: str = "solutionTempering", 
+        convergenceLimit: int = 5000,
+        randomIterations: int = 1000, 
+        initialiser: str = "random",
+        recordAll: bool = False,
+        exportImprovements: bool = False,
+        stopAtBound: bool = False,
+        timeBudget: Optional[float] = None
+    ) -> RailNetwork:
+    """
+    Parallel tempering (replica exchange) algorithm. Runs a chain of the annealing climber for every
+    replica at a fixed temperature, each in its own worker process. After every exchangeInterval
+    iterations, the states of replicas with neighbouring temperatures are swapped with the
+    probability min(1, exp((hotScore - coldScore) * (1 / coldTemperature - 1 / hotTemperature))),
+    so good states move to the cold replicas while the hot replicas keep exploring. Exports a score
+    summary file, as well as the best solution produced.
+
+    Args:
+        network (RailNetwork): The railnetwork for which an optimized solution has to be found.
+        maxRoutes (int): The maximum amount of routes that can be used in the network
+        maxDuration (float): The maximum duration of a single route.
+        stepFunction (Callable): The function that proposes steps through the statespace.
+        replicas (int): The amount of chains. Ignored if temperatures are given.
+        initialTemperature (float): The temperature of the hottest replica.
+        coolingConstant (float): The ratio between the temperatures of neighbouring replicas. Must
+            be a floating point number between 0 and 1.
+        temperatures (Optional[List[float]]): The temperatures of all replicas. Overrides replicas,
+            initialTemperature and coolingConstant if given.
+        exchangeInterval (int): The amount of iterations every chain runs between swaps.
+        processes (Optional[int]): The amount of worker processes, one per replica if None. The
+            chains run in the current process if 1, or if the current process is a worker of a
+            batch itself.
+        targetFolder (str): The folder where all output files are to be saved to.
+        runName (str): The readable part of the filenames for the exported files and the score
+            summary file.
+        convergenceLimit (int): The maximum amount of iterations to run for without improvement
+            before terminating the algorithm.
+        randomIterations (int): For how many iterations the random algorithm should be ran for the
+            best initial solution.
+        initialiser (str): The initialiser of the initial solution, "random" or "eulerian". See
+            algorithms.random.initialSolution().
+        recordAll (bool): Whether the score of the coldest replica should be recorded after every
+            exchange for the score summary file, or only improvements of the best score.
+        exportImprovements (bool): Whether to export every improvement
+        stopAtBound (bool): Whether to terminate as soon as the best score reaches the upper bound
+            of the network after a round, see RailNetwork.upperBoundScore().
+        timeBudget (Optional[float]): The amount of seconds to run for, regardless of
+            convergenceLimit. Runs until convergence if None. Checked after every round.
+
+    Returns (RailNetwork): The optimized network
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm runs until it expires instead of until convergence
+    if timeBudget is not None:
+        convergenceLimit = float("inf") # type: ignore
+
+    upperBound = network.upperBoundScore(maxDuration, maxRoutes) if stopAtBound else float("inf")
+
+    if temperatures is None:
+        temperatures = [initialTemperature * coolingConstant ** replica
+                        for replica in range(replicas)]
+
+    # hottest replica first
+    temperatures = sorted(temperatures, reverse=True)
+    replicas = len(temperatures)
+
+    bestNetwork = network
+
+    if randomIterations or initialiser.lower() != "random":
+        print(f"generating {initialiser.lower()} solution")
+        bestNetwork = randomAlgorithm.initialSolution(
+                network,
+                maxRoutes,
+                maxDuration,
+                initialiser,
+                randomIterations
+            )
+
+    highestScore = bestNetwork.score()
+    bestRoutes = routeLists(bestNetwork)
+
+    states = [bestRoutes] * replicas
+    scores: List[Dict[str, Union[int, float]]] = [{"iteration":0, "score":highestScore}]
+
+    pool = _chainPool(network, replicas if processes is None else processes, replicas)
+
+    convergence = 0
+    iteration = 0
+    exchange = 0
+
+    try:
+        while convergence <= convergenceLimit and highestScore < upperBound - SCORE_EPSILON \
+            and time.monotonic() < deadline:
+            jobs = [
+                (states[replica], stepFunction, constantTemperature, temperatures[replica], 0, 0,
+                 exchangeInterval, maxRoutes, maxDuration, random.randrange(2**32))
+                for replica in range(replicas)
+            ]
+
+            results = _runChains(pool, jobs)
+
+            iteration += exchangeInterval
+            convergence += exchangeInterval
+
+            states = [state for state, _, _, _ in results]
+            stateScores = [score for _, score, _, _ in results]
+
+            for _, _, chainBest, chainHighest in results:
+                if chainHighest > highestScore:
+                    print(f"new best found: {chainHighest}")
+
+                    highestScore = chainHighest
+                    bestRoutes = chainBest
+                    convergence = 0
+
+                    scores.append({"iteration":iteration, "score":highestScore})
+
+                    if exportImprovements:
+                        buildNetwork(network, bestRoutes).exportSolution(
+                            targetFolder, f"{runName}-{iteration}"
+                        )
+
+            exchangeReplicas(states, stateScores, temperatures, exchange)
+            exchange += 1
+
+            if recordAll:
+                scores.append({"iteration":iteration, "score":stateScores[-1]})
+
+            if not exchange % 10:
+                print(f"iteration: {iteration}")
+
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    bestNetwork = buildNetwork(network, bestRoutes)
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores.append({"iteration":"Best", "score":highestScore})
+    scores.append({"iteration":"Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    print(f"Terminating with highest score {highestScore}")
+
+    return bestNetwork
+
+
+def exchangeReplicas(
+        states: List[List[List[int]]],
+        stateScores: List[float],
+        temperatures: List[float],
+        exchange: int
+    ) -> None:
+    """
+    Swaps the states of neighbouring replicas with the probability of parallel tempering, see
+    parallelTempering(). Even and odd neighbour pairs are swapped in turns.
+
+    Args:
+        states (List[List[List[int]]]): The state of every replica, see routeLists().
+        stateScores (List[float]): The score of every state.
+        temperatures (List[float]): The temperature of every replica, hottest first.
+        exchange (int): The number of the exchange, which decides the neighbour pairs.
+
+    Post: states and stateScores are swapped in place for every accepted swap.
+    """
+    for hot in range(exchange % 2, len(states) - 1, 2):
+        cold = hot + 1
+
+        exponent = (stateScores[hot] - stateScores[cold]) * \
+            (1 / temperatures[cold] - 1 / temperatures[hot])
+
+        if exponent >= 0 or random.random() <= exp(exponent):
+            states[hot], states[cold] = states[cold], states[hot]
+            stateScores[hot], stateScores[cold] = stateScores[cold], stateScores[hot]
+
+
+# Island model
+def islandAnnealing(
+        network: RailNetwork,
+        maxRoutes: int,
+        maxDuration: float,
+        stepFunction: Callable[[RailNetwork, int, float], Move],
+        annealingFunction: Callable[[float, float, int, float], bool],
+        islands: int = 4,
+        initialTemperature: float = 0,
+        coolingConstant: float = 0,
+        migrationInterval: int = 500,
+        stagnationLimit: int = 2500,
+        processes: Optional[int] = None,
+        targetFolder: str ="results", 
+        runName: str = "solutionIslands", 
+        convergenceLimit: int = 5000,
+        randomIterations: int = 1000, 
+        initialiser: str = "random",
+        recordAll: bool = False,
+        exportImprovements: bool = False,
+        stopAtBound: bool = False,
+        timeBudget: Optional[float] = None
+    ) -> RailNetwork:
+    """
+    Island model of the annealing hillclimber algorithm. Runs an annealing climber from its own
+    random solution on every island, each in its own worker process. After every migrationInterval
+    iterations, every island receives the best state of the previous island in a ring and continues
+    from it if it beats its own best state. Islands whose best state did not improve for
+    stagnationLimit iterations restart from the best state of all islands, with their cooling
+    scheme reset to the initial temperature. Exports a score summary file, as well as the best
+    solution produced.
+
+    Args:
+        network (RailNetwork): The railnetwork for which an optimized solution has to be found.
+        maxRoutes (int): The maximum amount of routes that can be used in the network
+        maxDuration (float): The maximum duration of a single route.
+        stepFunction (Callable): The function that proposes steps through the statespace.
+        annealingFunction (Callable): The function that determines whether a lower score is accepted
+            as new state.
+        islands (int): The amount of islands.
+        initialTemperature (float): The initial temperature of the system. Is unused with
+            logarithmic cooling.
+        coolingConstant (float): A constant parameter that is defined in the annealingFunction. See
+            logarithmicCooling(), geometricCooling() and linearCooling() for more information. 
+        migrationInterval (int): The amount of iterations every island runs between migrations.
+        stagnationLimit (int): The amount of iterations without improvement after which an island
+            restarts from the best state of all islands.
+        processes (Optional[int]): The amount of worker processes, one per island if None. The
+            islands run in the current process if 1, or if the current process is a worker of a
+            batch itself.
+        targetFolder (str): The folder where all output files are to be saved to.
+        runName (str): The readable part of the filenames for the exported files and the score
+            summary file.
+        convergenceLimit (int): The maximum amount of iterations to run for without improvement
+            of the best state of all islands before terminating the algorithm.
+        randomIterations (int): For how many iterations the random algorithm should be ran for the
+            initial solution of every island.
+        initialiser (str): The initialiser of the initial solution, "random" or "eulerian". See
+            algorithms.random.initialSolution().
+        recordAll (bool): Whether the best score of every island should be recorded after every
+            migration for the score summary file, or only improvements of the best score.
+        exportImprovements (bool): Whether to export every improvement
+        stopAtBound (bool): Whether to terminate as soon as the best score reaches the upper bound
+            of the network after a round, see RailNetwork.upperBoundScore().
+        timeBudget (Optional[float]): The amount of seconds to run for, regardless of
+            convergenceLimit. Runs until convergence if None. Checked after every round.
+
+    Returns (RailNetwork): The optimized network
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm runs until it expires instead of until convergence
+    if timeBudget is not None:
+        convergenceLimit = float("inf") # type: ignore
+
+    upperBound = network.upperBoundScore(maxDuration, maxRoutes) if stopAtBound else float("inf")
+
+    states = []
+
+    for island in range(islands):
+        islandNetwork = network
+
+        if randomIterations or initialiser.lower() != "random":
+            print(f"generating {initialiser.lower()} solution for island {island}")
+            islandNetwork = randomAlgorithm.initialSolution(
+                    network,
+                    maxRoutes,
+                    maxDuration,
+                    initialiser,
+                    randomIterations
+                )
+
+        states.append(routeLists(islandNetwork))
+
+    bestStates = list(states)
+    bestScores = [buildNetwork(network, state).score() for state in states]
+
+    highestScore = max(bestScores)
+    bestRoutes = bestStates[bestScores.index(highestScore)]
+
+    scores: List[Dict[str, Union[int, float]]] = [{"iteration":0, "score":highestScore}]
+
+    # the iteration of the cooling scheme of every island, and its iterations without improvement
+    islandIterations = [0] * islands
+    stagnation = [0] * islands
+
+    pool = _chainPool(network, islands if processes is None else processes, islands)
+
+    convergence = 0
+    iteration = 0
+
+    try:
+        while convergence <= convergenceLimit and highestScore < upperBound - SCORE_EPSILON \
+            and time.monotonic() < deadline:
+            jobs = [
+                (states[island], stepFunction, annealingFunction, initialTemperature,
+                 coolingConstant, islandIterations[island], migrationInterval, maxRoutes,
+                 maxDuration, random.randrange(2**32))
+                for island in range(islands)
+            ]
+
+            results = _runChains(pool, jobs)
+
+            iteration += migrationInterval
+            convergence += migrationInterval
+
+            for island, (state, _, chainBest, chainHighest) in enumerate(results):
+                states[island] = state
+                islandIterations[island] += migrationInterval
+                stagnation[island] += migrationInterval
+
+                if chainHighest > bestScores[island]:
+                    bestStates[island] = chainBest
+                    bestScores[island] = chainHighest
+                    stagnation[island] = 0
+
+                if chainHighest > highestScore:
+                    print(f"new best found: {chainHighest}")
+
+                    highestScore = chainHighest
+                    bestRoutes = chainBest
+                    convergence = 0
+
+                    scores.append({"iteration":iteration, "score":highestScore})
+
+                    if exportImprovements:
+                        buildNetwork(network, bestRoutes).exportSolution(
+                            targetFolder, f"{runName}-{iteration}"
+                        )
+
+            migrateIslands(states, bestStates, bestScores)
+
+            for island in range(islands):
+                if stagnation[island] >= stagnationLimit:
+                    states[island] = bestStates[island] = bestRoutes
+                    bestScores[island] = highestScore
+                    islandIterations[island] = 0
+                    stagnation[island] = 0
+
+            if recordAll:
+                scores += [{"iteration":iteration, "score":score} for score in bestScores]
+
+            if not iteration % 10000:
+                print(f"iteration: {iteration}")
+
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    bestNetwork = buildNetwork(network, bestRoutes)
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores.append({"iteration":"Best", "score":highestScore})
+    scores.append({"iteration":"Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    print(f"Terminating with highest score {highestScore}")
+
+    return bestNetwork
+
+
+def migrateIslands(
+        states: List[List[List[int]]],
+        bestStates: List[List[List[int]]],
+        bestScores: List[float]
+    ) -> None:
+    """
+    Sends the best state of every island to the next island in a ring, see islandAnnealing().
+
+    Args:
+        states (List[List[List[int]]]): The current state of every island, see routeLists().
+        bestStates (List[List[List[int]]]): The best state of every island.
+        bestScores (List[float]): The score of the best state of every island.
+
+    Post: Every island whose best score is beaten by the best score of the previous island
+        continues from a copy of that state, which is also its new best state.
+    """
+    migrants = [(bestStates[island - 1], bestScores[island - 1]) for island in range(len(states))]
+
+    for island, (migrant, migrantScore) in enumerate(migrants):
+        if migrantScore > bestScores[island]:
+            states[island] = bestStates[island] = migrant
+            bestScores[island] = migrantScore
+
+
+# Chains in worker processes
+def routeLists(network: RailNetwork) -> List[List[int]]:
+    """Returns the routes of a network as lists of station IDs, a compact copy of its state"""
+
+    return [[station.getID() for station in route.listStations()]
+            for route in network.listRoutes()]
+
+
+def buildNetwork(network: RailNetwork, routes: List[List[int]]) -> RailNetwork:
+    """
+    Returns a copy of network with routes added.
+
+    Args:
+        network (RailNetwork): The network to copy, usually without routes.
+        routes (List[List[int]]): The routes as lists of station IDs, see routeLists().
+    """
+    newNetwork = network.clone()
+
+    for route in routes:
+        newNetwork.addRoute([newNetwork.getStationByID(stationID) for stationID in route])
+
+    return newNetwork
+
+
+# The empty network chains are run on in a worker process, see _initChainWorker()
+_CHAIN_NETWORK: Optional[RailNetwork] = None
+
+
+def _initChainWorker(network: RailNetwork) -> None:
+    """Stores the empty network that chains are run on in the current process"""
+
+    global _CHAIN_NETWORK
+    _CHAIN_NETWORK = network
+
+
+def _chainPool(
+        network: RailNetwork, processes: int, chains: int
+    ) -> Optional[Pool]:
+    """
+    Returns a pool of worker processes to run chains on network with, or None if the chains are to
+    be ran in the current process. See _runChains().
+
+    Args:
+        network (RailNetwork): The network to run chains on, usually without routes.
+        processes (int): The requested amount of worker processes.
+        chains (int): The amount of chains that are ran at the same time.
+    """
+    # worker processes of a batch can not start processes of their own
+    if processes <= 1 or multiprocessing.current_process().daemon:
+        _initChainWorker(network.clone())
+        return None
+
+    return multiprocessing.Pool(
+        min(processes, chains), initializer=_initChainWorker, initargs=(network.clone(),)
+    )
+
+
+def _runChains(
+        pool: Optional[Pool], jobs: List[tuple]
+    ) -> List[Tuple[List[List[int]], float, List[List[int]], float]]:
+    """Runs _runChain() for the arguments of every job, in the worker processes of pool if given"""
+
+    if pool:
+        return pool.starmap(_runChain, jobs)
+
+    return [_runChain(*job) for job in jobs]
+
+
+def _runChain(
+        routes: List[List[int]],
+        stepFunction: Callable[[RailNetwork, int, float], Move],
+        annealingFunction: Callable[[float, float, int, float], bool],
+        initialTemperature: float,
+        coolingConstant: float,
+        startIteration: int,
+        iterations: int,
+        maxRoutes: int,
+        maxDuration: float,
+        seed: int
+    ) -> Tuple[List[List[int]], float, List[List[int]], float]:
+    """
+    Runs the annealing climber for a number of iterations. Can be ran in a worker process.
+
+    Args:
+        routes (List[List[int]]): The state to start from, see routeLists().
+        stepFunction (Callable): The function that proposes steps through the statespace.
+        annealingFunction (Callable): The function that determines whether a lower score is accepted
+            as new state.
+        initialTemperature (float): The initial temperature of the annealingFunction.
+        coolingConstant (float): The constant of the annealingFunction.
+        startIteration (int): The iteration of the annealingFunction to continue from.
+        iterations (int): The amount of steps to make.
+        maxRoutes (int): The maximum amount of routes that can be used in the network
+        maxDuration (float): The maximum duration of a single route.
+        seed (int): The seed for the random number generator of the chain.
+
+    Returns (Tuple): The final state and its score, and the best state of the chain and its score.
+    """
+    random.seed(seed)
+
+    network = buildNetwork(_CHAIN_NETWORK, routes) # type: ignore
+
+    currentScore = network.score()
+    highestScore = currentScore
+    bestRoutes = routes
+
+    for iteration in range(startIteration + 1, startIteration + iterations + 1):
+        move = stepFunction(network, maxRoutes, maxDuration)
+        delta = move.delta(network)
+
+        if delta >= 0 or annealingFunction(-delta, initialTemperature, iteration, coolingConstant):
+            move.apply(network)
+            currentScore = network.score()
+
+            if currentScore > highestScore:
+                highestScore = currentScore
+                bestRoutes = routeLists(network)
+
+    return routeLists(network), currentScore, bestRoutes, highestScore
+
+
 # Stepfunction
-def routeClimb(network: RailNetwork, maxRoutes: int, maxDuration: float) -> None:
+def routeClimb(network: RailNetwork, maxRoutes: int, maxDuration: float) -> Move:
     """
-    Either adds, removes or replaces a random route.
+    Proposes to either add, remove or replace a random route.
 
     Args:
         network (RailNetwork): The railnetwork to be changed
         maxRoutes (maxRoutes): The maximum amount of routes allowed in the network.
         maxDuration (maxDuration): The maximum duration of routes in the network.
     
-    post: The argument network will have a route replaced, added or removed.
+    Returns (Move): The proposed move, which is not yet applied to network.
+    """
+    return proposeRouteMove(
+        network, maxRoutes, lambda: randomAlgorithm.randomRouteStations(network, maxDuration)
+    )
+
+
+def poolClimb(network: RailNetwork, maxRoutes: int, maxDuration: float) -> Move:
+    """
+    Proposes to either add, remove or replace a random route like routeClimb(), but draws new
+    routes from the route pool of the network instead of generating them with a random walk. The
+    pool is built on first use and cached, see classes.routePool.
+
+    Args:
+        network (RailNetwork): The railnetwork to be changed
+        maxRoutes (maxRoutes): The maximum amount of routes allowed in the network.
+        maxDuration (maxDuration): The maximum duration of routes in the network.
+    
+    Returns (Move): The proposed move, which is not yet applied to network.
+    """
+    pool = loadRoutePool(network, maxDuration)
+
+    return proposeRouteMove(network, maxRoutes, lambda: pool.randomStations(network))
+
+
+def proposeRouteMove(
+    network: RailNetwork, maxRoutes: int, newRoute: Callable[[], List[Station]]
+) -> Move:
+    """
+    Proposes to remove a random route with a chance of 0.125, add a new route with a chance of
+    0.125 and replace a random route with a new route otherwise.
+
+    Args:
+        network (RailNetwork): The railnetwork to be changed
+        maxRoutes (maxRoutes): The maximum amount of routes allowed in the network.
+        newRoute (Callable[[], List[Station]]): Returns the stations of a new route.
+
+    Returns (Move): The proposed move, which is not yet applied to network.
     """
     randomNum = random.random()
 
     if randomNum <= 0.125 and network.nRoute() > 1:
-        removeRoute(network)
-        return
+        return RemoveRoute(randomRouteID(network))
     
     # add a random route if 0.125 < randomNum <=0.25 or if a route could not be removed
     if (randomNum <= 0.25 and network.nRoute() < maxRoutes) or network.nRoute() == 0:
-        randomAlgorithm.randomRoute(network, maxDuration)
-        return
+        return AddRoute(newRoute())
 
-    removeRoute(network)
-    randomAlgorithm.randomRoute(network, maxDuration)
-    
-    return
+    return ReplaceRoute(randomRouteID(network), newRoute())
 
 
-def removeRoute(network: RailNetwork) -> None:
-    """Removes a random route from the RailNetwork"""
-    randomRoute = random.choice(network.listRoutes())
-    network.delRoute(randomRoute.getID())
+def randomRouteID(network: RailNetwork) -> int:
+    """Returns the ID of a random route from the RailNetwork"""
+
+    return random.choice(network.listRoutes()).getID()
 
 
 # Cooling schemes
@@ -236,6 +843,19 @@ def hillClimbCoolingScheme(*_):
     return False
 
 
+def constantTemperature(scoreDiff: float, temperature: float, *_) -> bool:
+    """
+    Keeps the temperature constant, used for the replicas of parallelTempering().
+
+    Args:
+        scoreDiff (float): Difference in score between the old state and the new state.
+        temperature (float): The temperature of the system.
+
+    Returns (bool): True if the score difference is accepted, else False.
+    """
+    return annealingProbability(scoreDiff, temperature)
+
+
 def logarithmicCooling(scoreDiff:float, _: float, iteration: int, constant: float):
     """
     Decreases temperature logarithmically over iterations.
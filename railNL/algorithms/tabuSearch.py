@@ -0,0 +1,322 @@
+import random
+import datetime
+import time
+
+from classes.railNetwork import RailNetwork
+from classes.move import Move, AddRoute, RemoveRoute, ReplaceRoute, PushHead, PushTail, PopHead, \
+    PopTail
+from classes.station import Station
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import algorithms.random as randomAlgorithm
+from algorithms.simulatedAnnealing import proposeRouteMove
+
+"""Module for a Tabu Search Algorithm
+
+Every iteration, the algorithm samples a neighbourhood of moves around the current network and makes
+the best move that is not tabu, even if it lowers the score. Making a move makes its reverse tabu for
+a number of iterations, so the search can not fall straight back into the local optimum it just left.
+
+Moves are described by attributes on two levels:
+    - Route level: the routes a move adds and removes, identified by their stations regardless of
+        direction.
+    - Connection level: the connections a move adds to or removes from the end of a route.
+A tabu move is still made if it leads to a score higher than the best score found so far
+(aspiration). Attributes are stored as hashes with the iteration their tabu status ends, so looking
+up the tabu status of a move takes constant time.
+"""
+
+
+def main(
+    network: RailNetwork,
+    maxRoutes: int,
+    maxDuration: float,
+    targetFolder: str = "results",
+    runName: str = "solutionTabu",
+    tenure: int = 15,
+    neighbourhood: int = 30,
+    endMoveChance: float = 0.5,
+    convergenceLimit: int = 2000,
+    randomIterations: int = 1000,
+    initialiser: str = "random",
+    recordAll: bool = False,
+    exportImprovements: bool = False,
+    timeBudget: Optional[float] = None
+) -> RailNetwork:
+    """
+    Tabu search solver for the Train routing problem. Exports a score summary file, as well as the
+    best solution produced.
+
+    Args:
+        network (RailNetwork): Empty graph consisting of station and connection nodes.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        targetFolder (str): The folder where solutions should be saved to.
+        runName (str): Human readable part of the filename.
+        tenure (int): The amount of iterations the reverse of a move stays tabu.
+        neighbourhood (int): The amount of moves sampled every iteration.
+        endMoveChance (float): The chance that a sampled move extends or trims a route instead of
+            adding, removing or replacing one.
+        convergenceLimit (int): The maximum amount of iterations to run for without improvement
+            before terminating the algorithm.
+        randomIterations (int): For how many iterations the random algorithm should be ran for the
+            best initial solution.
+        initialiser (str): The initialiser of the initial solution, "random" or "eulerian". See
+            algorithms.random.initialSolution().
+        recordAll (bool): Whether the score of every iteration should be recorded for the score
+            summary file, or only improvements of the best score.
+        exportImprovements (bool): Whether to export every improvement
+        timeBudget (Optional[float]): The amount of seconds to run for, regardless of
+            convergenceLimit. Runs until convergence if None.
+
+    Returns (RailNetwork): The best network found.
+    """
+    START_TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    deadline = randomAlgorithm.budgetDeadline(timeBudget)
+
+    # with a time budget, the algorithm runs until it expires instead of until convergence
+    if timeBudget is not None:
+        convergenceLimit = float("inf") # type: ignore
+
+    print(f"generating {initialiser.lower()} solution")
+
+    # The current network is changed in place, so it must not share nodes with the best network
+    currentNetwork = randomAlgorithm.initialSolution(
+        network, maxRoutes, maxDuration, initialiser, randomIterations
+    ).clone()
+
+    bestNetwork = currentNetwork.clone()
+    highestScore = bestNetwork.score()
+
+    scores: List[Dict[str, Union[int, float, str]]] = [{"iteration": 0, "score": highestScore}]
+
+    tabuList = TabuList(tenure)
+
+    convergence = 0
+    iteration = 1
+
+    while convergence <= convergenceLimit and time.monotonic() < deadline:
+        if not iteration % 1000:
+            print(f"iteration: {iteration}")
+
+        currentScore = currentNetwork.score()
+
+        bestMove: Optional[Move] = None
+        bestDelta = -float("inf")
+        bestReverse: List[int] = []
+
+        for _ in range(neighbourhood):
+            move = proposeMove(currentNetwork, maxRoutes, maxDuration, endMoveChance)
+            delta = move.delta(currentNetwork)
+
+            if delta <= bestDelta:
+                continue
+
+            attributes, reverse = moveAttributes(currentNetwork, move)
+
+            # aspiration: tabu moves are allowed if they improve the best score
+            if tabuList.isTabu(attributes, iteration) and currentScore + delta <= highestScore:
+                continue
+
+            bestMove, bestDelta, bestReverse = move, delta, reverse
+
+        if bestMove is not None:
+            bestMove.apply(currentNetwork)
+            tabuList.add(bestReverse, iteration)
+
+        newScore = currentNetwork.score()
+
+        if newScore > highestScore:
+            print(f"new best found: {newScore}")
+
+            highestScore = newScore
+            bestNetwork = currentNetwork.clone()
+            convergence = 0
+
+            scores.append({"iteration": iteration, "score": newScore})
+
+            if exportImprovements:
+                bestNetwork.exportSolution(targetFolder, f"{runName}-{iteration}")
+
+        elif recordAll:
+            scores.append({"iteration": iteration, "score": newScore})
+
+        convergence += 1
+        iteration += 1
+
+    bestNetwork.exportSolution(targetFolder, runName + "_best", START_TIMESTAMP)
+
+    scores.append({"iteration": "Best", "score": highestScore})
+    scores.append({"iteration": "Theoretical max", "score": network.theoreticalMaxScore(maxDuration)})
+
+    randomAlgorithm.exportScores(scores, targetFolder, runName, START_TIMESTAMP)
+
+    print(f"Terminating with highest score {highestScore}")
+
+    return bestNetwork
+
+
+class TabuList:
+    """Tabu status of hashed move attributes
+
+    Attributes:
+        _tenure (int): The amount of iterations an attribute stays tabu.
+        _expiry (Dict[int, int]): The last iteration every tabu attribute is tabu, keyed by hash.
+    """
+
+    __slots__ = ("_tenure", "_expiry")
+
+    def __init__(self, tenure: int):
+        """
+        Initializer function
+
+        Args:
+            tenure (int): The amount of iterations an attribute stays tabu.
+        """
+        self._tenure = tenure
+        self._expiry: Dict[int, int] = dict()
+
+    def __len__(self) -> int:
+        """Length magic method, returns the amount of stored attributes including expired ones"""
+
+        return len(self._expiry)
+
+    def isTabu(self, attributes: List[int], iteration: int) -> bool:
+        """Returns True if any of attributes is tabu in iteration"""
+
+        return any(self._expiry.get(attribute, -1) >= iteration for attribute in attributes)
+
+    def add(self, attributes: List[int], iteration: int) -> None:
+        """
+        Makes attributes tabu for the next tenure iterations after iteration.
+
+        Post: Expired attributes are removed once the list holds more than 100 attributes per
+            iteration of tenure.
+        """
+        for attribute in attributes:
+            self._expiry[attribute] = iteration + self._tenure
+
+        if len(self._expiry) > 100 * max(1, self._tenure):
+            self._expiry = {attribute: expiry for attribute, expiry in self._expiry.items()
+                            if expiry > iteration}
+
+
+def proposeMove(
+    network: RailNetwork, maxRoutes: int, maxDuration: float, endMoveChance: float
+) -> Move:
+    """
+    Proposes a move on network: extending or trimming a random route with a chance of
+    endMoveChance, otherwise adding, removing or replacing a route like the route stepfunction of
+    simulated annealing.
+
+    Args:
+        network (RailNetwork): The network to propose a move for.
+        maxRoutes (int): The maximum amount of train routes that can be utilized.
+        maxDuration (float): The maximum duration a single route may have.
+        endMoveChance (float): The chance of extending or trimming a route.
+
+    Returns (Move): The proposed move, which is not yet applied to network.
+    """
+    if network.nRoute() and random.random() < endMoveChance:
+        move = proposeEndMove(network, maxDuration)
+
+        if move is not None:
+            return move
+
+    return proposeRouteMove(
+        network, maxRoutes, lambda: randomAlgorithm.randomRouteStations(network, maxDuration)
+    )
+
+
+def proposeEndMove(network: RailNetwork, maxDuration: float) -> Optional[Move]:
+    """
+    Proposes to extend a random end of a random route with a random legal station or to trim it
+    with equal chance. Routes are never trimmed below one connection. Returns None if the end of
+    the route can neither be extended nor trimmed.
+    """
+    route = random.choice(network.listRoutes())
+    head = random.random() < 0.5
+
+    trimmable = route.nStations() > 2
+
+    if trimmable and random.random() < 0.5:
+        return PopHead(route.getID()) if head else PopTail(route.getID())
+
+    graph = network.compactGraph()
+    neighbours, _, _ = graph.neighbourArrays()
+
+    endStation = route.getStation(0 if head else -1)
+    start, end = graph.legalNeighbourRange(endStation.getID(), maxDuration - route.duration())
+
+    if start < end:
+        station = network.getStationByID(int(neighbours[random.randrange(start, end)]))
+
+        return PushHead(route.getID(), station) if head else PushTail(route.getID(), station)
+
+    if trimmable:
+        return PopHead(route.getID()) if head else PopTail(route.getID())
+
+    return None
+
+
+def moveAttributes(network: RailNetwork, move: Move) -> Tuple[List[int], List[int]]:
+    """
+    Returns the hashed attributes of a move, and the attributes of its reverse that become tabu once
+    the move is made. Must be called before the move is applied.
+
+    Args:
+        network (RailNetwork): The network the move is proposed for.
+        move (Move): The proposed move.
+
+    Returns (Tuple[List[int], List[int]]): The attributes of the move and of its reverse.
+    """
+    if isinstance(move, AddRoute):
+        key = routeKey(move.stations())
+
+        return [hash(("add", key))], [hash(("remove", key))]
+
+    if isinstance(move, RemoveRoute):
+        key = routeKey(network.getRoute(move.routeID()).listStations())
+
+        return [hash(("remove", key))], [hash(("add", key))]
+
+    if isinstance(move, ReplaceRoute):
+        oldKey = routeKey(network.getRoute(move.routeID()).listStations())
+        newKey = routeKey(move.stations())
+
+        return [hash(("remove", oldKey)), hash(("add", newKey))], \
+            [hash(("add", oldKey)), hash(("remove", newKey))]
+
+    if isinstance(move, PushHead):
+        route = network.getRoute(move.routeID())
+        key = connectionKey(route.getStation(0 if move.head else -1), move.station())
+
+        return [hash(("push", move.routeID(), key))], [hash(("pop", move.routeID(), key))]
+
+    if isinstance(move, PopHead):
+        route = network.getRoute(move.routeID())
+
+        if move.head:
+            key = connectionKey(route.getStation(0), route.getStation(1))
+        else:
+            key = connectionKey(route.getStation(-1), route.getStation(-2))
+
+        return [hash(("pop", move.routeID(), key))], [hash(("push", move.routeID(), key))]
+
+    return [], []
+
+
+def routeKey(stations: List[Station]) -> Tuple[int, ...]:
+    """Returns the station IDs of a route, equal for a route and its reverse"""
+
+    stationIDs = tuple(station.getID() for station in stations)
+
+    return min(stationIDs, stationIDs[::-1])
+
+
+def connectionKey(station1: Station, station2: Station) -> Tuple[int, int]:
+    """Returns the IDs of the stations of a connection, equal for both directions"""
+
+    return min(station1.getID(), station2.getID()), max(station1.getID(), station2.getID())
@@ -0,0 +1,176 @@
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from classes.station import Station
+    from classes.connection import Connection
+
+
+class CompactGraph:
+    """Array representation of the static station graph of a rail network
+
+    Stations are identified by their integer ID and the neighbours of every station are stored in
+    compressed sparse row (CSR) format: the neighbours of the station with ID i are found at
+    positions offsets[i] up to offsets[i + 1] of the neighbour arrays. Within a row, neighbours are
+    sorted by the duration of their connection, so the neighbours that can be reached within a time
+    budget always form the start of the row.
+
+    The graph never changes after it is built and can therefore be shared by all copies of a
+    network.
+
+    Attributes:
+        _stationNames (List[str]): The names of the stations indexed by station ID.
+        _offsets (np.ndarray): The start of the row of every station in the neighbour arrays, with
+            the total amount of neighbour entries appended.
+        _neighbours (np.ndarray): The station IDs of the neighbours of every station.
+        _neighbourConnections (np.ndarray): The connection IDs to the neighbours of every station.
+        _neighbourDurations (np.ndarray): The durations of the connections to the neighbours.
+        _durations (np.ndarray): The duration of every connection indexed by connection ID.
+        _endpoints (np.ndarray): The station IDs of both ends of every connection as an (n, 2)
+            array indexed by connection ID.
+        _minimumDurations (List[float]): The shortest connection duration of every station.
+    """
+
+    def __init__(self, stations: List["Station"], connections: List["Connection"]):
+        """
+        Initializer function
+
+        Args:
+            stations (List[Station]): The station nodes of the network indexed by their ID.
+            connections (List[Connection]): The connection nodes of the network indexed by their ID.
+        """
+        self._stationNames = [station.name() for station in stations]
+
+        stationIDs = {station.name(): station.getID() for station in stations}
+
+        self._durations = np.array([connection.duration() for connection in connections],
+                                   dtype=np.float64)
+        self._endpoints = np.array(
+            [[stationIDs[name] for name in connection.getStationNames()]
+             for connection in connections],
+            dtype=np.int64
+        ).reshape(-1, 2)
+
+        self._buildRows(len(stations))
+
+    def _buildRows(self, nStations: int) -> None:
+        """
+        Builds the neighbour arrays from the endpoints and durations of the connections.
+
+        Args:
+            nStations (int): The amount of stations in the graph.
+        """
+        # every connection is an entry in the rows of both of its stations
+        sources = np.concatenate([self._endpoints[:, 0], self._endpoints[:, 1]])
+        targets = np.concatenate([self._endpoints[:, 1], self._endpoints[:, 0]])
+        connectionIDs = np.concatenate([np.arange(len(self._durations))] * 2)
+
+        # sort entries by station first and duration second. Connections of equal duration keep the
+        # order of the data file.
+        order = np.lexsort((connectionIDs, self._durations[connectionIDs], sources))
+
+        self._neighbours = targets[order]
+        self._neighbourConnections = connectionIDs[order]
+        self._neighbourDurations = self._durations[self._neighbourConnections]
+
+        self._offsets = np.zeros(nStations + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=nStations), out=self._offsets[1:])
+
+        # the first entry of a row is its shortest connection
+        self._minimumDurations = [
+            float(self._neighbourDurations[start]) if start < end else float("inf")
+            for start, end in zip(self._offsets[:-1], self._offsets[1:])
+        ]
+
+    def nStations(self) -> int:
+        """Returns the amount of stations in the graph"""
+
+        return len(self._stationNames)
+
+    def nConnections(self) -> int:
+        """Returns the amount of connections in the graph"""
+
+        return len(self._durations)
+
+    def stationName(self, stationID: int) -> str:
+        """Returns the name of the station with stationID"""
+
+        return self._stationNames[stationID]
+
+    def degree(self, stationID: int) -> int:
+        """Returns the amount of connections of the station with stationID"""
+
+        return int(self._offsets[stationID + 1] - self._offsets[stationID])
+
+    def neighbours(self, stationID: int) -> np.ndarray:
+        """Returns the station IDs of all neighbours of a station, sorted by connection duration"""
+
+        return self._neighbours[self._offsets[stationID]:self._offsets[stationID + 1]]
+
+    def neighbourConnections(self, stationID: int) -> np.ndarray:
+        """Returns the connection IDs to all neighbours of a station, sorted by duration"""
+
+        return self._neighbourConnections[self._offsets[stationID]:self._offsets[stationID + 1]]
+
+    def neighbourDurations(self, stationID: int) -> np.ndarray:
+        """Returns the sorted durations of the connections to all neighbours of a station"""
+
+        return self._neighbourDurations[self._offsets[stationID]:self._offsets[stationID + 1]]
+
+    def legalNeighbourRange(self, stationID: int, budget: float) -> Tuple[int, int]:
+        """
+        Returns the range of positions in the neighbour arrays of the neighbours that can be reached
+        from a station in less than budget.
+
+        Args:
+            stationID (int): The ID of the station.
+            budget (float): The time left for the connection. Connections must take less.
+
+        Returns (Tuple[int, int]): The start and end of the range, the end being exclusive.
+        """
+        start = int(self._offsets[stationID])
+        end = int(self._offsets[stationID + 1])
+
+        return start, start + int(self._neighbourDurations[start:end].searchsorted(budget))
+
+    def minimumDuration(self, stationID: int) -> float:
+        """Returns the shortest duration of all connections of a station, inf if it has none"""
+
+        return self._minimumDurations[stationID]
+
+    def offsets(self) -> np.ndarray:
+        """Returns the row offsets of all stations in the neighbour arrays"""
+
+        return self._offsets
+
+    def neighbourArrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the complete neighbour arrays: the station IDs, connection IDs and durations of the
+        neighbours of all stations.
+        """
+        return self._neighbours, self._neighbourConnections, self._neighbourDurations
+
+    def durations(self) -> np.ndarray:
+        """Returns the durations of all connections indexed by connection ID"""
+
+        return self._durations
+
+    def endpoints(self) -> np.ndarray:
+        """Returns the station IDs of both ends of all connections indexed by connection ID"""
+
+        return self._endpoints
+
+    def expand(self, stationIDs: List[int], connectionIDs: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Returns the station IDs and connection IDs of a walk through the graph as stations and
+        connections of the network. Those are the same for this graph, see ContractedGraph.
+        """
+        return stationIDs, connectionIDs
+
+    def expandCovered(self, covered: np.ndarray) -> np.ndarray:
+        """
+        Returns a (walks, connections) boolean array of the connections of the graph used by walks
+        as connections of the network. Those are the same for this graph, see ContractedGraph.
+        """
+        return covered
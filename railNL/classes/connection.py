@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Tuple, Set, List
+from typing import TYPE_CHECKING, Tuple, FrozenSet, List
+
+from classes.station import NO_ROUTES
 
 if TYPE_CHECKING:
     from classes.station import Station
@@ -11,20 +13,43 @@ class Connection:
 
     Attributes:
         _id (int): inique identifier.
-        _connectedStations (Dict[str, Station]): A dictionary containing the two stations connected
-            by this connection node, keyed by their name.
+        _connectedStations (Tuple[Station, Station]): The two stations connected by this
+            connection node.
         _duration (float): The duration of the connection associated with the node.
-        _routes (Set[int]): Set of route unique identifiers for all routes registered to the
-            connection.
+        _routes (FrozenSet[int]): Immutable set of route unique identifiers for all routes
+            registered to the connection.
     """
 
+    __slots__ = ("_id", "_connectedStations", "_duration", "_routes")
+
     def __init__(self, uid: int, stationA: "Station", stationB: "Station", duration: float):
         """Initializer function"""
 
         self._id = uid
-        self._connectedStations = {stationA.name(): stationA, stationB.name(): stationB}
+        self._connectedStations = (stationA, stationB)
         self._duration = float(duration)
-        self._routes: Set[int] = set()
+        self._routes: FrozenSet[int] = NO_ROUTES
+
+    def clone(self, stationA: "Station", stationB: "Station") -> "Connection":
+        """
+        Returns a copy of the connection linked to the copies of its stations and adds it to them.
+        The ID, duration and registered routes are shared.
+
+        Args:
+            stationA (Station): The copy of the first connected station.
+            stationB (Station): The copy of the second connected station.
+        """
+        connection = Connection.__new__(Connection)
+
+        connection._id = self._id
+        connection._connectedStations = (stationA, stationB)
+        connection._duration = self._duration
+        connection._routes = self._routes
+
+        stationA.addConnection(stationB.name(), connection)
+        stationB.addConnection(stationA.name(), connection)
+
+        return connection
 
     def __lt__(self, other: "Connection"):
         """Less than magic method"""
@@ -41,6 +66,15 @@ class Connection:
 
         return self._duration
 
+    def inRoute(self, routeID: int) -> bool:
+        """
+        Returns True if the connection is in route routeID, else False
+
+        Args:
+            routeID (int): The route ID of the route to be checked.
+        """
+        return routeID in self._routes
+
     def addRoute(self, routeID: int) -> None:
         """
         Adds a registers a route to the connection.
@@ -50,7 +84,11 @@ class Connection:
 
         Post: routeID is added to self._routes.
         """
-        self._routes.add(routeID)
+        if not self._routes:
+            for station in self._connectedStations:
+                station.updateUnusedConnections(-1)
+
+        self._routes = self._routes | {routeID}
 
     def removeRoute(self, routeID: int) -> None:
         """
@@ -63,13 +101,22 @@ class Connection:
         """
 
         if routeID in self._routes:
-            self._routes.remove(routeID)
+            self._routes = self._routes - {routeID} or NO_ROUTES
+
+            if not self._routes:
+                for station in self._connectedStations:
+                    station.updateUnusedConnections(1)
 
     def isConnected(self) -> bool:
         """Returns True if any route is registered to the connection, else False"""
 
         return bool(self._routes)
 
+    def routeAmount(self) -> int:
+        """Returns the amount of routes registered to the connection"""
+
+        return len(self._routes)
+
     def getConnectedStation(self, stationName: str) -> "Station":
         """
         Returns the Station with name with name stationName.
@@ -77,7 +124,11 @@ class Connection:
         Args:
             Station(str): the name of the station
         """
-        return self._connectedStations[stationName]
+        for station in self._connectedStations:
+            if station.name() == stationName:
+                return station
+
+        raise KeyError(stationName)
 
     def stationConnectionAmount(self, stationName: str) -> int:
         """
@@ -86,15 +137,19 @@ class Connection:
         Args:
             Station(str): the name of the station to get connection amounts from.
         """
-        return self._connectedStations[stationName].connectionAmount()
+        return self.getConnectedStation(stationName).connectionAmount()
 
     def connectionPoints(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
         """Returns the positions of both connected stations for visualization"""
 
-        return (list(self._connectedStations.items())[0][1].position(),
-                list(self._connectedStations.items())[1][1].position())
+        return (self._connectedStations[0].position(), self._connectedStations[1].position())
+
+    def getStations(self) -> Tuple["Station", "Station"]:
+        """Returns both connected station nodes"""
+
+        return self._connectedStations
 
     def getStationNames(self) -> List[str]:
         """Returns a list of the names of the connected stations"""
 
-        return list(self._connectedStations.keys())
+        return [station.name() for station in self._connectedStations]
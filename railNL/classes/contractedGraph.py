@@ -0,0 +1,145 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from classes.compactGraph import CompactGraph
+
+"""Module for the contracted station graph of a rail network
+
+A station with exactly two connections offers no choice: a route that enters it either ends there or
+leaves through the other connection. A chain of such stations between two junctions, stations with
+any other amount of connections, is therefore contracted into a single super-connection. Random
+walks on the contracted graph only choose at junctions, which makes them cheaper, and drive whole
+chains. Walks are expanded into the stations and connections of the network before they become
+routes, so routes and exported solutions never contain super-connections.
+"""
+
+
+class ContractedGraph(CompactGraph):
+    """Array representation of the station graph with chains contracted into super-connections
+
+    Station IDs are those of the network. Stations inside a chain have no neighbours of their own, so
+    walks can only start and end at junctions. A cycle of stations that all have two connections is
+    contracted into a super-connection from one of its stations back to itself.
+
+    Connection IDs in the neighbour arrays, durations() and endpoints() are those of the
+    super-connections. expand() and expandCovered() translate them back to the network.
+
+    Attributes:
+        _chainStations (List[List[int]]): The station IDs along every super-connection, from its
+            first endpoint to its second.
+        _chainConnections (List[List[int]]): The connection IDs along every super-connection, in the
+            same order.
+        _superConnections (np.ndarray): The super-connection of every connection of the network,
+            indexed by connection ID.
+    """
+
+    def __init__(self, graph: CompactGraph):
+        """
+        Initializer function
+
+        Args:
+            graph (CompactGraph): The uncontracted graph of the network.
+        """
+        self._stationNames = [graph.stationName(stationID) for stationID in range(graph.nStations())]
+
+        degrees = np.diff(graph.offsets())
+        used = np.zeros(graph.nConnections(), dtype=bool)
+
+        self._chainStations: List[List[int]] = []
+        self._chainConnections: List[List[int]] = []
+
+        junctions = [stationID for stationID in range(graph.nStations()) if degrees[stationID] != 2]
+
+        for junction in junctions:
+            self._contractFrom(graph, junction, degrees, used)
+
+        # the connections left form cycles without junctions, which start at any of their stations
+        for connectionID in np.flatnonzero(~used).tolist():
+            if not used[connectionID]:
+                self._contractFrom(graph, int(graph.endpoints()[connectionID][0]), degrees, used)
+
+        self._durations = np.array(
+            [graph.durations()[connectionIDs].sum() for connectionIDs in self._chainConnections],
+            dtype=np.float64
+        )
+        self._endpoints = np.array(
+            [[stationIDs[0], stationIDs[-1]] for stationIDs in self._chainStations], dtype=np.int64
+        ).reshape(-1, 2)
+
+        self._superConnections = np.zeros(graph.nConnections(), dtype=np.int64)
+
+        for superID, connectionIDs in enumerate(self._chainConnections):
+            self._superConnections[connectionIDs] = superID
+
+        self._buildRows(graph.nStations())
+
+    def _contractFrom(
+        self, graph: CompactGraph, start: int, degrees: np.ndarray, used: np.ndarray
+    ) -> None:
+        """
+        Contracts every chain that leaves station start through an unused connection, following
+        stations with two connections until the chain reaches a junction or returns to start.
+
+        Post: The connections of the chains are marked in used.
+        """
+        for neighbour, connectionID in zip(graph.neighbours(start).tolist(),
+                                           graph.neighbourConnections(start).tolist()):
+            if used[connectionID]:
+                continue
+
+            stationIDs = [start, neighbour]
+            connectionIDs = [connectionID]
+            used[connectionID] = True
+
+            while degrees[stationIDs[-1]] == 2 and stationIDs[-1] != start:
+                # the connection of the station that the chain did not arrive through
+                for nextStation, nextConnection in zip(
+                    graph.neighbours(stationIDs[-1]).tolist(),
+                    graph.neighbourConnections(stationIDs[-1]).tolist()
+                ):
+                    if nextConnection != connectionIDs[-1]:
+                        break
+
+                stationIDs.append(nextStation)
+                connectionIDs.append(nextConnection)
+                used[nextConnection] = True
+
+            self._chainStations.append(stationIDs)
+            self._chainConnections.append(connectionIDs)
+
+    def expand(self, stationIDs: List[int], connectionIDs: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Returns the station IDs and connection IDs of a walk through the contracted graph as
+        stations and connections of the network.
+
+        Args:
+            stationIDs (List[int]): The stations of the walk, all junctions.
+            connectionIDs (List[int]): The super-connections between consecutive stations.
+
+        Returns (Tuple[List[int], List[int]]): The stations and connections of the network along
+            the walk.
+        """
+        networkStations = stationIDs[:1]
+        networkConnections: List[int] = []
+
+        for stationID, superID in zip(stationIDs, connectionIDs):
+            chainStations = self._chainStations[superID]
+            chainConnections = self._chainConnections[superID]
+
+            # chains are stored in one direction, and are driven backwards from their second end
+            if chainStations[0] != stationID:
+                chainStations = chainStations[::-1]
+                chainConnections = chainConnections[::-1]
+
+            networkStations += chainStations[1:]
+            networkConnections += chainConnections
+
+        return networkStations, networkConnections
+
+    def expandCovered(self, covered: np.ndarray) -> np.ndarray:
+        """
+        Returns a (walks, connections) boolean array of the connections of the network used by walks,
+        given a (walks, super-connections) array of the super-connections they use.
+        """
+        return covered[:, self._superConnections]
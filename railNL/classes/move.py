@@ -0,0 +1,394 @@
+from abc import ABC, abstractmethod
+
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from classes.railNetwork import RailNetwork
+    from classes.route import Route
+    from classes.station import Station
+
+
+class Move(ABC):
+    """Base class for a single change to the routes of a rail network
+
+    A move can score itself on a network without changing it with delta(), be made with apply() and
+    be taken back with undo(). Moves refer to routes by their ID, so moves that are undone in
+    reverse order of applying always restore the routes of the network to their original state.
+    Route IDs are never reused, even if the route that was given an ID is removed by an undo.
+    Subclasses must implement apply(), undo() and delta().
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Makes the move on network.
+
+        Post: The routes of network are changed by the move.
+        """
+
+    @abstractmethod
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Takes back the move on network. Moves that were applied after this move must be undone
+        first.
+
+        Post: The routes of network are restored to the state before apply().
+        """
+
+    @abstractmethod
+    def delta(self, network: "RailNetwork") -> float:
+        """Returns the change in score of network if the move would be made"""
+
+
+class AddRoute(Move):
+    """Adds a route visiting stations in order
+
+    Attributes:
+        _stations (List[Station]): The stations of the new route in order of travel.
+        _routeID (Optional[int]): The ID of the new route once the move has been applied.
+    """
+
+    __slots__ = ("_stations", "_routeID")
+
+    def __init__(self, stations: List["Station"]):
+        """
+        Initializer function
+
+        Args:
+            stations (List[Station]): The stations of the new route in order of travel.
+        """
+        self._stations = stations
+        self._routeID: Optional[int] = None
+
+    def __repr__(self) -> str:
+        """Representation magic method"""
+
+        return f"AddRoute({[station.name() for station in self._stations]})"
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Adds the new route to network and remembers its ID.
+
+        Post: network has a new route visiting the stations in order.
+        """
+        self._routeID = network.addRoute(self._stations).getID()
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Removes the route added by apply() from network.
+
+        Post: network no longer has the new route. Its ID is not reused.
+        """
+        network.delRoute(self._routeID) # type: ignore
+
+    def delta(self, network: "RailNetwork") -> float:
+        """Returns the change in score of network if the new route would be added"""
+
+        return network.deltaAddRoute(self._stations)
+
+    def stations(self) -> List["Station"]:
+        """Returns the stations of the new route"""
+
+        return self._stations
+
+    def routeID(self) -> Optional[int]:
+        """Returns the ID of the new route, None if the move has not been applied"""
+
+        return self._routeID
+
+
+class RemoveRoute(Move):
+    """Removes the route with routeID
+
+    Attributes:
+        _routeID (int): The ID of the route to be removed.
+        _route (Optional[Route]): The removed route once the move has been applied.
+        _stations (List[Station]): The stations of the removed route.
+        _position (int): The position of the removed route in the order of routes.
+    """
+
+    __slots__ = ("_routeID", "_route", "_stations", "_position")
+
+    def __init__(self, routeID: int):
+        """
+        Initializer function
+
+        Args:
+            routeID (int): The unique identifier of the route to be removed.
+        """
+        self._routeID = routeID
+        self._route: Optional["Route"] = None
+        self._stations: List["Station"] = []
+        self._position = 0
+
+    def __repr__(self) -> str:
+        """Representation magic method"""
+
+        return f"RemoveRoute({self._routeID})"
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Removes the route from network and remembers its stations and position.
+
+        Post: network no longer has the route with routeID.
+        """
+        self._route = network.getRoute(self._routeID)
+        self._stations = self._route.listStations()
+        self._position = [route.getID() for route in network.listRoutes()].index(self._routeID)
+
+        network.delRoute(self._routeID)
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Restores the route removed by apply() to network.
+
+        Post: The route is back in its original position with its original ID and stations.
+        """
+        network.restoreRoute(self._route, self._stations, self._position) # type: ignore
+
+    def delta(self, network: "RailNetwork") -> float:
+        """Returns the change in score of network if the route would be removed"""
+
+        return network.deltaRemoveRoute(self._routeID)
+
+    def routeID(self) -> int:
+        """Returns the ID of the route to be removed"""
+
+        return self._routeID
+
+
+class ReplaceRoute(Move):
+    """Replaces the route with routeID by a route visiting stations in order
+
+    Attributes:
+        _remove (RemoveRoute): The removal of the old route.
+        _add (AddRoute): The addition of the new route.
+    """
+
+    __slots__ = ("_remove", "_add")
+
+    def __init__(self, routeID: int, stations: List["Station"]):
+        """
+        Initializer function
+
+        Args:
+            routeID (int): The unique identifier of the route to be replaced.
+            stations (List[Station]): The stations of the new route in order of travel.
+        """
+        self._remove = RemoveRoute(routeID)
+        self._add = AddRoute(stations)
+
+    def __repr__(self) -> str:
+        """Representation magic method"""
+
+        return f"ReplaceRoute({self._remove.routeID()}, {self._add})"
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Removes the old route from network and adds the new route.
+
+        Post: network has the new route instead of the route with routeID.
+        """
+        self._remove.apply(network)
+        self._add.apply(network)
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Removes the new route from network and restores the old route.
+
+        Post: The old route is back in its original position with its original ID and stations.
+        """
+        self._add.undo(network)
+        self._remove.undo(network)
+
+    def delta(self, network: "RailNetwork") -> float:
+        """Returns the change in score of network if the route would be replaced"""
+
+        return network.deltaReplaceRoute(self._remove.routeID(), self._add.stations())
+
+    def routeID(self) -> int:
+        """Returns the ID of the route to be replaced"""
+
+        return self._remove.routeID()
+
+    def stations(self) -> List["Station"]:
+        """Returns the stations of the new route"""
+
+        return self._add.stations()
+
+    def newRouteID(self) -> Optional[int]:
+        """Returns the ID of the new route, None if the move has not been applied"""
+
+        return self._add.routeID()
+
+
+class PushHead(Move):
+    """Adds station to the head end of the route with routeID
+
+    Attributes:
+        _routeID (int): The ID of the route to be extended.
+        _station (Station): The station to be added.
+    """
+
+    __slots__ = ("_routeID", "_station")
+
+    # True if the move changes the head end of the route, False for the tail end
+    head = True
+
+    def __init__(self, routeID: int, station: "Station"):
+        """
+        Initializer function
+
+        Args:
+            routeID (int): The unique identifier of the route to be extended.
+            station (Station): The station to be added.
+        """
+        self._routeID = routeID
+        self._station = station
+
+    def __repr__(self) -> str:
+        """Representation magic method"""
+
+        return f"{type(self).__name__}({self._routeID}, {self._station.name()})"
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Inserts the station in front of the head of the route.
+
+        Post: The station is the first station of the route with routeID.
+        """
+        network.getRoute(self._routeID).insertStation(0, self._station)
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Removes the station added by apply() from the head of the route.
+
+        Post: The route with routeID has its original stations.
+        """
+        network.getRoute(self._routeID).popStation(0)
+
+    def delta(self, network: "RailNetwork") -> float:
+        """Returns the change in score of network if the station would be added"""
+
+        return network.deltaExtendRoute(self._routeID, self._station, self.head)
+
+    def routeID(self) -> int:
+        """Returns the ID of the route to be extended"""
+
+        return self._routeID
+
+    def station(self) -> "Station":
+        """Returns the station to be added"""
+
+        return self._station
+
+
+class PushTail(PushHead):
+    """Adds station to the tail end of the route with routeID"""
+
+    __slots__ = ()
+
+    head = False
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Appends the station behind the tail of the route.
+
+        Post: The station is the last station of the route with routeID.
+        """
+        network.getRoute(self._routeID).appendStation(self._station)
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Removes the station added by apply() from the tail of the route.
+
+        Post: The route with routeID has its original stations.
+        """
+        network.getRoute(self._routeID).popStation()
+
+
+class PopHead(Move):
+    """Removes the station at the head end of the route with routeID
+
+    Attributes:
+        _routeID (int): The ID of the route to be trimmed.
+        _station (Optional[Station]): The removed station once the move has been applied.
+    """
+
+    __slots__ = ("_routeID", "_station")
+
+    # True if the move changes the head end of the route, False for the tail end
+    head = True
+
+    def __init__(self, routeID: int):
+        """
+        Initializer function
+
+        Args:
+            routeID (int): The unique identifier of the route to be trimmed.
+        """
+        self._routeID = routeID
+        self._station: Optional["Station"] = None
+
+    def __repr__(self) -> str:
+        """Representation magic method"""
+
+        return f"{type(self).__name__}({self._routeID})"
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Removes the first station of the route and remembers it.
+
+        Post: The route with routeID no longer starts with the removed station.
+        """
+        route = network.getRoute(self._routeID)
+
+        self._station = route.getStation(0)
+        route.popStation(0)
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Inserts the station removed by apply() in front of the head of the route.
+
+        Post: The route with routeID has its original stations.
+        """
+        network.getRoute(self._routeID).insertStation(0, self._station) # type: ignore
+
+    def delta(self, network: "RailNetwork") -> float:
+        """Returns the change in score of network if the first station would be removed"""
+
+        return network.deltaTrimRoute(self._routeID, self.head)
+
+    def routeID(self) -> int:
+        """Returns the ID of the route to be trimmed"""
+
+        return self._routeID
+
+
+class PopTail(PopHead):
+    """Removes the station at the tail end of the route with routeID"""
+
+    __slots__ = ()
+
+    head = False
+
+    def apply(self, network: "RailNetwork") -> None:
+        """
+        Removes the last station of the route and remembers it.
+
+        Post: The route with routeID no longer ends with the removed station.
+        """
+        route = network.getRoute(self._routeID)
+
+        self._station = route.getStation(-1)
+        route.popStation()
+
+    def undo(self, network: "RailNetwork") -> None:
+        """
+        Appends the station removed by apply() behind the tail of the route.
+
+        Post: The route with routeID has its original stations.
+        """
+        network.getRoute(self._routeID).appendStation(self._station) # type: ignore
@@ -1,14 +1,22 @@
 import os
 import csv
 import datetime
+import hashlib
 from math import ceil
+from bisect import bisect_left
 from collections import Counter
 
 from classes.station import Station
 from classes.route import Route
 from classes.connection import Connection
+from classes.compactGraph import CompactGraph
+from classes.contractedGraph import ContractedGraph
 
-from typing import Optional, List, Tuple, Dict, Union
+from typing import Optional, List, Tuple, Dict, Union, Iterable
+
+
+# Scores closer together than this are equal, as they are sums of floats
+SCORE_EPSILON = 1e-9
 
 
 class RailNetwork:
@@ -51,6 +59,18 @@ class RailNetwork:
           contains the connecting station in the first position and the duration of the connection
           in the second position.
 
+    > Trying out changes:
+        - Use self.beginTransaction() before changing routes to record all changes in a journal.
+        - Use self.rollback() to undo all changes since the start of the transaction, or
+          self.commit() to keep them. Route IDs given out during the transaction are not reused.
+
+    > Scoring changes before making them:
+        - Use self.scoreAfter() to get the score after removing and adding routes, or one of the
+          self.delta...() methods to get the score change of a single move.
+        - Only apply the change when it is accepted, for example with self.addRoute(stations).
+        - The moves in classes.move wrap these methods: a move can be scored with move.delta(),
+          made with move.apply() and taken back with move.undo().
+
     O STATIONS
     > Getting connecting stations
         - if wanted, connecting stations can also be returned from stations using the getConnected
@@ -59,28 +79,65 @@ class RailNetwork:
 
     Attributes:
         _stations (dict[str, Station]): Dictionary of station nodes, keyed by their name.
+        _stationNodes (List[Station]): List of all station nodes, indexed by their id.
         _connections (List[Connection]): List of all connection nodes, indexed by their id.
         _routes (Dict[Route]): Dictionary of all used routes keyed by ID.
         _routeID (int): The next free unique identifier for routes.
+        _usedConnections (int): The amount of connection nodes with routes registered to them.
+        _totalDuration (float): The summed duration of all routes.
+        _journal (Optional[List[Tuple]]): The changes made during the open transaction, or None if
+            there is no open transaction.
+        _compactGraph (Optional[CompactGraph]): Array representation of the stations and
+            connections, built on first use and shared with clones.
+        _contractedGraph (Optional[ContractedGraph]): The compact graph with chains contracted,
+            built on load if requested and shared with clones.
+        _dataKey (str): Hash of the contents of the station and connection files.
+        _components (List[Tuple[float, List[float]]]): For every connected component with
+            connections, the summed duration of its connections and the duration of the shortest
+            connection of each of its stations with an odd amount of connections, sorted. Loaded
+            once and shared with clones, see upperBoundScore().
     """
 
     # Initialization functions
-    def __init__(self, filepathStations: str, filepathConnections: str):
+    def __init__(
+        self, filepathStations: str, filepathConnections: str, contractChains: bool = False
+    ):
         """
         Initializer function
 
         Args:
             filepathStations (str): The path to the station data csv file.
             filepathConnections (str): The path to the connection data csv file.
+            contractChains (bool): Whether random routes are generated on the graph with chains of
+                stations with two connections contracted, see searchGraph().
         """
         self._stations: Dict[str, Station] = dict()
         self._connections: List[Connection] = []
         self._routes: Dict[int, Route] = dict()
         self._routeID = 0
 
+        # Maintained by the routes of the network, see _updateCoverage() and _updateDuration()
+        self._usedConnections = 0
+        self._totalDuration = 0.0
+
+        self._journal: Optional[List[Tuple]] = None
+
+        self._compactGraph: Optional[CompactGraph] = None
+
         self._loadStations(filepathStations)
         self._loadConnections(filepathConnections)
 
+        self._stationNodes: List[Station] = list(self._stations.values())
+
+        self._contractedGraph: Optional[ContractedGraph] = None
+
+        if contractChains:
+            self._contractedGraph = ContractedGraph(self.compactGraph())
+
+        self._components = self._loadComponents()
+
+        self._dataKey = self._hashFiles(filepathStations, filepathConnections)
+
     def _loadStations(self, csvFilepath: str) -> None:
         """
         Loads station nodes from csv-file.
@@ -99,7 +156,8 @@ class RailNetwork:
             reader = csv.DictReader(csvFile)
 
             for row in reader:
-                station = Station(row["station"], float(row["x"]), float(row["y"]))
+                station = Station(row["station"], float(row["x"]), float(row["y"]),
+                                  len(self._stations))
 
                 self._stations[station.name()] = station
 
@@ -125,6 +183,92 @@ class RailNetwork:
                     self._stations[row["station1"]].addConnection(row["station2"], connection)
                     self._stations[row["station2"]].addConnection(row["station1"], connection)
 
+    def _loadComponents(self) -> List[Tuple[float, List[float]]]:
+        """
+        Returns the summed connection duration and the sorted shortest connection durations of the
+        odd stations of every connected component with connections. See upperBoundScore().
+        """
+        seen = set()
+        components = []
+
+        for root in self._stationNodes:
+            if root.name() in seen or not root.listNodeConnections():
+                continue
+
+            seen.add(root.name())
+            stations = [root]
+
+            for station in stations:
+                for connection in station.listNodeConnections():
+                    for neighbour in connection.getStations():
+                        if neighbour.name() not in seen:
+                            seen.add(neighbour.name())
+                            stations.append(neighbour)
+
+            connections = {connection.getID(): connection.duration() for station in stations
+                           for connection in station.listNodeConnections()}
+
+            oddDurations = sorted(
+                min(connection.duration() for connection in station.listNodeConnections())
+                for station in stations if len(station.listNodeConnections()) % 2
+            )
+
+            components.append((sum(connections.values()), oddDurations))
+
+        return components
+
+    def _hashFiles(self, *filepaths: str) -> str:
+        """Returns the hexadecimal SHA-1 hash of the contents of all files in filepaths"""
+
+        fileHash = hashlib.sha1()
+
+        for filepath in filepaths:
+            with open(filepath, "rb") as dataFile:
+                fileHash.update(dataFile.read())
+
+            # separates the files, so moving data between them changes the hash
+            fileHash.update(b"\0")
+
+        return fileHash.hexdigest()
+
+    def dataKey(self) -> str:
+        """
+        Returns a hash of the contents of the station and connection files the network was loaded
+        from. Networks loaded from identical data have the same key, regardless of their paths.
+        """
+        return self._dataKey
+
+    def clone(self) -> "RailNetwork":
+        """
+        Returns a copy of the network with all its routes. The copy does not reload the csv files
+        and shares the names, positions, connection IDs, durations and immutable route
+        registrations with the original; only the node objects, their adjacency and the routes are
+        rebuilt. Much cheaper than deepcopy.
+        """
+        network = RailNetwork.__new__(RailNetwork)
+
+        network._stations = {name: station.clone() for name, station in self._stations.items()}
+        network._stationNodes = list(network._stations.values())
+        network._connections = [
+            connection.clone(*[network._stationNodes[station.getID()]
+                               for station in connection.getStations()])
+            for connection in self._connections
+        ]
+        network._routes = {routeID: route.clone(network) for routeID, route in self._routes.items()}
+        network._routeID = self._routeID
+
+        network._usedConnections = self._usedConnections
+        network._totalDuration = self._totalDuration
+
+        network._journal = None
+
+        network._compactGraph = self._compactGraph
+        network._contractedGraph = self._contractedGraph
+        network._components = self._components
+        network._dataKey = self._dataKey
+
+        return network
+
     def loadSolution(self, csvFilepath: str) -> None:
         """
         load a solution from a csvfile
@@ -152,13 +296,7 @@ class RailNetwork:
         Args:
             stationNames (List[str]): List of station names of the route in order of travel.
         """
-        firstStation = self.getStation(stationNames.pop(0))
-        route = self.createRoute(firstStation)
-
-        for stationName in stationNames:
-            station = self.getStation(stationName)
-
-            route.appendStation(station)
+        self.addRoute([self.getStation(stationName) for stationName in stationNames])
 
     # User methods: Stations
     def getStation(self, stationName: str) -> Station:
@@ -170,6 +308,36 @@ class RailNetwork:
         """
         return self._stations[stationName]
 
+    def getStationByID(self, stationID: int) -> Station:
+        """
+        Returns the station node with stationID.
+
+        Args:
+            stationID (int): The unique identifier of the station, as used in the compact graph.
+        """
+        return self._stationNodes[stationID]
+
+    def compactGraph(self) -> CompactGraph:
+        """
+        Returns the array representation of the stations and connections of the network. The graph
+        is built on first use and shared with all clones of the network.
+        """
+        if not self._compactGraph:
+            self._compactGraph = CompactGraph(self._stationNodes, self._connections)
+
+        return self._compactGraph
+
+    def searchGraph(self) -> CompactGraph:
+        """
+        Returns the graph random routes are generated on: the contracted graph if the network was
+        loaded with contractChains, otherwise the compact graph. Walks on either graph are turned
+        into stations and connections of the network with graph.expand().
+        """
+        if self._contractedGraph is not None:
+            return self._contractedGraph
+
+        return self.compactGraph()
+
     def listStations(
         self, nConnections=False, nUnused=False, nUnvisited=False
     ) -> List[Union["Station", Tuple["Station", Optional[int], Optional[int], Optional[int]]]]:
@@ -242,6 +410,15 @@ class RailNetwork:
         return [station for station in self.listStations(nConnections, nUnused, nUnvisited) if not
                 station[0].isConnected()]
 
+    def getConnection(self, connectionID: int) -> Connection:
+        """
+        Returns the connection node with connectionID.
+
+        Args:
+            connectionID (int): The unique identifier of the connection.
+        """
+        return self._connections[connectionID]
+
     def nConnections(self) -> int:
         """Returns the amount of connections in the network"""
 
@@ -260,13 +437,32 @@ class RailNetwork:
 
         Post: The route is stored in self._routes keyed by it's id
         """
-        newRoute = Route(station, self._routeID)
+        newRoute = Route(station, self._routeID, self)
         self._routeID += 1
 
         self._routes[newRoute.getID()] = newRoute
 
+        if self._journal is not None:
+            self.recordChange(self, "create", newRoute.getID())
+
         return newRoute
 
+    def addRoute(self, stations: List[Station]) -> Route:
+        """
+        Creates a route that visits stations in order and adds it to the routes in the network.
+
+        Args:
+            stations (List[Station]): The stations of the route in order of travel.
+
+        Returns (Route): The newly created route.
+        """
+        route = self.createRoute(stations[0])
+
+        for station in stations[1:]:
+            route.appendStation(station)
+
+        return route
+
     def listRoutesWithLegal(self, tMax: float) -> List[Route]:
         """
         Returns a list of all routes that have legal moves.
@@ -301,8 +497,38 @@ class RailNetwork:
         # remove all routeID's from all stations and routes in route
         self._routes[routeID].empty()
 
+        if self._journal is not None:
+            self.recordChange(self, "delete", self._routes[routeID], list(self._routes).index(routeID))
+
         self._routes.pop(routeID)
 
+    def restoreRoute(self, route: Route, stations: List[Station], position: int) -> None:
+        """
+        Adds a route that was removed with delRoute() back to the network with its original ID.
+
+        Args:
+            route (Route): The removed route node.
+            stations (List[Station]): The stations of the route in order of travel.
+            position (int): The position of the route in the order of routes.
+
+        Post: The route is stored in self._routes in its original position and visits stations.
+        """
+        self._insertRoute(route, position)
+
+        if self._journal is not None:
+            self.recordChange(self, "restore", route.getID())
+
+        for station in stations:
+            route.appendStation(station)
+
+    def _insertRoute(self, route: Route, position: int) -> None:
+        """Inserts a route in self._routes at position to keep the order of routes intact"""
+
+        routes = list(self._routes.items())
+        routes.insert(position, (route.getID(), route))
+
+        self._routes = dict(routes)
+
     def listRoutes(self) -> List[Route]:
         """Returns a list of all route nodes"""
 
@@ -323,7 +549,168 @@ class RailNetwork:
             K is the quality of the service
             p is the fraction of connection nodes with routes registered to them
         """
-        return self.connectionCoverage() * 10000 - (self.nRoute() * 100 + self.totalDuration())
+        return self._scoreOf(self._usedConnections, self.nRoute(), self._totalDuration)
+
+    def _scoreOf(self, usedConnections: int, nRoutes: int, totalDuration: float) -> float:
+        """
+        Returns the score of a network with the given properties according to the score function.
+
+        Args:
+            usedConnections (int): The amount of connection nodes with routes registered to them.
+            nRoutes (int): The amount of routes.
+            totalDuration (float): The summed duration of all routes.
+        """
+        return usedConnections / len(self._connections) * 10000 - (nRoutes * 100 + totalDuration)
+
+    # Score changes of candidate moves
+    def scoreAfter(
+        self, removeRouteIDs: Iterable[int] = (), addRoutes: Iterable[List[Station]] = ()
+    ) -> float:
+        """
+        Returns the score the network would have after removing and adding routes, without
+        changing the network. Only the coverage of the connections in the affected routes is read.
+
+        Args:
+            removeRouteIDs (Iterable[int]): The unique identifiers of the routes to be removed.
+            addRoutes (Iterable[List[Station]]): The stations of the routes to be added, in order of
+                travel.
+
+        Returns (float): The score after the change, equal to score() after applying it.
+        """
+        removeRouteIDs = set(removeRouteIDs)
+        addRoutes = list(addRoutes)
+
+        durationDifference = 0.0
+
+        # The change in the amount of routes covering every affected connection
+        coverageDifference: Dict[Connection, int] = dict()
+
+        for routeID in removeRouteIDs:
+            route = self._routes[routeID]
+            durationDifference -= route.duration()
+
+            for connection in route.listUniqueConnections():
+                coverageDifference[connection] = coverageDifference.get(connection, 0) - 1
+
+        for stations in addRoutes:
+            connections = self._findConnections(stations)
+            durationDifference += sum([connection.duration() for connection in connections])
+
+            for connection in set(connections):
+                coverageDifference[connection] = coverageDifference.get(connection, 0) + 1
+
+        usedDifference = 0
+
+        for connection, difference in coverageDifference.items():
+            covering = connection.routeAmount()
+
+            if not covering and covering + difference > 0:
+                usedDifference += 1
+
+            elif covering and not covering + difference:
+                usedDifference -= 1
+
+        return self._scoreOf(
+            self._usedConnections + usedDifference,
+            self.nRoute() + len(addRoutes) - len(removeRouteIDs),
+            self._totalDuration + durationDifference
+        )
+
+    def deltaAddRoute(self, stations: List[Station]) -> float:
+        """
+        Returns the change in score if a route visiting stations would be added.
+
+        Args:
+            stations (List[Station]): The stations of the route in order of travel.
+        """
+        return self.scoreAfter(addRoutes=[stations]) - self.score()
+
+    def deltaRemoveRoute(self, routeID: int) -> float:
+        """
+        Returns the change in score if the route with routeID would be removed.
+
+        Args:
+            routeID (int): The unique identifier of the route.
+        """
+        return self.scoreAfter(removeRouteIDs=[routeID]) - self.score()
+
+    def deltaReplaceRoute(self, routeID: int, stations: List[Station]) -> float:
+        """
+        Returns the change in score if the route with routeID would be replaced by a route visiting
+        stations.
+
+        Args:
+            routeID (int): The unique identifier of the route to be replaced.
+            stations (List[Station]): The stations of the new route in order of travel.
+        """
+        return self.scoreAfter([routeID], [stations]) - self.score()
+
+    def deltaExtendRoute(self, routeID: int, station: Station, head: bool = False) -> float:
+        """
+        Returns the change in score if station would be added to the head or tail end of a route.
+
+        Args:
+            routeID (int): The unique identifier of the route.
+            station (Station): The station to be added.
+            head (bool): True to add the station to the head end, False for the tail end.
+        """
+        route = self._routes[routeID]
+
+        # A single station adds no connections to a route
+        if not route.nStations():
+            return 0.0
+
+        connection = self._findConnection(route.getStation(0 if head else -1), station)
+
+        if not connection:
+            return 0.0
+
+        usedDifference = 0 if connection.isConnected() else 1
+
+        return self._scoreOf(self._usedConnections + usedDifference, self.nRoute(),
+                             self._totalDuration + connection.duration()) - self.score()
+
+    def deltaTrimRoute(self, routeID: int, head: bool = False) -> float:
+        """
+        Returns the change in score if the station at the head or tail end of a route would be
+        removed.
+
+        Args:
+            routeID (int): The unique identifier of the route.
+            head (bool): True to remove the station at the head end, False for the tail end.
+        """
+        route = self._routes[routeID]
+
+        if not route.length():
+            return 0.0
+
+        connection = route.getConnection(0 if head else -1)
+
+        if not connection:
+            return 0.0
+
+        # The connection is lost if this is its only occurrence in the only route covering it
+        lost = route.connectionCount(connection) == 1 and connection.routeAmount() == 1
+        usedDifference = -1 if lost else 0
+
+        return self._scoreOf(self._usedConnections + usedDifference, self.nRoute(),
+                             self._totalDuration - connection.duration()) - self.score()
+
+    def _findConnection(self, stationA: Station, stationB: Station) -> Optional[Connection]:
+        """Returns the connection node between stationA and stationB, if it exists"""
+
+        if not stationA.hasConnection(stationB.name()):
+            return None
+
+        return stationA.getConnection(stationB.name())
+
+    def _findConnections(self, stations: List[Station]) -> List[Connection]:
+        """Returns the existing connection nodes between consecutive stations"""
+
+        connections = [self._findConnection(stationA, stationB)
+                       for stationA, stationB in zip(stations, stations[1:])]
+
+        return [connection for connection in connections if connection]
 
     def minimumTotalDuration(self) -> float:
         """Returns the sum of durations from all connection nodes"""
@@ -354,6 +741,86 @@ class RailNetwork:
         """
         return 10000 - (100 * self.minimumRoutes(maxDuration) + self.minimumTotalDuration())
 
+    def upperBoundScore(self, maxDuration: float, maxRoutes: Optional[int] = None) -> float:
+        """
+        Returns an upper bound on the score of any solution, tighter than theoreticalMaxScore().
+
+        A solution that drives every connection needs at least one route per connected component,
+        and routes are shorter than maxDuration. A route has two ends, so of the stations with an
+        odd amount of connections, all but two per route must have a connection driven more than
+        once. Every such repeat takes at least the duration of the shortest connection of the
+        station, and is shared by at most two stations. Dead ends such as Den Helder therefore cost
+        their whole connection again unless a route ends there. A solution that leaves connections
+        undriven drives j connections that take at least as long as the j shortest, for the best j
+        that fits in its routes.
+
+        Args:
+            maxDuration (float): The maximum duration of a single route.
+            maxRoutes (Optional[int]): The maximum amount of routes, unlimited if None.
+        """
+        weight = 10000 / len(self._connections)
+
+        # leaving at least one connection undriven: drive the shortest others with k routes
+        durations = sorted(connection.duration() for connection in self._connections)
+        cumulative = [0.0]
+
+        for duration in durations[:-1]:
+            cumulative.append(cumulative[-1] + duration)
+
+        # connections can take longer than the points they are worth, so fewer can score more
+        points = [amount * weight - cumulative[amount] for amount in range(len(cumulative))]
+
+        bound = 0.0
+        routes = 1
+
+        while routes <= (maxRoutes or len(durations)):
+            amount = bisect_left(cumulative, routes * maxDuration) - 1
+            bound = max(bound, max(points[:amount + 1]) - 100 * routes)
+
+            if amount == len(cumulative) - 1:
+                break
+
+            routes += 1
+
+        # driving every connection: the fewest routes that fit in every component
+        componentRoutes = []
+        repeats = []
+
+        for duration, oddDurations in self._components:
+            routes = 1
+
+            while duration + self._repeatDuration(oddDurations, routes) >= routes * maxDuration:
+                routes += 1
+
+            componentRoutes.append(routes)
+            repeats.append(self._repeatDuration(oddDurations, routes))
+
+        totalDuration = self.minimumTotalDuration()
+
+        while maxRoutes is None or sum(componentRoutes) <= maxRoutes:
+            bound = max(bound, 10000 - 100 * sum(componentRoutes) - totalDuration - sum(repeats))
+
+            # every extra route goes to the component where it saves the most repeats
+            savings = [repeats[index] -
+                       self._repeatDuration(oddDurations, componentRoutes[index] + 1)
+                       for index, (_, oddDurations) in enumerate(self._components)]
+
+            if not savings or max(savings) <= 0:
+                break
+
+            index = savings.index(max(savings))
+            componentRoutes[index] += 1
+            repeats[index] -= savings[index]
+
+        return bound
+
+    def _repeatDuration(self, oddDurations: List[float], routes: int) -> float:
+        """
+        Returns the least duration of repeated connections in a component driven by routes routes,
+        given the sorted shortest connection durations of its odd stations.
+        """
+        return sum(oddDurations[:max(0, len(oddDurations) - 2 * routes)]) / 2
+
     def exportSolution(self, folder: str, filename: str, timeStamp: Optional[str] = None) -> None:
         """
         Exports the current routes to a csv file to /folder
@@ -481,22 +948,12 @@ class RailNetwork:
     def connectionCoverage(self) -> float:
         """Returns the fraction of connections that are registered to a route"""
 
-        usedConnections = 0
-
-        for connection in self._connections:
-            if connection.isConnected():
-                usedConnections += 1
-
-        return usedConnections / len(self._connections)
+        return self._usedConnections / len(self._connections)
 
     def totalDuration(self) -> float:
         """returns the total duration of the routes"""
-        totalDuration = 0
 
-        for _, route in self._routes.items():
-            totalDuration += route.duration()
-
-        return totalDuration
+        return self._totalDuration
 
     def getConnectedStation(self, fromStation: str, toStation: str) -> Station:
         """
@@ -508,6 +965,106 @@ class RailNetwork:
         """
         return self._stations[fromStation].getConnectedStation(toStation)
 
+    # Transactions
+    def beginTransaction(self) -> None:
+        """
+        Opens a journal in which all changes to the routes of the network are recorded, so they can
+        be undone with rollback() or kept with commit().
+        """
+        self._journal = []
+
+    def commit(self) -> None:
+        """Keeps all changes made since beginTransaction() and closes the journal"""
+
+        self._journal = None
+
+    def rollback(self) -> None:
+        """
+        Undoes all changes made since beginTransaction() in reverse order and closes the journal.
+
+        Post: The routes of the network and their registrations to station and connection nodes are
+            restored to the state they were in when the transaction began. Routes created in the
+            transaction keep their IDs reserved.
+        """
+        if self._journal is None:
+            raise Exception("network has no open transaction")
+
+        journal = self._journal
+
+        # Undoing changes must not be recorded itself
+        self._journal = None
+
+        for change in reversed(journal):
+            self._undo(*change)
+
+    def inTransaction(self) -> bool:
+        """Returns True if a transaction is open and changes are recorded, else False"""
+
+        return self._journal is not None
+
+    def recordChange(self, subject: Union[Route, "RailNetwork"], *change) -> None:
+        """
+        Records a change in the journal if a transaction is open. Called by routes of the network
+        whenever they gain or lose a station node.
+
+        Args:
+            subject (Union[Route, RailNetwork]): The object that was changed.
+            *change: The kind of change followed by the data required to undo it.
+        """
+        if self._journal is not None:
+            self._journal.append((subject, *change))
+
+    def _undo(self, subject: Union[Route, "RailNetwork"], kind: str, *data) -> None:
+        """
+        Undoes a single recorded change.
+
+        Args:
+            subject (Union[Route, RailNetwork]): The object that was changed.
+            kind (str): The kind of change, one of "insert", "pop", "empty", "create", "delete" or
+                "restore".
+            *data: The data recorded with the change.
+        """
+        if kind == "insert":
+            subject.popStation(data[0])
+
+        elif kind == "pop":
+            subject.insertStation(data[0], data[1])
+
+        elif kind == "empty":
+            for station in data[0]:
+                subject.appendStation(station)
+
+        elif kind == "create":
+            # the ID of the route is not given out again, see Move
+            self._routes.pop(data[0]).empty()
+
+        elif kind == "delete":
+            self._insertRoute(*data)
+
+        elif kind == "restore":
+            self._routes.pop(data[0])
+
+    # Route bookkeeping
+    def _updateCoverage(self, usedDifference: int) -> None:
+        """
+        Updates the amount of connection nodes with routes registered to them. Called by routes of
+        the network whenever a connection node becomes covered or uncovered.
+
+        Args:
+            usedDifference (int): The change in the amount of used connections.
+        """
+        self._usedConnections += usedDifference
+
+    def _updateDuration(self, durationDifference: float) -> None:
+        """
+        Updates the total duration of all routes. Called by routes of the network whenever a
+        connection node is added to or removed from them.
+
+        Args:
+            durationDifference (float): The change in total route duration.
+        """
+        self._totalDuration += durationDifference
+
     def getUnusedConnections(self) -> List[Connection]:
         """Returns a list of unused connections"""
 
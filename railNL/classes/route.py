@@ -1,9 +1,14 @@
+from collections import deque
+
 from classes.station import Station
 from classes.connection import Connection
 
-from typing import List, Tuple, Dict, Union, Optional
+from typing import TYPE_CHECKING, List, Tuple, Dict, Union, Optional, Deque, TypeVar
+
+if TYPE_CHECKING:
+    from classes.railNetwork import RailNetwork
 
-import numpy as np
+Node = TypeVar("Node")
 
 
 class Route:
@@ -17,23 +22,73 @@ class Route:
     is replaced and a new conection is inserted if available. Stations can also be popped and the
     route will similarily keep track of connection nodes.
 
+    Stations and connections are stored in double ended queues, so adding and removing stations at
+    the head and tail end of the route takes constant time.
+
     Routes are registered to station and connection nodes when appending and inserting, and
     unregistered when popping, but only if said node does not occur more than once in the route.
+    If the route belongs to a RailNetwork, every change in connection coverage and duration is
+    reported to the network so it can keep its score up to date.
 
     properties:
         _id (int): The unique identifier of the Route
-        _stations (List[Station]): The stations in the route in order
-        _connections (List[Connection]): The connections between the stations in order
+        _stations (Deque[Station]): The stations in the route in order
+        _connections (Deque[Connection]): The connections between the stations in order
+        _stationCounts (Dict[Station, int]): The amount of times every station occurs in the route.
+        _connectionCounts (Dict[Connection, int]): The amount of times every connection occurs in
+            the route.
+        _duration (float): The total duration of the connections in the route.
+        _network (Optional[RailNetwork]): The network the route is registered to, if any.
     """
 
-    def __init__(self, rootStation: Station, uid: int):
+    __slots__ = ("_id", "_stations", "_connections", "_stationCounts", "_connectionCounts",
+                 "_duration", "_network")
+
+    def __init__(self, rootStation: Station, uid: int, network: Optional["RailNetwork"] = None):
         """Initializer function"""
 
         self._id = uid
-        self._stations: List[Station] = [rootStation]
-        self._connections: List[Optional[Connection]] = []
+        self._stations: Deque[Station] = deque([rootStation])
+        self._connections: Deque[Optional[Connection]] = deque()
+        self._stationCounts: Dict[Station, int] = dict()
+        self._connectionCounts: Dict[Connection, int] = dict()
+        self._duration = 0.0
+        self._network = network
+
+        self._countStation(rootStation)
+
+    def clone(self, network: "RailNetwork") -> "Route":
+        """
+        Returns a copy of the route in a cloned network. The copy links to the station and
+        connection nodes of the cloned network, which already have the route registered to them.
 
-        rootStation.addRoute(self.getID())
+        Args:
+            network (RailNetwork): The clone of the network the route belongs to.
+        """
+        route = Route.__new__(Route)
+
+        # nodes of the cloned network have the same ID's as the nodes of the original
+        stations = [network.getStationByID(station.getID()) for station in self._stations]
+        connections = [
+            network.getConnection(connection.getID()) if connection else None
+            for connection in self._connections
+        ]
+
+        route._id = self._id
+        route._stations = deque(stations)
+        route._connections = deque(connections)
+        route._stationCounts = {
+            network.getStationByID(station.getID()): count
+            for station, count in self._stationCounts.items()
+        }
+        route._connectionCounts = {
+            network.getConnection(connection.getID()): count
+            for connection, count in self._connectionCounts.items()
+        }
+        route._duration = self._duration
+        route._network = network
+
+        return route
 
     def __repr__(self):
         """representation"""
@@ -47,13 +102,7 @@ class Route:
     def duration(self) -> float:
         """Returns the total duration of the route"""
 
-        totalDuration = 0.0
-
-        for connection in self._connections:
-            if connection:
-                totalDuration += connection.duration()
-
-        return totalDuration
+        return self._duration
 
     def length(self) -> int:
         """
@@ -89,16 +138,22 @@ class Route:
         Post: The route is registered to the station and connection nodes and the nodes are linked
             to in the route.
         """
+        # Normalize the index to the position the station will actually take in the route
+        if stationIndex < 0:
+            stationIndex = max(stationIndex + self.nStations(), 0)
+
+        stationIndex = min(stationIndex, self.nStations())
+
         self._stations.insert(stationIndex, station)
 
-        station.addRoute(self.getID())
+        self._countStation(station)
+
+        if self._network and self._network.inTransaction():
+            self._network.recordChange(self, "insert", stationIndex)
 
         if len(self._stations) == 1:
             return
 
-        if stationIndex < 0:
-            stationIndex += self.nStations()
-
         if stationIndex == 0:
             connectionIndex = 0
         else:
@@ -127,11 +182,12 @@ class Route:
         if stationIndex < 0:
             stationIndex += self.nStations()
 
-        station = self._stations.pop(stationIndex)
+        station = self._popNode(self._stations, stationIndex)
 
-        # Do not unregister the route from station if it still occurs in the route
-        if station not in self._stations:
-            station.removeRoute(self.getID())
+        if self._network and self._network.inTransaction():
+            self._network.recordChange(self, "pop", stationIndex, station)
+
+        self._uncountStation(station)
 
         self._removeConnections(stationIndex)
 
@@ -175,6 +231,13 @@ class Route:
         if currentDuration >= tMax:
             return False
 
+        # The shortest connection of both ends decides if any connection fits
+        if self._network:
+            graph = self._network.compactGraph()
+
+            return any(currentDuration + graph.minimumDuration(station.getID()) < tMax
+                       for station, _ in self.getOpenStations())
+
         for station, _ in self.getOpenStations():
             for _, duration, *_ in station.listStations():
                 if currentDuration + duration < tMax:
@@ -207,6 +270,10 @@ class Route:
         """
         currentDuration = self.duration()
 
+        if self._network and not (nConnections or nUnused or nUnvisited or unusedOnly or
+                                  unvisitedOnly):
+            return self._compactLegalMoves(tMax - currentDuration)
+
         legalMoves = dict()
 
         for station, index in self.getOpenStations():
@@ -234,6 +301,36 @@ class Route:
 
         return legalMoves
 
+    def _compactLegalMoves(
+        self, budget: float
+    ) -> Dict[int, List[Tuple[Station, float, Optional[int], Optional[int], Optional[int]]]]:
+        """
+        Returns the legal moves of the route in the same format as getLegalMoves() without optional
+        information, looked up in the compact graph of the network.
+
+        Args:
+            budget (float): The time left before the route reaches its maximum duration.
+        """
+        graph = self._network.compactGraph() # type: ignore
+        neighbours, _, durations = graph.neighbourArrays()
+
+        legalMoves = dict()
+
+        for station, index in self.getOpenStations():
+            if index in legalMoves:
+                continue
+
+            start, end = graph.legalNeighbourRange(station.getID(), budget)
+
+            if start < end:
+                legalMoves[index] = [
+                    (self._network.getStationByID(stationID), duration, None, None, None) # type: ignore
+                    for stationID, duration in zip(neighbours[start:end].tolist(),
+                                                   durations[start:end].tolist())
+                ]
+
+        return legalMoves
+
     def brokenConnections(self) -> List[Tuple[Tuple[Station, int], Tuple[Station, int]]]:
         """
         Returns a list of all nonexistent rail connections, formatted as
@@ -288,26 +385,51 @@ class Route:
         """
         Remove all station and connection nodes from the route and unregisters the route from them.
         """
-        for station in self._stations:
+        if self._network and self._network.inTransaction():
+            self._network.recordChange(self, "empty", self.listStations())
+
+        for station in self._stationCounts:
             station.removeRoute(self.getID())
 
-        self._stations = []
+        self._stations = deque()
+        self._stationCounts = dict()
 
-        for connection in self._connections:
-            if connection:
-                connection.removeRoute(self.getID())
+        for connection in self._connectionCounts:
+            self._unregisterConnection(connection)
+
+        self._reportDuration(-self._duration)
 
-        self._connections = []
+        self._connections = deque()
+        self._connectionCounts = dict()
 
     def uniqueStations(self) -> int:
-        """Returns the amount of stations in route that occur only once"""
+        """Returns the amount of distinct stations in the route"""
 
-        return len(np.unique(self._stations)) # type: ignore
+        return len(self._stationCounts)
 
     def uniqueConnections(self) -> int:
-        """Returns the amount of connections in the route that occur only once unique"""
+        """Returns the amount of distinct connections in the route"""
+
+        return len(self._connectionCounts)
+
+    def listUniqueConnections(self) -> List[Connection]:
+        """Returns a list of the distinct connection nodes in the route"""
+
+        return list(self._connectionCounts)
 
-        return len(np.unique(self._connections)) # type: ignore
+    def connectionCount(self, connection: Connection) -> int:
+        """Returns the amount of times a connection node occurs in the route"""
+
+        return self._connectionCounts.get(connection, 0)
+
+    def getConnection(self, connectionIndex: int) -> Optional[Connection]:
+        """
+        Returns the connection node on connectionIndex, None if the connection is broken.
+
+        Args:
+            connectionIndex (int): The index of the connection to be returned.
+        """
+        return self._connections[connectionIndex]
 
     def routeScore(self, totalConnections: int) -> float:
         """
@@ -350,11 +472,10 @@ class Route:
         post: the connection node is removed from the route, and the route is unregistered from the
             node if it no longer occurs in the route.
         """
-        connection = self._connections.pop(connectionIndex)
+        connection = self._popNode(self._connections, connectionIndex)
 
-        # Do not unregister the route from connection if it is still in the route
-        if connection and connection not in self._connections:
-            connection.removeRoute(self.getID())
+        if connection:
+            self._uncountConnection(connection)
 
     def _insertConnection(self, stationIndex: int, connectionIndex: int) -> None:
         """
@@ -375,7 +496,7 @@ class Route:
         connection = self._findConnection(stationA, stationB)
 
         if connection:
-            connection.addRoute(self.getID())
+            self._countConnection(connection)
 
         self._connections.insert(connectionIndex, connection)
 
@@ -389,10 +510,32 @@ class Route:
 
         self._connections[connectionIndex] = newConnection
 
+        if newConnection:
+            self._countConnection(newConnection)
+
         # Only attempt to remove routeID if oldConnection not None
-        # Do not remove routeID from connection if it is still in the route
-        if oldConnection and oldConnection not in self._connections:
-            self._connections[connectionIndex].removeRoute(self.getID()) # type: ignore
+        if oldConnection:
+            self._uncountConnection(oldConnection)
+
+    def _popNode(self, nodes: Deque[Node], index: int) -> Node:
+        """
+        Removes and returns the node on index from a deque of nodes. Popping at the head or tail
+        end takes constant time.
+
+        Args:
+            nodes (Deque[Node]): The stations or connections of the route.
+            index (int): The non-negative index of the node to be removed.
+        """
+        if index == 0:
+            return nodes.popleft()
+
+        if index == len(nodes) - 1:
+            return nodes.pop()
+
+        node = nodes[index]
+        del nodes[index]
+
+        return node
 
     def _findConnection(self, station1: Station, station2: Station) -> Union[Connection, None]:
         """
@@ -405,3 +548,79 @@ class Route:
         connection = station1.getConnection(station2.name())
 
         return connection
+
+    def _countStation(self, station: Station) -> None:
+        """Counts an occurrence of a station and registers the route to it on its first"""
+
+        if station in self._stationCounts:
+            self._stationCounts[station] += 1
+            return
+
+        self._stationCounts[station] = 1
+        station.addRoute(self.getID())
+
+    def _uncountStation(self, station: Station) -> None:
+        """
+        Removes an occurrence of a station and unregisters the route if it no longer occurs in the
+        route.
+        """
+        self._stationCounts[station] -= 1
+
+        if not self._stationCounts[station]:
+            del self._stationCounts[station]
+            station.removeRoute(self.getID())
+
+    def _countConnection(self, connection: Connection) -> None:
+        """Counts an occurrence of a connection and registers the route to it on its first"""
+
+        self._reportDuration(connection.duration())
+
+        if connection in self._connectionCounts:
+            self._connectionCounts[connection] += 1
+            return
+
+        self._connectionCounts[connection] = 1
+        self._registerConnection(connection)
+
+    def _uncountConnection(self, connection: Connection) -> None:
+        """
+        Removes an occurrence of a connection and unregisters the route if it no longer occurs in
+        the route.
+        """
+        self._reportDuration(-connection.duration())
+
+        self._connectionCounts[connection] -= 1
+
+        if not self._connectionCounts[connection]:
+            del self._connectionCounts[connection]
+            self._unregisterConnection(connection)
+
+    def _registerConnection(self, connection: Connection) -> None:
+        """
+        Registers the route to a connection node and reports to the network if the connection
+        was not covered by any route before.
+        """
+        covered = connection.isConnected()
+
+        connection.addRoute(self.getID())
+
+        if self._network and not covered:
+            self._network._updateCoverage(1)
+
+    def _unregisterConnection(self, connection: Connection) -> None:
+        """
+        Unregisters the route from a connection node and reports to the network if the connection
+        is no longer covered by any route.
+        """
+        connection.removeRoute(self.getID())
+
+        if self._network and not connection.isConnected():
+            self._network._updateCoverage(-1)
+
+    def _reportDuration(self, duration: float) -> None:
+        """Updates the duration of the route and reports the change to the network"""
+
+        self._duration += duration
+
+        if self._network:
+            self._network._updateDuration(duration)
@@ -0,0 +1,352 @@
+import os
+import random
+import hashlib
+import tempfile
+from math import ceil
+
+import numpy as np
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from classes.railNetwork import RailNetwork
+    from classes.station import Station
+
+"""Module for pools of precomputed candidate routes
+
+A route pool holds legal routes for a network and a maximum route duration as integer arrays, so
+algorithms can draw a finished route in constant time instead of generating one with a random walk.
+Pools are built once per dataset and cached on disk by loadRoutePool().
+"""
+
+
+# Increase when the contents of built pools change, so old cache files are no longer used
+POOL_VERSION = 1
+
+# Pools loaded in this process, keyed by their cache key
+_LOADED_POOLS: Dict[str, "RoutePool"] = dict()
+
+
+class RoutePool:
+    """Pool of candidate routes stored as compact integer arrays
+
+    Every route in the pool is a trail: it visits no connection more than once. Routes are stored in
+    compressed sparse row format: the station IDs of route i are found at positions offsets[i] up
+    to offsets[i + 1] of the station array. A route with n stations has n - 1 connections, so its
+    connection IDs are found at positions offsets[i] - i up to offsets[i + 1] - i - 1 of the
+    connection array.
+
+    Attributes:
+        _stations (np.ndarray): The station IDs of all routes in order of travel.
+        _connections (np.ndarray): The connection IDs of all routes in order of travel.
+        _offsets (np.ndarray): The start of every route in the station array, with the total
+            amount of stations appended.
+        _masks (np.ndarray): The connections of every route as a bitmask split over 64 bit words,
+            an (n, words) array. Bit c of the mask is set if the route contains connection c.
+        _durations (np.ndarray): The duration of every route.
+    """
+
+    __slots__ = ("_stations", "_connections", "_offsets", "_masks", "_durations")
+
+    def __init__(
+        self,
+        stations: np.ndarray,
+        connections: np.ndarray,
+        offsets: np.ndarray,
+        masks: np.ndarray,
+        durations: np.ndarray
+    ):
+        """Initializer function. See the attributes of the class for the arguments."""
+
+        self._stations = stations
+        self._connections = connections
+        self._offsets = offsets
+        self._masks = masks
+        self._durations = durations
+
+    def __len__(self) -> int:
+        """Length magic method, returns the amount of routes in the pool"""
+
+        return len(self._durations)
+
+    def stationIDs(self, index: int) -> np.ndarray:
+        """Returns the station IDs of the route on index in order of travel"""
+
+        return self._stations[self._offsets[index]:self._offsets[index + 1]]
+
+    def connectionIDs(self, index: int) -> np.ndarray:
+        """Returns the connection IDs of the route on index in order of travel"""
+
+        return self._connections[self._offsets[index] - index:self._offsets[index + 1] - index - 1]
+
+    def stations(self, index: int, network: "RailNetwork") -> List["Station"]:
+        """
+        Returns the station nodes of the route on index in network, in order of travel.
+
+        Args:
+            index (int): The index of the route in the pool.
+            network (RailNetwork): The network the pool was built for, or a copy of it.
+        """
+        return [network.getStationByID(stationID) for stationID in self.stationIDs(index).tolist()]
+
+    def randomStations(self, network: "RailNetwork") -> List["Station"]:
+        """Returns the station nodes of a random route from the pool in network"""
+
+        return self.stations(random.randrange(len(self)), network)
+
+    def duration(self, index: int) -> float:
+        """Returns the duration of the route on index"""
+
+        return float(self._durations[index])
+
+    def durations(self) -> np.ndarray:
+        """Returns the durations of all routes in the pool"""
+
+        return self._durations
+
+    def masks(self) -> np.ndarray:
+        """Returns the connection bitmasks of all routes in the pool, see the class attributes"""
+
+        return self._masks
+
+    def offsets(self) -> np.ndarray:
+        """Returns the start of every route in the station array"""
+
+        return self._offsets
+
+    def save(self, filepath: str) -> None:
+        """Saves the pool to a compressed numpy file at filepath"""
+
+        np.savez_compressed(filepath, stations=self._stations, connections=self._connections,
+                            offsets=self._offsets, masks=self._masks, durations=self._durations)
+
+
+def loadRoutePool(
+    network: "RailNetwork", maxDuration: float, cacheFolder: str = "cache", limit: int = 50000
+) -> RoutePool:
+    """
+    Returns the route pool of a network for maxDuration. Pools are cached in cacheFolder, keyed by
+    the contents of the data files of the network, maxDuration and limit, and are only built if no
+    cached pool exists. Pools loaded before in the same process are returned without reading the
+    cache. Cache files are written to a temporary file first and then moved into place, so
+    processes that load the same pool at once never read a partly written file.
+
+    Args:
+        network (RailNetwork): The network to build the pool for.
+        maxDuration (float): The maximum duration of a route. Pool routes are shorter.
+        cacheFolder (str): The folder the pool is cached in.
+        limit (int): The maximum amount of routes in the pool. See buildRoutePool().
+
+    Returns (RoutePool): The pool of routes.
+    """
+    key = hashlib.sha1(
+        f"{network.dataKey()}-{float(maxDuration)}-{limit}-{POOL_VERSION}".encode()
+    ).hexdigest()
+
+    if key in _LOADED_POOLS:
+        return _LOADED_POOLS[key]
+
+    filepath = f"{cacheFolder}/routePool-{key[:16]}.npz"
+
+    if os.path.exists(filepath):
+        with np.load(filepath) as poolFile:
+            pool = RoutePool(*[poolFile[name] for name in
+                               ["stations", "connections", "offsets", "masks", "durations"]])
+
+    else:
+        pool = buildRoutePool(network, maxDuration, limit, seed=int(key[:8], 16))
+
+        os.makedirs(cacheFolder, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=cacheFolder, suffix=".npz", delete=False) as tempFile:
+            temporaryPath = tempFile.name
+
+        try:
+            pool.save(temporaryPath)
+            os.replace(temporaryPath, filepath)
+        finally:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+
+    _LOADED_POOLS[key] = pool
+
+    return pool
+
+
+def buildRoutePool(
+    network: "RailNetwork", maxDuration: float, limit: int = 50000, seed: int = 0
+) -> RoutePool:
+    """
+    Builds a pool of the routes in network that are shorter than maxDuration and score more than 0
+    points in isolation, like the routes made by the random algorithm. Trails with the same set of
+    connections, such as a trail and its reverse, have the same duration and score, so only one of
+    them is kept.
+
+    All such trails are enumerated if there are at most limit of them. Otherwise limit of them are
+    sampled with random walks.
+
+    Args:
+        network (RailNetwork): The network to build the pool for.
+        maxDuration (float): The maximum duration of a route. Pool routes are shorter.
+        limit (int): The maximum amount of routes in the pool.
+        seed (int): The seed of the random walks, so equal arguments give equal pools.
+
+    Returns (RoutePool): The pool of routes.
+    """
+    routes = _enumerateTrails(network, maxDuration, limit)
+
+    if routes is None:
+        routes = _sampleTrails(network, maxDuration, limit, random.Random(seed))
+
+    nConnections = network.nConnections()
+    words = max(1, ceil(nConnections / 64))
+
+    masks = np.array(
+        [[(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for word in range(words)] for mask in routes],
+        dtype=np.uint64
+    ).reshape(-1, words)
+
+    stations = [stationIDs for _, stationIDs, _ in routes.values()]
+    lengths = np.array([len(stationIDs) for stationIDs in stations], dtype=np.int64)
+
+    offsets = np.zeros(len(routes) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    return RoutePool(
+        np.array([stationID for stationIDs in stations for stationID in stationIDs],
+                 dtype=np.int32),
+        np.array([connectionID for _, _, connectionIDs in routes.values()
+                  for connectionID in connectionIDs], dtype=np.int32),
+        offsets,
+        masks,
+        np.array([duration for duration, _, _ in routes.values()], dtype=np.float64)
+    )
+
+
+# Routes under construction: (duration, station IDs, connection IDs) keyed by connection bitmask
+Trails = Dict[int, Tuple[float, Tuple[int, ...], Tuple[int, ...]]]
+
+
+def _keepTrail(
+    routes: Trails, mask: int, duration: float, stationIDs: List[int], connectionIDs: List[int],
+    nConnections: int
+) -> None:
+    """
+    Adds a trail to routes if it scores more than 0 points in isolation and routes has no trail
+    with the same connections yet.
+    """
+    if mask in routes or len(connectionIDs) / nConnections * 10000 - (100 + duration) <= 0:
+        return
+
+    routes[mask] = (duration, tuple(stationIDs), tuple(connectionIDs))
+
+
+def _enumerateTrails(network: "RailNetwork", maxDuration: float, limit: int) -> Optional[Trails]:
+    """
+    Returns all trails in network shorter than maxDuration with a positive isolated score, or None
+    if there are more than limit distinct ones.
+    """
+    graph = network.compactGraph()
+    neighbours, connections, durations = [array.tolist() for array in graph.neighbourArrays()]
+    offsets = graph.offsets().tolist()
+    nConnections = graph.nConnections()
+
+    routes: Trails = dict()
+
+    stationIDs: List[int] = []
+    connectionIDs: List[int] = []
+
+    def extend(stationID: int, mask: int, duration: float) -> bool:
+        """Depth first extension of the trail at its tail. Returns False once limit is exceeded."""
+
+        # neighbours are sorted by duration, so the search stops at the first that is too long
+        for position in range(offsets[stationID], offsets[stationID + 1]):
+            newDuration = duration + durations[position]
+
+            if newDuration >= maxDuration:
+                break
+
+            connectionID = connections[position]
+
+            if mask >> connectionID & 1:
+                continue
+
+            stationIDs.append(neighbours[position])
+            connectionIDs.append(connectionID)
+
+            newMask = mask | 1 << connectionID
+            _keepTrail(routes, newMask, newDuration, stationIDs, connectionIDs, nConnections)
+
+            if len(routes) > limit or not extend(neighbours[position], newMask, newDuration):
+                return False
+
+            stationIDs.pop()
+            connectionIDs.pop()
+
+        return True
+
+    for stationID in range(graph.nStations()):
+        stationIDs.append(stationID)
+
+        if not extend(stationID, 0, 0.0):
+            return None
+
+        stationIDs.pop()
+
+    return routes
+
+
+def _sampleTrails(
+    network: "RailNetwork", maxDuration: float, limit: int, rng: random.Random
+) -> Trails:
+    """
+    Returns up to limit distinct trails in network shorter than maxDuration with a positive
+    isolated score, sampled with random walks that grow at a random end until they reach a random
+    target duration or can not be extended.
+    """
+    graph = network.compactGraph()
+    neighbours, connections, durations = [array.tolist() for array in graph.neighbourArrays()]
+    nConnections = graph.nConnections()
+
+    longestConnection = max(durations)
+
+    routes: Trails = dict()
+
+    for _ in range(10 * limit):
+        if len(routes) >= limit:
+            break
+
+        tTarget = rng.uniform(longestConnection, maxDuration)
+
+        stationIDs = [rng.randrange(graph.nStations())]
+        connectionIDs: List[int] = []
+        mask = 0
+        duration = 0.0
+
+        while True:
+            ends = []
+
+            for head, stationID in [(True, stationIDs[0]), (False, stationIDs[-1])]:
+                start, end = graph.legalNeighbourRange(stationID, tTarget - duration)
+                ends += [(head, position) for position in range(start, end)
+                         if not mask >> connections[position] & 1]
+
+            if not ends:
+                break
+
+            head, position = rng.choice(ends)
+
+            if head:
+                stationIDs.insert(0, neighbours[position])
+                connectionIDs.insert(0, connections[position])
+            else:
+                stationIDs.append(neighbours[position])
+                connectionIDs.append(connections[position])
+
+            mask |= 1 << connections[position]
+            duration += durations[position]
+
+        if connectionIDs:
+            _keepTrail(routes, mask, duration, stationIDs, connectionIDs, nConnections)
+
+    return routes
@@ -1,30 +1,66 @@
-from typing import TYPE_CHECKING, List, Tuple, Dict, Optional, Set
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional, FrozenSet
 
 if TYPE_CHECKING:
     from classes.connection import Connection
 
 
+# Shared by all nodes that are not registered to any route
+NO_ROUTES: FrozenSet[int] = frozenset()
+
+
 class Station:
     """Station node for a rail network
 
     Stations link to connection nodes that link to their connected station nodes. Stations keep
-    track of all routes objects that they are incorporated in.
+    track of all routes objects that they are incorporated in. Registered routes are kept in an
+    immutable set, as most stations are in zero to two routes and immutable sets can be shared
+    between copies of the station.
 
     Attributes:
+        _id (int): Unique identifier, -1 for stations that are not part of a network.
         _name (str): The name of the station
         _position (Tuple[float, float]): The x and y coordinates of the station.
         _Connections (Dict[str, Tuple[Station, int]]): Connected stations and the time the rail
             connection takes keyed by station name.
-        _routes (Set[int]): The set of route ID's of routes registered to the station.
+        _routes (FrozenSet[int]): The set of route ID's of routes registered to the station.
+        _unusedConnections (int): The amount of connections of the station that are not in any
+            route. Kept up to date by the connection nodes.
+        _unvisitedConnections (int): The amount of connected stations that are not in any route.
+            Kept up to date by the connected station nodes.
     """
 
-    def __init__(self, name: str, x: float, y: float):
+    __slots__ = ("_id", "_name", "_position", "_connections", "_routes", "_unusedConnections",
+                 "_unvisitedConnections")
+
+    def __init__(self, name: str, x: float, y: float, uid: int = -1):
         """Initializer function"""
 
+        self._id = uid
         self._name = name
         self._position = (x, y)
         self._connections: Dict[str, "Connection"] = dict()
-        self._routes: Set[int] = set()
+        self._routes: FrozenSet[int] = NO_ROUTES
+        self._unusedConnections = 0
+        self._unvisitedConnections = 0
+
+    def clone(self) -> "Station":
+        """
+        Returns a copy of the station without connections that shares the name, position and
+        registered routes of the station.
+        """
+        station = Station.__new__(Station)
+
+        station._id = self._id
+        station._name = self._name
+        station._position = self._position
+        station._connections = dict()
+        station._routes = self._routes
+
+        # counted again when the connections are added
+        station._unusedConnections = 0
+        station._unvisitedConnections = 0
+
+        return station
 
     def __str__(self) -> str:
         """String representaton"""
@@ -36,6 +72,11 @@ class Station:
 
         return f"Station({self._name}, {self.connectionAmount()})"
 
+    def getID(self) -> int:
+        """Returns the unique ID of the station"""
+
+        return self._id
+
     def name(self) -> str:
         """Returns the name of the station"""
 
@@ -162,24 +203,14 @@ class Station:
         Returns the amount of unvisited stations connected to the station. A station is unvisited if
         it is not in any route.
         """
-        unvisitedStations = 0
-        for name, connection in self._connections.items():
-            if not connection.getConnectedStation(name).isConnected():
-                unvisitedStations += 1
-
-        return unvisitedStations
+        return self._unvisitedConnections
 
     def unusedConnectionAmount(self) -> int:
         """
         Returns the amount of unused station connections connected to the station. A connection
         is unused if it is not in any routes.
         """
-        unusedStations = 0
-        for _, connection in self._connections.items():
-            if not connection.isConnected():
-                unusedStations += 1
-
-        return unusedStations
+        return self._unusedConnections
 
     def getConnectedStation(self, stationName: str) -> "Station":
         """returns the station node of a connected station."""
@@ -206,14 +237,47 @@ class Station:
         """
         self._connections[stationName] = connection
 
+        if not connection.isConnected():
+            self._unusedConnections += 1
+
+        if not connection.getConnectedStation(stationName).isConnected():
+            self._unvisitedConnections += 1
+
     def addRoute(self, routeID: int):
         """Adds a route to the set of routes"""
-        self._routes.add(routeID)
+        if not self._routes:
+            self._updateNeighbours(-1)
+
+        self._routes = self._routes | {routeID}
 
     def removeRoute(self, routeID: int):
         """Removes a route from the set of routes"""
         if routeID in self._routes:
-            self._routes.remove(routeID)
+            self._routes = self._routes - {routeID} or NO_ROUTES
+
+            if not self._routes:
+                self._updateNeighbours(1)
+
+    def updateUnusedConnections(self, difference: int) -> None:
+        """
+        Updates the amount of unused connections. Called by connection nodes when they become used
+        or unused.
+
+        Args:
+            difference (int): The change in the amount of unused connections.
+        """
+        self._unusedConnections += difference
+
+    def _updateNeighbours(self, difference: int) -> None:
+        """
+        Updates the amount of unvisited connected stations of all connected stations when the
+        station becomes visited or unvisited.
+
+        Args:
+            difference (int): The change in the amount of unvisited stations.
+        """
+        for name, connection in self._connections.items():
+            connection.getConnectedStation(name)._unvisitedConnections += difference
 
     def isConnected(self) -> bool:
         """
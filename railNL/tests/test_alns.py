@@ -0,0 +1,34 @@
+import pytest
+import random
+from classes.railNetwork import RailNetwork
+from algorithms import alns
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+
+@pytest.mark.parametrize("seed", range(10))
+def test_destroySnakeTrim(seed):
+    """Tests if trimming a route never leaves it without a connection"""
+    random.seed(seed)
+    testNetwork = masterNetwork.clone()
+    testNetwork.addRoute([testNetwork.getStation(name) for name in ["AAA", "BBB", "CCC"]])
+    moves = []
+
+    alns.destroySnakeTrim(testNetwork, 7, 120, moves)
+
+    assert len(moves) == 1
+    assert all(route.nStations() == 2 for route in testNetwork.listRoutes())
+
+    # a route with a single connection is left alone
+    alns.destroySnakeTrim(testNetwork, 7, 120, moves)
+    assert len(moves) == 1
+
+def test_alns(tmp_path):
+    """Tests if the solution is valid and not worse than the initial solution"""
+    random.seed(1)
+    initialScore = alns.randomAlgorithm.initialSolution(masterNetwork, 2, 50, "eulerian", 0).score()
+    bestNetwork = alns.main(masterNetwork, 2, 50, str(tmp_path), convergenceLimit=200,
+                            initialiser="eulerian")
+
+    assert bestNetwork.nRoute() <= 2
+    assert all(route.isValid(50) for route in bestNetwork.listRoutes())
+    assert bestNetwork.score() >= initialScore
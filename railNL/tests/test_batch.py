@@ -0,0 +1,40 @@
+import pytest
+import csv
+import glob
+import sys
+import importlib.util
+
+# the batch runner lives in the __main__ module of the package
+spec = importlib.util.spec_from_file_location("railNLMain", "__main__.py")
+railNLMain = importlib.util.module_from_spec(spec)
+sys.modules["railNLMain"] = railNLMain
+spec.loader.exec_module(railNLMain)
+
+def runScores(targetFolder: str, runName: str, runs: int):
+    """Returns the seed and score of every run from the summary file of a batch"""
+    summaryFilepath, = glob.glob(f"{targetFolder}/*-summary-{runName}-{runs}runs.csv")
+
+    with open(summaryFilepath, newline="") as summaryFile:
+        rows = list(csv.DictReader(summaryFile))
+
+    return [(row["seed"], row["score"]) for row in rows if row["iteration"] != "average"]
+
+def test_batchWorkers(tmp_path):
+    """Tests if a seeded batch scores the same per run with one or more worker processes"""
+    scores = []
+
+    for workers in [1, 2]:
+        targetFolder = str(tmp_path / str(workers))
+
+        railNLMain.batch(
+            "tests/testStation.csv", "tests/testRoute.csv", "annealing", runs=3,
+            targetFolder=targetFolder, runName="batch", workers=workers, seed=5,
+            coolingScheme="geometric", maxRoutes=3, maxDuration=50, initialTemperature=16,
+            coolingConstant=0.99, convergenceLimit=3, randomIterations=1
+        )
+
+        scores.append(runScores(targetFolder, "batch", 3))
+
+    # the runs stop early enough to differ, so runs mixed up between workers would show
+    assert len({score for _, score in scores[0]}) > 1
+    assert scores[0] == scores[1]
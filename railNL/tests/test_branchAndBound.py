@@ -0,0 +1,41 @@
+import pytest
+import itertools
+from classes.railNetwork import RailNetwork
+from classes.routePool import buildRoutePool
+from algorithms import branchAndBound
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+pathNetwork = RailNetwork("tests/testPathStation.csv", "tests/testPathRoute.csv")
+
+def bruteForceScore(network: RailNetwork, maxDuration: float, maxRoutes: int) -> float:
+    """Returns the best score of any selection of up to maxRoutes routes from the route pool"""
+    pool = buildRoutePool(network, maxDuration)
+    highestScore = 0.0
+
+    for nRoutes in range(1, maxRoutes + 1):
+        for selection in itertools.combinations(range(len(pool)), nRoutes):
+            testNetwork = network.clone()
+
+            for index in selection:
+                testNetwork.addRoute(pool.stations(index, testNetwork))
+
+            highestScore = max(highestScore, testNetwork.score())
+
+    return highestScore
+
+@pytest.mark.parametrize("maxDuration, maxRoutes", [(70, 1), (70, 2), (50, 2), (200, 1), (35, 3)])
+def test_optimum(tmp_path, maxDuration, maxRoutes):
+    """Tests if the proven optimum matches the best selection of routes found by brute force"""
+    bestNetwork = branchAndBound.main(masterNetwork, maxRoutes, maxDuration, str(tmp_path))
+
+    assert bestNetwork.score() == bruteForceScore(masterNetwork, maxDuration, maxRoutes)
+    assert bestNetwork.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in bestNetwork.listRoutes())
+
+@pytest.mark.parametrize("maxRoutes", [1, 2])
+def test_optimumLongConnections(tmp_path, maxRoutes):
+    """Tests if connections that take longer than they are worth do not prune the optimum"""
+    bestNetwork = branchAndBound.main(pathNetwork, maxRoutes, 5000, str(tmp_path))
+
+    # A-B-C scores 4880, driving the 4000 minute connections loses points
+    assert bestNetwork.score() == bruteForceScore(pathNetwork, 5000, maxRoutes) == 4880
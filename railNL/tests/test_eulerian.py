@@ -0,0 +1,41 @@
+import pytest
+from classes.railNetwork import RailNetwork
+from algorithms.eulerian import eulerianSolution
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+
+def routeNames(network: RailNetwork):
+    """Returns the station names of every route of a network"""
+    return [[station.name() for station in route.listStations()] for route in network.listRoutes()]
+
+@pytest.mark.parametrize("maxDuration, maxRoutes", [(120, 7), (50, 7), (45, 3)])
+def test_eulerianSolution(maxDuration, maxRoutes):
+    """Tests if the solution drives every connection with legal routes"""
+    solution = eulerianSolution(masterNetwork, maxRoutes, maxDuration)
+
+    assert solution.connectionCoverage() == 1
+    assert 0 < solution.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in solution.listRoutes())
+
+    # the network it was built from keeps its routes
+    assert masterNetwork.nRoute() == 0
+
+def test_eulerianCircuit():
+    """Tests if one circuit fits in a single route and the solution is deterministic"""
+    solution = eulerianSolution(masterNetwork, 7, 120)
+
+    # every connection is driven exactly once
+    assert routeNames(solution) == [["AAA", "BBB", "CCC", "DDD", "BBB"]]
+    assert solution.score() == 10000 - 100 - 100
+    assert routeNames(eulerianSolution(masterNetwork.clone(), 7, 120)) == routeNames(solution)
+
+def test_eulerianMaxRoutes():
+    """Tests if the routes that add the least points are removed when there are too many"""
+    solution = eulerianSolution(masterNetwork, 2, 50)
+
+    assert solution.nRoute() == 2
+    assert all(route.isValid(50) for route in solution.listRoutes())
+
+    # C-D takes the most minutes for the same points
+    assert routeNames(solution) == [["AAA", "BBB", "CCC"], ["DDD", "BBB"]]
+    assert solution.connectionCoverage() == 0.75
@@ -0,0 +1,43 @@
+import pytest
+import random
+from classes.railNetwork import RailNetwork
+from algorithms import genetic
+from algorithms.eulerian import eulerianSolution
+from algorithms.simulatedAnnealing import buildNetwork
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+pathNetwork = RailNetwork("tests/testPathStation.csv", "tests/testPathRoute.csv")
+
+@pytest.mark.parametrize("network, maxDuration, maxRoutes",
+                         [(masterNetwork, 50, 2), (masterNetwork, 120, 3), (pathNetwork, 5000, 2)])
+def test_genetic(tmp_path, network, maxDuration, maxRoutes):
+    """Tests if the genetic algorithm returns a valid network not worse than the initial solution"""
+    random.seed(1)
+    initialScore = eulerianSolution(network, maxRoutes, maxDuration).score()
+
+    bestNetwork = genetic.main(network, maxRoutes, maxDuration, str(tmp_path), populationSize=10,
+                               generations=20, convergenceLimit=5, processes=1,
+                               initialiser="eulerian")
+
+    assert 0 < bestNetwork.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in bestNetwork.listRoutes())
+    assert bestNetwork.score() >= initialScore
+
+@pytest.mark.parametrize("seed", range(5))
+def test_nextGeneration(seed):
+    """Tests if every child is a valid network and the best individual survives"""
+    random.seed(seed)
+    population = genetic.randomPopulation(masterNetwork, 3, 50, 10)
+    fitness = [buildNetwork(masterNetwork, individual).score() for individual in population]
+    problem = genetic.CoverageProblem(masterNetwork)
+
+    children = genetic.nextGeneration(masterNetwork, problem, population, fitness, 3, 50, 2, 3, 0.5)
+
+    assert len(children) == len(population)
+    assert max(fitness) <= max(buildNetwork(masterNetwork, child).score() for child in children)
+
+    for child in children:
+        childNetwork = buildNetwork(masterNetwork, child)
+
+        assert 0 < childNetwork.nRoute() <= 3
+        assert all(route.isValid(50) for route in childNetwork.listRoutes())
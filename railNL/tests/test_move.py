@@ -0,0 +1,96 @@
+import pytest
+from classes.railNetwork import RailNetwork
+from classes.move import Move, AddRoute, RemoveRoute, ReplaceRoute, PushHead, PushTail, PopHead, \
+    PopTail
+from copy import deepcopy
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+
+def initializeNetwork():
+    testNetwork = deepcopy(masterNetwork)
+
+    stationA = testNetwork.getStation("AAA")
+    stationB = testNetwork.getStation("BBB")
+    stationC = testNetwork.getStation("CCC")
+    stationD = testNetwork.getStation("DDD")
+
+    return testNetwork, stationA, stationB, stationC, stationD
+
+def networkState(network: RailNetwork):
+    """Returns the routes and registrations of a network for comparison"""
+    routes = [(route.getID(), [station.name() for station in route.listStations()])
+              for route in network.listRoutes()]
+    registrations = [set(connection._routes) for connection in network._connections]
+    registrations += [set(station._routes) for station in network.listStations()]
+
+    return routes, registrations, network.score(), network.totalDuration()
+
+def test_moves():
+    """Tests if moves change the score by their delta and are taken back by undo"""
+    testNetwork, stationA, stationB, stationC, stationD = initializeNetwork()
+
+    route = testNetwork.addRoute([stationA, stationB, stationC])
+    otherRoute = testNetwork.addRoute([stationC, stationD, stationB])
+
+    moves = [
+        AddRoute([stationD, stationB, stationA]),
+        RemoveRoute(route.getID()),
+        ReplaceRoute(otherRoute.getID(), [stationB, stationC]),
+        PushHead(route.getID(), stationD),
+        PushTail(route.getID(), stationD),
+        PopHead(route.getID()),
+        PopTail(otherRoute.getID()),
+    ]
+
+    for move in moves:
+        state = networkState(testNetwork)
+        score = testNetwork.score()
+
+        delta = move.delta(testNetwork)
+        assert networkState(testNetwork) == state
+
+        move.apply(testNetwork)
+        assert testNetwork.score() - score == delta
+
+        move.undo(testNetwork)
+        assert networkState(testNetwork) == state
+
+def test_undoSequence():
+    """Tests if a sequence of moves is taken back by undoing them in reverse order"""
+    testNetwork, stationA, stationB, stationC, stationD = initializeNetwork()
+
+    route = testNetwork.addRoute([stationA, stationB, stationC])
+    testNetwork.addRoute([stationC, stationD])
+    state = networkState(testNetwork)
+
+    moves = [
+        PopHead(route.getID()),
+        PushTail(route.getID(), stationD),
+        RemoveRoute(route.getID()),
+        AddRoute([stationA, stationB]),
+    ]
+
+    for move in moves:
+        move.apply(testNetwork)
+
+    assert [route.getID() for route in testNetwork.listRoutes()] == [1, 2]
+
+    for move in reversed(moves):
+        move.undo(testNetwork)
+
+    assert networkState(testNetwork) == state
+    assert route.listStations() == [stationA, stationB, stationC]
+
+
+def test_abstractMove():
+    """Tests if moves that do not implement apply, undo and delta can not be made"""
+
+    class ApplyOnly(Move):
+        def apply(self, network):
+            pass
+
+    with pytest.raises(TypeError):
+        ApplyOnly()
+
+    with pytest.raises(TypeError):
+        Move()
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from classes.railNetwork import RailNetwork
 from classes.route import Route
 from copy import deepcopy
@@ -19,4 +20,303 @@ def test_load():
                     (testNetwork.getStation("CCC"), 20.0, None, None, None),
                     (testNetwork.getStation("DDD"), 30.0, None, None, None),
                    ]
-    
\ No newline at end of file
+    
+
+def recomputeScore(network: RailNetwork) -> float:
+    """Recomputes the score of a network from scratch"""
+    used = len([connection for connection in network._connections if connection.isConnected()])
+    duration = sum([route.duration() for route in network.listRoutes()])
+
+    return used / network.nConnections() * 10000 - (network.nRoute() * 100 + duration)
+
+
+def test_incrementalScore():
+    """Tests if the tracked score matches the recomputed score after route mutations"""
+    testNetwork = deepcopy(masterNetwork)
+    stationA, stationB, stationC, stationD = [testNetwork.getStation(name) for name in
+                                              ["AAA", "BBB", "CCC", "DDD"]]
+
+    route = testNetwork.createRoute(stationA)
+    route.appendStation(stationB)
+    route.appendStation(stationC)
+    assert testNetwork.score() == recomputeScore(testNetwork)
+    assert testNetwork.totalDuration() == 30
+
+    # B - A - B - C - D - B
+    route.appendStation(stationD)
+    route.appendStation(stationB)
+    route.insertStation(0, stationB)
+    assert testNetwork.score() == recomputeScore(testNetwork)
+    assert testNetwork.connectionCoverage() == 1
+
+    route.popStation(0)
+    route.popStation()
+    assert testNetwork.score() == recomputeScore(testNetwork)
+
+    otherRoute = testNetwork.createRoute(stationD)
+    otherRoute.insertStation(0, stationC)
+    otherRoute.insertStation(1, stationB)
+    assert testNetwork.score() == recomputeScore(testNetwork)
+
+    testNetwork.delRoute(route.getID())
+    assert testNetwork.score() == recomputeScore(testNetwork)
+    assert testNetwork.connectionCoverage() == 0.5
+
+    testNetwork.delRoute(otherRoute.getID())
+    assert testNetwork.totalDuration() == 0
+    assert testNetwork.connectionCoverage() == 0
+
+
+def networkState(network: RailNetwork):
+    """Returns the routes and registrations of a network for comparison"""
+    routes = [(route.getID(), [station.name() for station in route.listStations()])
+              for route in network.listRoutes()]
+    registrations = [set(connection._routes) for connection in network._connections]
+    registrations += [set(station._routes) for station in network.listStations()]
+
+    return routes, registrations, network.score(), network._routeID
+
+
+def test_rollback():
+    """Tests if all changes made in a transaction are undone by a rollback"""
+    testNetwork = deepcopy(masterNetwork)
+    stationA, stationB, stationC, stationD = [testNetwork.getStation(name) for name in
+                                              ["AAA", "BBB", "CCC", "DDD"]]
+
+    route = testNetwork.createRoute(stationA)
+    route.appendStation(stationB)
+    route.appendStation(stationC)
+    otherRoute = testNetwork.createRoute(stationD)
+    otherRoute.appendStation(stationB)
+
+    before = networkState(testNetwork)
+
+    testNetwork.beginTransaction()
+    route.popStation(0)
+    route.insertStation(1, stationD)
+    testNetwork.delRoute(otherRoute.getID())
+    newRoute = testNetwork.createRoute(stationC)
+    newRoute.appendStation(stationD)
+    newRoute.empty()
+    newRoute.appendStation(stationB)
+    assert networkState(testNetwork) != before
+
+    testNetwork.rollback()
+    assert networkState(testNetwork)[:-1] == before[:-1]
+
+    # the ID of the route created in the transaction is not reused
+    laterRoute = testNetwork.createRoute(stationC)
+    assert laterRoute.getID() > newRoute.getID()
+    testNetwork.delRoute(laterRoute.getID())
+    assert networkState(testNetwork)[:-1] == before[:-1]
+
+    # committed changes are kept
+    testNetwork.beginTransaction()
+    route.appendStation(stationD)
+    testNetwork.commit()
+    assert route.nStations() == 4
+    assert testNetwork.score() == recomputeScore(testNetwork)
+
+
+def test_clone():
+    """Tests if a cloned network has the same routes and can be changed independently"""
+    testNetwork = deepcopy(masterNetwork)
+    stationA, stationB, stationC = [testNetwork.getStation(name) for name in ["AAA", "BBB", "CCC"]]
+
+    route = testNetwork.createRoute(stationA)
+    route.appendStation(stationB)
+    route.appendStation(stationC)
+
+    cloneNetwork = testNetwork.clone()
+    assert networkState(cloneNetwork) == networkState(testNetwork)
+    assert cloneNetwork.getStation("AAA") is not stationA
+    assert cloneNetwork.getStation("AAA").position() is stationA.position()
+    assert cloneNetwork.getStation("AAA")._routes is stationA._routes
+    assert cloneNetwork.getStation("AAA").listStations() == [(cloneNetwork.getStation("BBB"), 10.0,
+                                                              None, None, None)]
+
+    before = networkState(testNetwork)
+
+    cloneRoute = cloneNetwork.getRoute(route.getID())
+    cloneRoute.popStation(0)
+    cloneNetwork.createRoute(cloneNetwork.getStation("DDD")).appendStation(
+        cloneNetwork.getStation("CCC"))
+
+    assert networkState(testNetwork) == before
+    assert cloneNetwork.score() == recomputeScore(cloneNetwork)
+    assert cloneRoute.listStations() == [cloneNetwork.getStation("BBB"),
+                                         cloneNetwork.getStation("CCC")]
+
+
+def test_compactGraph():
+    """Tests if the compact graph holds the stations and connections of the network"""
+    testNetwork = deepcopy(masterNetwork)
+    graph = testNetwork.compactGraph()
+
+    stationB = testNetwork.getStation("BBB")
+    assert testNetwork.getStationByID(stationB.getID()) is stationB
+    assert graph.stationName(stationB.getID()) == "BBB"
+
+    assert graph.nStations() == 4
+    assert graph.nConnections() == 4
+    assert graph.degree(stationB.getID()) == 3
+
+    # neighbours are sorted by duration
+    assert [graph.stationName(stationID) for stationID in graph.neighbours(stationB.getID())] == \
+        ["AAA", "CCC", "DDD"]
+    assert list(graph.neighbourDurations(stationB.getID())) == [10, 20, 30]
+    assert graph.minimumDuration(testNetwork.getStation("DDD").getID()) == 30
+
+    start, end = graph.legalNeighbourRange(stationB.getID(), 30)
+    assert end - start == 2
+
+    # clones share the graph
+    assert testNetwork.clone().compactGraph() is graph
+
+
+def test_contractedGraph():
+    """Tests if chains of stations with two connections are contracted and expanded again"""
+    testNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv", contractChains=True)
+    graph = testNetwork.searchGraph()
+
+    stationA, stationB, stationC, stationD = [testNetwork.getStation(name).getID()
+                                              for name in ["AAA", "BBB", "CCC", "DDD"]]
+
+    # CCC and DDD are contracted into a loop from BBB back to itself
+    assert graph.nConnections() == 2
+    assert list(graph.durations()) == [10, 90]
+    assert graph.degree(stationB) == 3
+    assert graph.degree(stationC) == graph.degree(stationD) == 0
+
+    # the network keeps its connections
+    assert testNetwork.nConnections() == 4
+    assert masterNetwork.searchGraph() is masterNetwork.compactGraph()
+
+    # a walk from AAA around the loop is expanded into the stations and connections of the network
+    superAB = int(graph.neighbourConnections(stationA)[0])
+    superLoop = 1 - superAB
+    stationIDs, connectionIDs = graph.expand([stationA, stationB, stationB], [superAB, superLoop])
+
+    assert stationIDs[:2] == [stationA, stationB] and stationIDs[-1] == stationB
+    assert sorted(stationIDs[2:4]) == [stationC, stationD]
+    assert sorted(connectionIDs) == [0, 1, 2, 3]
+
+    # driving a chain from its second end reverses it
+    assert graph.expand([stationB, stationA], [superAB]) == ([stationB, stationA], [superAB])
+
+    covered = np.zeros((1, 2), dtype=bool)
+    covered[0, superLoop] = True
+    assert graph.expandCovered(covered).sum() == 3
+
+    # clones share the graph
+    assert testNetwork.clone().searchGraph() is graph
+
+
+def test_compactLegalMoves():
+    """Tests if legal moves from the compact graph match legal moves from the station nodes"""
+    testNetwork = deepcopy(masterNetwork)
+
+    route = testNetwork.createRoute(testNetwork.getStation("AAA"))
+    route.appendStation(testNetwork.getStation("BBB"))
+
+    assert route.getLegalMoves(35) == {0: [(testNetwork.getStation("BBB"), 10.0, None, None, None)],
+                                       1: [(testNetwork.getStation("AAA"), 10.0, None, None, None),
+                                           (testNetwork.getStation("CCC"), 20.0, None, None, None)]}
+    assert route.hasLegalMoves(21)
+    assert not route.hasLegalMoves(20)
+
+
+def test_neighbourCounts():
+    """Tests if unused and unvisited connection amounts follow route changes"""
+    testNetwork = deepcopy(masterNetwork)
+    stationA, stationB, stationC, stationD = [testNetwork.getStation(name) for name in
+                                              ["AAA", "BBB", "CCC", "DDD"]]
+
+    assert stationB.unusedConnectionAmount() == 3
+    assert stationB.unvisitedConnectionAmount() == 3
+
+    route = testNetwork.createRoute(stationA)
+    route.appendStation(stationB)
+
+    assert stationB.unusedConnectionAmount() == 2
+    assert stationB.unvisitedConnectionAmount() == 2
+    assert stationC.unvisitedConnectionAmount() == 1
+    assert stationB.listStations(nUnused=True, nUnvisited=True)[1] == (stationC, 20.0, None, 2, 1)
+
+    # counts are kept in clones
+    cloneStation = testNetwork.clone().getStation("BBB")
+    assert cloneStation.unusedConnectionAmount() == 2
+    assert cloneStation.unvisitedConnectionAmount() == 2
+
+    route.popStation(0)
+
+    assert stationB.unusedConnectionAmount() == 3
+    assert stationB.unvisitedConnectionAmount() == 3
+    assert stationC.unvisitedConnectionAmount() == 1
+
+
+def test_scoreDeltas():
+    """Tests if the score deltas of candidate moves equal the score change after applying them"""
+    testNetwork = deepcopy(masterNetwork)
+    stationA, stationB, stationC, stationD = [testNetwork.getStation(name) for name in
+                                              ["AAA", "BBB", "CCC", "DDD"]]
+
+    # A - B - C - B
+    route = testNetwork.addRoute([stationA, stationB, stationC, stationB])
+    otherRoute = testNetwork.addRoute([stationC, stationD])
+
+    delta = testNetwork.deltaAddRoute([stationD, stationB, stationA])
+    score = testNetwork.score()
+    newRoute = testNetwork.addRoute([stationD, stationB, stationA])
+    assert testNetwork.score() - score == delta
+
+    delta = testNetwork.deltaRemoveRoute(otherRoute.getID())
+    score = testNetwork.score()
+    testNetwork.delRoute(otherRoute.getID())
+    assert testNetwork.score() - score == delta
+
+    delta = testNetwork.deltaReplaceRoute(newRoute.getID(), [stationC, stationD, stationB])
+    score = testNetwork.score()
+    testNetwork.delRoute(newRoute.getID())
+    testNetwork.addRoute([stationC, stationD, stationB])
+    assert testNetwork.score() - score == delta
+
+    delta = testNetwork.deltaExtendRoute(route.getID(), stationD)
+    score = testNetwork.score()
+    route.appendStation(stationD)
+    assert testNetwork.score() - score == delta
+
+    # B - C occurs twice in the route, so trimming it keeps the connection covered
+    for head in [True, False, False, True]:
+        delta = testNetwork.deltaTrimRoute(route.getID(), head)
+        score = testNetwork.score()
+        route.popStation(0 if head else -1)
+        assert testNetwork.score() - score == delta
+
+    assert testNetwork.score() == recomputeScore(testNetwork)
+
+    # scoring candidates does not change the network
+    state = networkState(testNetwork)
+    testNetwork.scoreAfter([route.getID()], [[stationA, stationB, stationD]])
+    assert networkState(testNetwork) == state
+
+
+def test_upperBoundScore():
+    """Tests if the upper bound on the score is reached but never beaten by solutions"""
+    testNetwork = masterNetwork.clone()
+
+    # AAA and BBB have an odd amount of connections, which one route can start and end at
+    assert testNetwork.upperBoundScore(200) == testNetwork.theoreticalMaxScore(200) == 9800
+
+    # routes must be shorter than maxDuration, so driving all 100 minutes takes 3 routes
+    assert testNetwork.upperBoundScore(50) == 9600 < testNetwork.theoreticalMaxScore(50)
+
+    # 2 routes can not drive every connection, the best is to drive the 3 shortest
+    assert testNetwork.upperBoundScore(50, 2) == 7500 - 60 - 200
+
+    # connections that take longer than they are worth are best left undriven
+    pathNetwork = RailNetwork("tests/testPathStation.csv", "tests/testPathRoute.csv")
+    pathNetwork.addRoute([pathNetwork.getStation(name) for name in ["AAA", "BBB", "CCC"]])
+
+    assert pathNetwork.score() == 4880
+    assert pathNetwork.upperBoundScore(5000, 1) >= 4880
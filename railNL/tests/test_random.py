@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from classes.railNetwork import RailNetwork
+from algorithms.random import randomRouteBatch
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+zeroNetwork = RailNetwork("tests/testStation.csv", "tests/testZeroRoute.csv")
+
+def checkBatch(network: RailNetwork, maxDuration: float, seed: int):
+    """Checks every route of a batch against the route it forms in a network"""
+    stationIDs, covered, durations = randomRouteBatch(
+        network, maxDuration, 50, np.random.default_rng(seed)
+    )
+
+    assert len(stationIDs) == len(covered) == len(durations) == 50
+
+    for index, routeStations in enumerate(stationIDs):
+        testNetwork = network.clone()
+        route = testNetwork.addRoute(
+            [testNetwork.getStationByID(stationID) for stationID in routeStations]
+        )
+
+        # addRoute does not add stations without a connection to the previous one
+        assert route.nStations() == len(routeStations)
+        assert route.isValid(maxDuration)
+        assert route.duration() == durations[index]
+        assert set(np.flatnonzero(covered[index]).tolist()) == \
+            {connection.getID() for connection in route.listUniqueConnections()}
+
+@pytest.mark.parametrize("maxDuration", [45, 70, 200])
+def test_randomRouteBatch(maxDuration):
+    """Tests if every random walk is a valid route with the connections and duration it reports"""
+    checkBatch(masterNetwork, maxDuration, 1)
+
+def test_randomRouteBatchSeed():
+    """Tests if the same random number generator seed gives the same routes"""
+    first = randomRouteBatch(masterNetwork, 70, 50, np.random.default_rng(3))
+    second = randomRouteBatch(masterNetwork, 70, 50, np.random.default_rng(3))
+
+    assert first[0] == second[0]
+    assert np.array_equal(first[1], second[1])
+    assert np.array_equal(first[2], second[2])
+
+def test_randomRouteBatchZeroDuration():
+    """Tests if walks over connections that take no time end"""
+    checkBatch(zeroNetwork, 70, 1)
+
+@pytest.mark.parametrize("maxDuration", [5, 10])
+def test_randomRouteBatchTooShort(maxDuration):
+    """Tests if a maximum duration that no connection fits in raises an error"""
+    with pytest.raises(ValueError):
+        randomRouteBatch(masterNetwork, maxDuration, 10, np.random.default_rng(1))
@@ -194,3 +194,52 @@ def test_popAppend():
     print(testRoute._stations)
     assert stationB.getConnection(stationC.name())._routes == {0}
     assert testRoute.length() == 1
+
+def test_uniqueCounts():
+    """Tests if repeated stations and connections are counted once"""
+    testNetwork, stationA, stationB, stationC, stationD = initializeNetwork()
+
+    testRoute = testNetwork.createRoute(stationB)
+    testRoute.appendStation(stationC)
+    testRoute.appendStation(stationB)
+
+    # B - C - B
+    assert testRoute.uniqueStations() == 2
+    assert testRoute.uniqueConnections() == 1
+    assert testRoute.routeScore(4) == 1 / 4 * 10000 - (100 + 40)
+
+    testRoute.insertStation(0, stationA)
+
+    # A - B - C - B
+    assert testRoute.uniqueStations() == 3
+    assert testRoute.uniqueConnections() == 2
+
+    testRoute.popStation()
+    testRoute.popStation()
+
+    # A - B
+    assert testRoute.uniqueStations() == 2
+    assert testRoute.uniqueConnections() == 1
+    assert stationC._routes == set()
+    assert stationB.getConnection(stationC.name())._routes == set()
+
+def test_durationAfterChanges():
+    """Tests if the duration of the route is kept up to date when stations are removed"""
+    testNetwork, stationA, stationB, stationC, stationD = initializeNetwork()
+
+    testRoute = testNetwork.createRoute(stationA)
+    testRoute.appendStation(stationB)
+    testRoute.appendStation(stationD)
+    testRoute.insertStation(2, stationC)
+
+    # A - B - C - D
+    assert testRoute.duration() == 70
+
+    testRoute.popStation(0)
+    assert testRoute.duration() == 60
+
+    testRoute.popStation(1)
+    assert testRoute.duration() == 30
+
+    testRoute.empty()
+    assert testRoute.duration() == 0
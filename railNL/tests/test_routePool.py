@@ -0,0 +1,90 @@
+import pytest
+import os
+import multiprocessing
+import numpy as np
+from classes.railNetwork import RailNetwork
+from classes import routePool
+from classes.routePool import RoutePool, buildRoutePool, loadRoutePool
+from copy import deepcopy
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+
+def test_buildPool():
+    """Tests if the pool holds one legal trail for every set of connections"""
+    testNetwork = deepcopy(masterNetwork)
+    pool = buildRoutePool(testNetwork, 70)
+
+    connectionSets = set()
+
+    for index in range(len(pool)):
+        route = testNetwork.addRoute(pool.stations(index, testNetwork))
+
+        assert route.isValid(70)
+        assert route.duration() == pool.duration(index)
+        assert route.uniqueConnections() == route.length()
+
+        connectionSets.add(frozenset(pool.connectionIDs(index).tolist()))
+        testNetwork.delRoute(route.getID())
+
+    # A-B, B-C, B-D, C-D, A-B-C, A-B-D, C-B-D and B-C-D, each in one direction only
+    assert len(pool) == len(connectionSets) == 8
+
+def test_samplePool():
+    """Tests if a pool is sampled when there are more trails than the limit"""
+    pool = buildRoutePool(masterNetwork, 70, limit=3)
+
+    assert 0 < len(pool) <= 3
+
+def test_poolCache(tmp_path):
+    """Tests if pools are cached on disk and loaded from the cache"""
+    routePool._LOADED_POOLS.clear()
+    pool = loadRoutePool(masterNetwork, 70, str(tmp_path))
+
+    assert len(os.listdir(tmp_path)) == 1
+    assert loadRoutePool(masterNetwork.clone(), 70, str(tmp_path)) is pool
+
+    # without the pools loaded in this process, the pool is loaded from the file
+    routePool._LOADED_POOLS.clear()
+    loadedPool = loadRoutePool(masterNetwork.clone(), 70, str(tmp_path))
+
+    assert loadedPool is not pool
+    assert len(loadedPool) == len(pool)
+    assert all(np.array_equal(loadedPool.stationIDs(index), pool.stationIDs(index))
+               for index in range(len(pool)))
+    assert np.array_equal(loadedPool.offsets(), pool.offsets())
+    assert np.array_equal(loadedPool.masks(), pool.masks())
+    assert np.array_equal(loadedPool.durations(), pool.durations())
+
+    cachedPool = loadRoutePool(masterNetwork, 71, str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+    assert isinstance(cachedPool, RoutePool)
+
+def loadPoolAtOnce(barrier, queue, cacheFolder: str) -> None:
+    """Loads the pool of the test network once all processes are ready, and reports its durations"""
+    barrier.wait()
+    queue.put(loadRoutePool(masterNetwork, 70, cacheFolder).durations().tolist())
+
+def test_poolCacheProcesses(tmp_path):
+    """Tests if processes that build the same pool at once leave one complete cache file"""
+    routePool._LOADED_POOLS.clear()
+
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(4)
+    queue = context.Queue()
+
+    processes = [context.Process(target=loadPoolAtOnce, args=(barrier, queue, str(tmp_path)))
+                 for _ in range(4)]
+
+    for process in processes:
+        process.start()
+
+    results = [queue.get(timeout=60) for _ in processes]
+
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    # no temporary files are left behind, and the cache file is complete
+    assert len(os.listdir(tmp_path)) == 1
+    assert all(result == results[0] for result in results)
+    assert loadRoutePool(masterNetwork, 70, str(tmp_path)).durations().tolist() == results[0]
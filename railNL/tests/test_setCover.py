@@ -0,0 +1,35 @@
+import pytest
+import random
+from classes.railNetwork import RailNetwork
+from classes.routePool import loadRoutePool
+from algorithms import setCover
+from algorithms.setCover import CoverProblem
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+pathNetwork = RailNetwork("tests/testPathStation.csv", "tests/testPathRoute.csv")
+
+@pytest.mark.parametrize("network, maxDuration, maxRoutes",
+                         [(masterNetwork, 70, 2), (masterNetwork, 50, 2), (masterNetwork, 200, 1),
+                          (pathNetwork, 5000, 2)])
+def test_setCover(tmp_path, network, maxDuration, maxRoutes):
+    """Tests if the solution is valid and not worse than the greedy selection it starts from"""
+    random.seed(1)
+    pool = loadRoutePool(network, maxDuration, str(tmp_path))
+    problem = CoverProblem(pool, network.nConnections())
+    greedyScore = problem.score(problem.greedy(maxRoutes))
+
+    bestNetwork = setCover.main(network, maxRoutes, maxDuration, str(tmp_path), restarts=3,
+                                cacheFolder=str(tmp_path))
+
+    assert 0 < bestNetwork.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in bestNetwork.listRoutes())
+    assert bestNetwork.score() >= greedyScore - setCover.EPSILON
+
+    # the network it was built from keeps its routes
+    assert network.nRoute() == 0
+
+def test_setCoverLongConnections(tmp_path):
+    """Tests if connections that take longer than they are worth are left out"""
+    bestNetwork = setCover.main(pathNetwork, 2, 5000, str(tmp_path), cacheFolder=str(tmp_path))
+
+    assert bestNetwork.score() == 4880
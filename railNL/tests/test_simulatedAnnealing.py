@@ -0,0 +1,79 @@
+import pytest
+import random
+from classes.railNetwork import RailNetwork
+from algorithms import simulatedAnnealing
+from algorithms.eulerian import eulerianSolution
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+pathNetwork = RailNetwork("tests/testPathStation.csv", "tests/testPathRoute.csv")
+
+@pytest.mark.parametrize("network, maxDuration, maxRoutes",
+                         [(masterNetwork, 50, 2), (masterNetwork, 120, 3), (pathNetwork, 5000, 2)])
+def test_parallelTempering(tmp_path, network, maxDuration, maxRoutes):
+    """Tests if parallel tempering returns a valid network not worse than the initial solution"""
+    random.seed(1)
+    initialScore = eulerianSolution(network, maxRoutes, maxDuration).score()
+
+    bestNetwork = simulatedAnnealing.runAnnealing(
+        network, "route", "tempering", maxRoutes=maxRoutes, maxDuration=maxDuration, replicas=3,
+        exchangeInterval=50, processes=1, targetFolder=str(tmp_path), convergenceLimit=200,
+        randomIterations=0, initialiser="eulerian"
+    )
+
+    assert 0 < bestNetwork.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in bestNetwork.listRoutes())
+    assert bestNetwork.score() >= initialScore
+
+@pytest.mark.parametrize("exchange", range(4))
+def test_exchangeReplicas(exchange):
+    """Tests if exchanges swap states between replicas without losing or copying any"""
+    random.seed(exchange)
+    states = [[[replica]] for replica in range(5)]
+    stateScores = [5000.0, 4000.0, 6000.0, 1000.0, 3000.0]
+    temperatures = [64.0, 32.0, 16.0, 8.0, 4.0]
+
+    simulatedAnnealing.exchangeReplicas(states, stateScores, temperatures, exchange)
+
+    assert sorted(states) == [[[replica]] for replica in range(5)]
+    assert sorted(stateScores) == [1000.0, 3000.0, 4000.0, 5000.0, 6000.0]
+
+    # every state keeps its score
+    original = {0: 5000.0, 1: 4000.0, 2: 6000.0, 3: 1000.0, 4: 3000.0}
+    assert all(original[state[0][0]] == score for state, score in zip(states, stateScores))
+
+    # a better state in a hotter replica always moves to the colder neighbour
+    if exchange % 2:
+        assert states[0] == [[0]]
+    else:
+        assert states[1] == [[0]] and states[3] == [[2]]
+
+@pytest.mark.parametrize("network, maxDuration, maxRoutes",
+                         [(masterNetwork, 50, 2), (masterNetwork, 120, 3), (pathNetwork, 5000, 2)])
+def test_islandAnnealing(tmp_path, network, maxDuration, maxRoutes):
+    """Tests if the island model returns a valid network not worse than the initial solution"""
+    random.seed(1)
+    initialScore = eulerianSolution(network, maxRoutes, maxDuration).score()
+
+    bestNetwork = simulatedAnnealing.runAnnealing(
+        network, "route", "geometric", islands=3, maxRoutes=maxRoutes, maxDuration=maxDuration,
+        initialTemperature=16, coolingConstant=0.99, migrationInterval=50, stagnationLimit=100,
+        processes=1, targetFolder=str(tmp_path), convergenceLimit=200, randomIterations=0,
+        initialiser="eulerian"
+    )
+
+    assert 0 < bestNetwork.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in bestNetwork.listRoutes())
+    assert bestNetwork.score() >= initialScore
+
+def test_migrateIslands():
+    """Tests if islands continue from the best state of the previous island if it is better"""
+    states = [[[0, 1]], [[1, 2]], [[2, 3]]]
+    bestStates = [[[0]], [[1]], [[2]]]
+    bestScores = [1000.0, 5000.0, 3000.0]
+
+    simulatedAnnealing.migrateIslands(states, bestStates, bestScores)
+
+    # island 0 receives from island 2, island 1 keeps its own and island 2 receives from island 1
+    assert states == [[[2]], [[1, 2]], [[1]]]
+    assert bestStates == [[[2]], [[1]], [[1]]]
+    assert bestScores == [3000.0, 5000.0, 5000.0]
@@ -0,0 +1,53 @@
+import pytest
+import random
+from classes.railNetwork import RailNetwork
+from classes.move import AddRoute, RemoveRoute, PushTail, PopTail
+from algorithms import tabuSearch
+from algorithms.tabuSearch import TabuList, moveAttributes
+from algorithms.eulerian import eulerianSolution
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+pathNetwork = RailNetwork("tests/testPathStation.csv", "tests/testPathRoute.csv")
+
+@pytest.mark.parametrize("network, maxDuration, maxRoutes",
+                         [(masterNetwork, 50, 2), (masterNetwork, 120, 3), (pathNetwork, 5000, 2)])
+def test_tabuSearch(tmp_path, network, maxDuration, maxRoutes):
+    """Tests if tabu search returns a valid network not worse than the initial solution"""
+    random.seed(1)
+    initialScore = eulerianSolution(network, maxRoutes, maxDuration).score()
+
+    bestNetwork = tabuSearch.main(network, maxRoutes, maxDuration, str(tmp_path), tenure=5,
+                                  neighbourhood=10, convergenceLimit=100, initialiser="eulerian")
+
+    assert 0 < bestNetwork.nRoute() <= maxRoutes
+    assert all(route.isValid(maxDuration) for route in bestNetwork.listRoutes())
+    assert bestNetwork.score() >= initialScore
+
+def test_tabuList():
+    """Tests if attributes are tabu for tenure iterations"""
+    tabuList = TabuList(3)
+    tabuList.add([1, 2], 10)
+
+    assert tabuList.isTabu([2], 13)
+    assert tabuList.isTabu([3, 1], 11)
+    assert not tabuList.isTabu([1, 2], 14)
+    assert not tabuList.isTabu([3], 11)
+
+def test_moveAttributes():
+    """Tests if the reverse of a move has the attributes that are made tabu by the move"""
+    testNetwork = masterNetwork.clone()
+    stationA, stationB, stationC = [testNetwork.getStation(name) for name in ["AAA", "BBB", "CCC"]]
+    route = testNetwork.addRoute([stationA, stationB])
+
+    # adding a route and removing it are each others reverse, in either direction of travel
+    addAttributes, addReverse = moveAttributes(testNetwork, AddRoute([stationB, stationA]))
+    removeAttributes, removeReverse = moveAttributes(testNetwork, RemoveRoute(route.getID()))
+    assert addReverse == removeAttributes
+    assert removeReverse == addAttributes
+
+    pushTail = PushTail(route.getID(), stationC)
+    pushAttributes, pushReverse = moveAttributes(testNetwork, pushTail)
+    pushTail.apply(testNetwork)
+    popAttributes, popReverse = moveAttributes(testNetwork, PopTail(route.getID()))
+    assert pushReverse == popAttributes
+    assert popReverse == pushAttributes
@@ -0,0 +1,32 @@
+import pytest
+import time
+from classes.railNetwork import RailNetwork
+from algorithms import simulatedAnnealing, finnHillClimber, setCover, tabuSearch, alns, genetic, \
+    branchAndBound
+
+masterNetwork = RailNetwork("tests/testStation.csv", "tests/testRoute.csv")
+
+@pytest.mark.parametrize("algorithm, arguments", [
+    (simulatedAnnealing.runAnnealing, {"coolingScheme": "geometric", "initialTemperature": 16,
+                                       "coolingConstant": 0.99}),
+    (simulatedAnnealing.runAnnealing, {"coolingScheme": "tempering", "processes": 1}),
+    (simulatedAnnealing.runAnnealing, {"islands": 2, "processes": 1}),
+    (finnHillClimber.main, {"runName": "solutionFinn"}),
+    (setCover.main, {}),
+    (tabuSearch.main, {}),
+    (alns.main, {}),
+    (genetic.main, {"populationSize": 10, "processes": 1}),
+    (branchAndBound.main, {}),
+])
+def test_timeBudget(tmp_path, algorithm, arguments):
+    """Tests if a tiny time budget quickly returns a valid network"""
+    if algorithm is setCover.main:
+        arguments = dict(arguments, cacheFolder=str(tmp_path))
+
+    start = time.monotonic()
+    bestNetwork = algorithm(masterNetwork, maxRoutes=3, maxDuration=50, targetFolder=str(tmp_path),
+                            timeBudget=0.01, **arguments)
+
+    assert time.monotonic() - start < 5
+    assert 0 < bestNetwork.nRoute() <= 3
+    assert all(route.isValid(50) for route in bestNetwork.listRoutes())